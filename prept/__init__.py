@@ -16,3 +16,15 @@ from prept.context import *
 from prept.errors import *
 from prept.file import *
 from prept.engine import *
+from prept.tasks import *
+from prept.formatters import *
+from prept.conditions import *
+from prept.dependencies import *
+from prept.compiler import *
+from prept.cache import *
+from prept.sinks import *
+from prept.sources import *
+from prept.store import *
+from prept.git import *
+from prept.locks import *
+from prept.bundle import *
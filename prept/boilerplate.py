@@ -2,21 +2,27 @@
 
 from __future__ import annotations
 
-from typing import Any, Iterator, Literal, get_args
+from typing import Any, Collection, Iterator, Literal, Mapping, get_args
 from typing_extensions import Self
 from packaging.version import Version, InvalidVersion
 from prept.errors import InvalidConfig, ConfigNotFound, BoilerplateNotFound, PreptCLIError
 from prept.context import GenerationContext
-from prept.variables import TemplateVariable
+from prept.variables import TemplateVariable, FanoutFile
 from prept.cli import outputs
 from prept.engine import GenerationEngine
-from prept import utils, providers
+from prept.conditions import Condition, PathSelector, PathFilter
+from prept.sources import BoilerplateSource, DirectorySource
+from prept.git import GitMirror
+from prept import utils, providers, installation
 
 import re
 import os
 import sys
 import subprocess
+import shutil
 import tempfile
+import tarfile
+import zipfile
 import json
 import click
 import pathspec
@@ -29,8 +35,8 @@ __all__ = (
 VariableInputModeT = Literal['all', 'required_only', 'optional_only', 'none']
 
 PATTERN_BOILERPLATE_NAME = re.compile(r'^[A-Za-z_][A-Za-z0-9_-]*$')
-DEFAULT_IGNORED_PATHS = {'preptconfig.json'}
-DEFAULT_INSTALLATION_IGNORED_PATHS = {'.git/*'}
+DEFAULT_IGNORED_PATHS = {'preptconfig.json', '.prept/'}
+DEFAULT_INSTALLATION_IGNORED_PATHS = {'.git/*', '.prept/'}
 VARIABLE_INPUT_MODES = set(get_args(VariableInputModeT))
 
 
@@ -66,30 +72,40 @@ class BoilerplateInfo:
         ignore_paths: list[str] | None = None,
         default_generate_directory: str | None = None,
         template_provider: str | None = None,
+        template_providers: dict[str, str] | None = None,
         template_files: list[str] | None = None,
         template_paths: list[str] | None = None,
+        conditional_paths: dict[str, str] | None = None,
+        fanout_files: dict[str, dict[str, str]] | None = None,
         template_variables: dict[str, dict[str, Any]] | None = None,
         allow_extra_variables: bool = False,
         variable_input_mode: VariableInputModeT = 'all',
         engine: GenerationEngine | str | None = None,
+        source: BoilerplateSource | None = None,
     ):
-        abspath = str(path.absolute())
-        if abspath not in sys.path:
+        self._source = DirectorySource(path) if source is None else source
+
+        import_path = self._source.get_import_path()
+        if import_path is not None and import_path not in sys.path:
             # This is required for using engine that are defined in a module
             # inside the  boilerplate directory.
-            sys.path.insert(0, abspath)
+            sys.path.insert(0, import_path)
 
         self._path = path
         self._installed = installed
         self._from_git = False
+        self._git_origin: dict[str, Any] | None = None
         self.ignore_paths = ignore_paths or []
         self.name = name
         self.summary = summary
         self.version = version
         self.default_generate_directory = default_generate_directory
         self.template_provider = template_provider
+        self.template_providers = template_providers
         self.template_files = template_files
         self.template_paths = template_paths
+        self.conditional_paths = conditional_paths
+        self.fanout_files = fanout_files
         self.allow_extra_variables = allow_extra_variables
         self.variable_input_mode = variable_input_mode
         self.engine = engine
@@ -102,27 +118,57 @@ class BoilerplateInfo:
                 for name, data in template_variables.items()
             }
 
-    def _get_generated_files(self) -> Iterator[pathlib.Path]:
+    def _get_generated_files(self, path_filter: PathFilter | None = None) -> Iterator[pathlib.Path]:
         ignore_paths = set(self._ignore_paths).union(DEFAULT_IGNORED_PATHS)
         spec = pathspec.PathSpec.from_lines('gitwildmatch', ignore_paths)
 
-        for file in spec.match_tree(self.path, negate=True):
-            yield pathlib.Path(self.path / file).relative_to(self.path)
+        if path_filter is None or not path_filter.active:
+            files = self._source.walk()
+        else:
+            # Excluded directories are pruned during the walk so files
+            # inside them are never listed.
+            files = (
+                file for file in self._source.walk(prune=path_filter.is_directory_excluded)
+                if not path_filter.is_excluded(file)
+            )
+
+        for file in spec.match_files(files, negate=True):
+            yield pathlib.Path(file)
+
+    def _get_path_filter(self, ctx: GenerationContext | None, selector: PathSelector | None = None) -> PathFilter:
+        return PathFilter(self, ctx, selector)
+
+    def _get_fanout(self, file: pathlib.Path) -> FanoutFile | None:
+        if not self._fanout_files:
+            return None
+
+        result = self._fanout_spec.check_file(file)
+        if result.index is None or not result.include:
+            return None
+
+        return self._fanout_files[result.index]
 
     def _get_installation_files(self) -> Iterator[pathlib.Path]:
         spec = pathspec.PathSpec.from_lines('gitwildmatch', DEFAULT_INSTALLATION_IGNORED_PATHS)
 
-        for file in spec.match_tree(self.path, negate=True):
-            yield pathlib.Path(self.path / file).relative_to(self.path)
+        for file in spec.match_files(self._source.walk(), negate=True):
+            yield pathlib.Path(file)
 
     def _get_generation_context(self, output: pathlib.Path, variables: dict[str, Any]) -> GenerationContext:
         return GenerationContext(boilerplate=self, output_dir=output, variables=variables)
 
     def _is_template(self, file: pathlib.Path, path: bool = False) -> bool:
         spec = pathspec.PathSpec.from_lines('gitwildmatch', self.template_paths if path else self.template_files)
-        return spec.match_file(file)
+        if path:
+            return spec.match_file(file)
 
-    def _resolve_variables(self, input_vars: list[tuple[str, str]]) -> dict[str, Any]:
+        # Files that have a template provider assigned through
+        # template_providers are templates as well.
+        return spec.match_file(file) or self._template_providers_spec.match_file(file)
+
+    def _resolve_variables(self, input_vars: list[tuple[str, str]], names: Collection[str] | None = None) -> dict[str, Any]:
+        # If names are given, only these variables are prompted and required
+        # while other variables are only set to their defaults.
         outputs.echo_info('Processing template variables')
 
         resolved = {
@@ -135,7 +181,10 @@ class BoilerplateInfo:
             raise PreptCLIError(f'Invalid template variables provided: {", ".join(invalid)}')
 
         if self._variable_input_mode == 'none' or self._variable_input_mode == 'optional_only':
-            missing = [v.name for v in self.template_variables.values() if v.name not in resolved and v.required]
+            missing = [
+                v.name for v in self.template_variables.values()
+                if v.name not in resolved and v.required and (names is None or v.name in names)
+            ]
             if missing:
                 raise PreptCLIError(
                     f'Missing required template variables: {", ".join(missing)}',
@@ -155,6 +204,10 @@ class BoilerplateInfo:
             # variables. 
             if var_name in resolved:
                 continue
+            if names is not None and var_name not in names:
+                if var.default is not None:
+                    resolved[var_name] = var.default
+                continue
             if not var.required and self.variable_input_mode == 'required_only':
                 if var.default is not None:
                     resolved[var_name] = var.default
@@ -198,9 +251,19 @@ class BoilerplateInfo:
 
         Note that this is the path where the boilerplate configuration
         file is located, not the generation path.
+
+        For boilerplates loaded from archives, this is the path of archive.
         """
         return self._path
 
+    @property
+    def source(self) -> BoilerplateSource:
+        """The :class:`BoilerplateSource` that boilerplate files are read from.
+
+        .. versionadded:: 0.2.0
+        """
+        return self._source
+
     @property
     def name(self) -> str:
         """The name of boilerplate.
@@ -346,6 +409,54 @@ class BoilerplateInfo:
 
         self._template_provider = value
 
+    @property
+    def template_providers(self) -> dict[str, type[providers.TemplateProvider]]:
+        """The mapping of file paths (as patterns) to template providers.
+
+        This allows using different template providers for different files, for
+        example using the faster ``stringsub`` provider for plain configuration
+        files and ``jinja2`` for other templates::
+
+            "template_provider": "jinja2",
+            "template_providers": {
+                "config/*.ini": "stringsub"
+            }
+
+        Files matching a pattern are template files that are processed by the
+        corresponding provider. If a file matches multiple patterns, the last
+        matching pattern takes precedence. Files that do not match any pattern
+        use :attr:`.template_provider`.
+
+        Providers are specified in the same format as :attr:`.template_provider`.
+        See :class:`TemplateProviderIndex` for how files are dispatched to providers.
+
+        .. versionadded:: 0.2.0
+        """
+        return self._template_providers.copy()
+
+    @template_providers.setter
+    def template_providers(self, value: Mapping[str, type[providers.TemplateProvider] | str] | None) -> None:
+        if value is None:
+            value = {}
+        if not isinstance(value, dict):
+            raise InvalidConfig('template_providers', 'template_providers must be a mapping of paths to template providers')
+
+        resolved: dict[str, type[providers.TemplateProvider]] = {}
+        for pattern, provider in value.items():
+            if isinstance(provider, str):
+                provider = providers.resolve_template_provider(provider)
+            if not getattr(provider, '__prept_template_provider__', False):
+                raise InvalidConfig(f'template_providers.{pattern}', 'Invalid template provider, not a subclass of TemplateProvider')
+
+            resolved[pattern] = provider
+
+        self._template_providers = resolved
+        self._template_provider_specs = {
+            pattern: provider if isinstance(provider, str) else f'{provider.__module__}:{provider.__qualname__}'
+            for pattern, provider in value.items()
+        }
+        self._template_providers_spec = pathspec.PathSpec.from_lines('gitwildmatch', resolved)
+
     @property
     def template_files(self) -> list[str]:
         """List of file paths (as patterns) that are templates.
@@ -392,6 +503,79 @@ class BoilerplateInfo:
 
         self._template_paths = value
 
+    @property
+    def conditional_paths(self) -> dict[str, str]:
+        """The paths that are only generated if a condition is met.
+
+        This is a mapping of gitignore-like patterns to conditions over template
+        variables (see :class:`Condition` for the supported syntax). Files matching
+        a pattern are only generated if its condition is true. For example::
+
+            "conditional_paths": {
+                "frontend/": "frontend and framework != 'none'",
+                "Dockerfile": "docker"
+            }
+
+        Conditions are evaluated once per generation. Directories matching
+        a pattern whose condition is false are skipped entirely without walking
+        the files inside them.
+
+        .. versionadded:: 0.2.0
+        """
+        return {pattern: condition.expression for pattern, condition in self._conditions}
+
+    @conditional_paths.setter
+    def conditional_paths(self, value: dict[str, str] | None) -> None:
+        if value is None:
+            value = {}
+        if not isinstance(value, dict):
+            raise InvalidConfig('conditional_paths', 'conditional_paths must be a mapping of paths to conditions')
+
+        conditions: list[tuple[str, Condition]] = []
+        for pattern, expression in value.items():
+            if not isinstance(expression, str):
+                raise InvalidConfig(f'conditional_paths.{pattern}', 'Condition must be a string')
+            try:
+                conditions.append((pattern, Condition(expression)))
+            except ValueError as e:
+                raise InvalidConfig(f'conditional_paths.{pattern}', f'Invalid condition: {e}') from None
+
+        self._conditions = conditions
+
+    @property
+    def fanout_files(self) -> dict[str, FanoutFile]:
+        """The template files that are rendered once for each item of a variable.
+
+        This is a mapping of file paths (as gitignore-like patterns) to the name of
+        template ``variable`` holding the items and the name of variable that each
+        ``item`` is bound to. For example::
+
+            "fanout_files": {
+                "models/$entity.py": {"variable": "entities", "item": "entity"}
+            }
+
+        With ``entities`` set to ``user,post``, this generates ``models/user.py`` and
+        ``models/post.py`` from the same template. Variables given as strings are split
+        by commas and other iterables (such as lists set by engines) are used as is.
+
+        Both path and content of matching files are processed by the template provider
+        so the path must reference the item variable. The template is loaded once
+        and reused for all items (see :meth:`TemplateProvider.get_renderer`).
+
+        .. versionadded:: 0.2.0
+        """
+        return {fanout.pattern: fanout for fanout in self._fanout_files}
+
+    @fanout_files.setter
+    def fanout_files(self, value: dict[str, dict[str, str]] | None) -> None:
+        if value is None:
+            value = {}
+        if not isinstance(value, dict):
+            raise InvalidConfig('fanout_files', 'fanout_files must be a mapping of paths to fan-out options')
+
+        self._fanout_files = [FanoutFile._from_data(pattern, data) for pattern, data in value.items()]
+        self._fanout_spec = pathspec.PathSpec.from_lines('gitwildmatch', value)
+
     @property
     def allow_extra_variables(self) -> bool:
         """Whether arbitrary variables that are not in template_variables are allowed.
@@ -467,10 +651,14 @@ class BoilerplateInfo:
         Raises :class:`ConfigNotFound` or :class:`InvalidConfig` if boilerplate
         configuration does not exist or is invalid, respectively.
 
+        .. versionchanged:: 0.2.0
+            Boilerplates can now be loaded from zip and tar archives without
+            extracting them. See :meth:`BoilerplateSource.from_path` for details.
+
         Parameters
         ~~~~~~~~~~
         path: :class:`pathlib.Path` | :class:`str`
-            The path to boilerplate directory.
+            The path to boilerplate directory or archive.
 
         Returns
         ~~~~~~~
@@ -481,13 +669,18 @@ class BoilerplateInfo:
             path = pathlib.Path(path)
 
         try:
-            with open(path / 'preptconfig.json', 'r') as f:
-                data = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError) as e:
-            if isinstance(e, FileNotFoundError):
-                raise ConfigNotFound
-            else:
+            source = BoilerplateSource.from_path(path)
+        except (zipfile.BadZipFile, tarfile.TarError, OSError):
+            raise InvalidConfig(None, f'{path} is not a valid boilerplate archive')
+
+        try:
+            data = json.loads(source.read_text('preptconfig.json'))
+        except (FileNotFoundError, NotADirectoryError, json.JSONDecodeError) as e:
+            source.close()
+            if isinstance(e, json.JSONDecodeError):
                 raise InvalidConfig(None)
+            else:
+                raise ConfigNotFound
 
         if 'name' not in data:
             raise InvalidConfig(key='name', missing=True)
@@ -501,12 +694,16 @@ class BoilerplateInfo:
             ignore_paths=data.get('ignore_paths'),
             default_generate_directory=data.get('default_generate_directory'),
             template_provider=data.get('template_provider'),
+            template_providers=data.get('template_providers'),
             template_files=data.get('template_files'),
             template_paths=data.get('template_paths'),
+            conditional_paths=data.get('conditional_paths'),
+            fanout_files=data.get('fanout_files'),
             template_variables=data.get('template_variables'),
             allow_extra_variables=data.get('allow_extra_variables'),
             variable_input_mode=data.get('variable_input_mode', 'all'),
             engine=data.get('engine'),
+            source=source,
         )
     
     @classmethod
@@ -517,19 +714,29 @@ class BoilerplateInfo:
         configuration does not exist or is invalid, respectively. If boilerplate
         does not exist, then :class:`BoilerplateNotFound` is raised.
 
+        .. versionchanged:: 0.2.0
+            Specific installed versions can be loaded using ``name@version`` or
+            ``name@specifier`` format.
+
         Parameters
         ~~~~~~~~~~
         name: :class:`str`
             The name of boilerplate.
 
+            By default, the current version of boilerplate is loaded. The name can
+            be followed by ``@`` and either a version (e.g. ``name@1.4``) or a PEP 440
+            version specifier (e.g. ``name@>=1.2,<2``) in which case the highest
+            installed version matching the specifier is loaded.
+
         Returns
         ~~~~~~~
         :class:`BoilerplateInfo`
             The loaded boilerplate.
         """
-        bp_dir = utils.get_prept_dir('boilerplates', name.lower())
+        bp_name, spec = installation.split_spec(name)
+        bp_dir = installation.resolve_installation(bp_name, spec)
 
-        if not bp_dir.exists():
+        if bp_dir is None:
             raise BoilerplateNotFound(name)
         
         bp = cls.from_path(bp_dir)
@@ -538,41 +745,36 @@ class BoilerplateInfo:
         return bp
 
     @classmethod
-    def _clone_from_git(cls, clone_url: str) -> Self:
+    def _clone_from_git(cls, clone_spec: str, sync: bool = True) -> Self:
         # This method is only intended to be used by the install command and is not exposed
         # in public API unlike from_path and from_installation because the temporary directory
         # created for cloning requires a manual cleanup after installation.
         if not _is_git_installed():
             raise PreptCLIError('Git must be installed for this operation.')
 
-        outputs.echo_info(f'Cloning git repository from {clone_url}')
-        tempdir_mgr = tempfile.TemporaryDirectory(dir=utils.get_prept_dir('cloned', mk=True), delete=False)
+        url, ref = GitMirror.parse_spec(clone_spec)
+        mirror = GitMirror(url)
 
-        with tempdir_mgr as clone_dir:
-            proc = subprocess.Popen(
-                ['git', 'clone', clone_url, clone_dir],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-            )
-            returncode = proc.wait()
-            if returncode:
-                _, stderr = proc.communicate()
-                tempdir_mgr.cleanup()
-                raise PreptCLIError(f'git clone returned non-zero exit code {returncode}, the following error was captured on stderr:\n{stderr.decode()}')
+        if sync:
+            outputs.echo_info(f'Fetching git repository from {url}')
+            mirror.sync()
 
-            outputs.echo_info(f'Successfully cloned repository at {clone_dir}, validating boilerplate')
-            clone_path = pathlib.Path(clone_dir)
+        commit = mirror.resolve(ref)
+        clone_path = pathlib.Path(tempfile.mkdtemp(dir=utils.get_prept_dir('cloned', mk=True)))
 
-            try:
-                bp = cls.from_path(clone_path)
-            except Exception:
-                tempdir_mgr.cleanup()
-                raise
-            else:
-                bp._installed = False
-                bp._from_git = True
+        try:
+            mirror.materialize(commit, clone_path)
+            outputs.echo_info(f'Checked out commit {commit} at {clone_path}, validating boilerplate')
+            bp = cls.from_path(clone_path)
+        except Exception:
+            shutil.rmtree(clone_path, ignore_errors=True)
+            raise
 
-            return bp
+        bp._installed = False
+        bp._from_git = True
+        bp._git_origin = {'url': url, 'ref': ref, 'commit': commit}
+
+        return bp
 
     @classmethod
     def resolve(cls, value: Any) -> Self:
@@ -631,12 +833,21 @@ class BoilerplateInfo:
         if self._template_provider:
             data['template_provider'] = self._template_provider
 
+        if self._template_providers:
+            data['template_providers'] = self._template_provider_specs
+
         if self._template_files:
             data['template_files'] = self._template_files
 
         if self._template_paths:
             data['template_paths'] = self._template_paths
 
+        if self._conditions:
+            data['conditional_paths'] = self.conditional_paths
+
+        if self._fanout_files:
+            data['fanout_files'] = {fanout.pattern: fanout._dump() for fanout in self._fanout_files}
+
         if self.template_variables:
             data['template_variables'] = {v.name: v._dump() for v in self.template_variables.values()}
 
@@ -0,0 +1,321 @@
+# Copyright (C) Izhar Ahmad 2025-2026
+
+from __future__ import annotations
+
+from typing import IO, TYPE_CHECKING, Any, Callable, cast
+from prept.store import BlobStore, InstallationManifest, MANIFEST_PATH, _hash_file
+
+import io
+import os
+import re
+import json
+import stat
+import shutil
+import pathlib
+import tarfile
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
+__all__ = (
+    'BundleEntry',
+    'export_bundle',
+    'import_bundle',
+)
+
+BUNDLE_FORMAT = 1
+BUNDLE_INDEX = 'bundle.json'
+
+_ARTIFACTS_DIRECTORY = MANIFEST_PATH.parent.as_posix()
+_BLOB_NAME_RE = re.compile(r'[0-9a-f]{64}-[0-7]+')
+_ENTRY_INDEX_RE = re.compile(r'[0-9]+')
+
+
+class BundleEntry:
+    """An installed boilerplate version packed in a bundle.
+
+    .. versionadded:: 0.2.0
+
+    Attributes
+    ~~~~~~~~~~
+    name: :class:`str`
+        The name of boilerplate.
+    version: :class:`str`
+        The name of installed version, as used in installation layout.
+    current: :class:`bool`
+        Whether this version was the current version when exported.
+    suffix: :class:`str` | None
+        The archive suffix for boilerplates installed as archives, ``None``
+        for boilerplates installed as directories.
+    manifest: :class:`InstallationManifest` | None
+        The manifest of installed files for boilerplates installed as
+        directories.
+    artifacts: list[:class:`str`]
+        The paths of additional files such as precompiled artifacts,
+        relative to the installation directory.
+    """
+    def __init__(
+        self,
+        name: str,
+        version: str,
+        *,
+        current: bool = False,
+        suffix: str | None = None,
+        manifest: InstallationManifest | None = None,
+        artifacts: list[str] | None = None,
+    ) -> None:
+        self.name = name
+        self.version = version
+        self.current = current
+        self.suffix = suffix
+        self.manifest = manifest
+        self.artifacts = artifacts or []
+
+    @classmethod
+    def _from_data(cls, data: dict[str, Any]) -> Self:
+        manifest = None
+        if data.get('files') is not None:
+            files = {path: (digest, int(mode)) for path, (digest, mode) in data['files'].items()}
+            manifest = InstallationManifest(files, data.get('origin'))
+
+        return cls(
+            name=data['name'],
+            version=data['version'],
+            current=data.get('current', False),
+            suffix=data.get('suffix'),
+            manifest=manifest,
+            artifacts=data.get('artifacts', []),
+        )
+
+    def _dump(self) -> dict[str, Any]:
+        return {
+            'name': self.name,
+            'version': self.version,
+            'current': self.current,
+            'suffix': self.suffix,
+            'files': None if self.manifest is None else {path: [digest, mode] for path, (digest, mode) in self.manifest.files.items()},
+            'origin': None if self.manifest is None else self.manifest.origin,
+            'artifacts': self.artifacts,
+        }
+
+
+def _is_safe_path(path: str) -> bool:
+    # Paths from bundles must not point outside the installation directory.
+    parts = pathlib.PurePosixPath(path).parts
+    return bool(parts) and not path.startswith('/') and '..' not in parts and ':' not in parts[0]
+
+
+def _get_manifest(path: pathlib.Path) -> InstallationManifest:
+    manifest = InstallationManifest.load(path)
+    if manifest is not None:
+        return manifest
+
+    # Installations made before the files store was introduced have no
+    # manifest so one is computed from the installed files.
+    manifest = InstallationManifest()
+    for root, dirs, files in os.walk(path):
+        rel = pathlib.Path(root).relative_to(path)
+        if rel == pathlib.Path('.'):
+            dirs[:] = [d for d in dirs if d != _ARTIFACTS_DIRECTORY]
+
+        for name in files:
+            file = path / rel / name
+            manifest.files[(rel / name).as_posix()] = (_hash_file(file), stat.S_IMODE(os.stat(file).st_mode))
+
+    return manifest
+
+
+def _get_artifacts(path: pathlib.Path) -> list[str]:
+    artifacts: list[str] = []
+    for root, _, files in os.walk(path / _ARTIFACTS_DIRECTORY):
+        for name in files:
+            rel = (pathlib.Path(root) / name).relative_to(path).as_posix()
+            if rel != MANIFEST_PATH.as_posix():
+                artifacts.append(rel)
+
+    return artifacts
+
+
+def _add_file(tar: tarfile.TarFile, arcname: str, path: pathlib.Path, mode: int | None = None) -> None:
+    info = tarfile.TarInfo(arcname)
+    info.size = os.path.getsize(path)
+    info.mode = stat.S_IMODE(os.stat(path).st_mode) if mode is None else mode
+
+    with open(path, 'rb') as f:
+        tar.addfile(info, f)
+
+
+def export_bundle(
+    fileobj: IO[bytes],
+    installations: list[tuple[BundleEntry, pathlib.Path]],
+    *,
+    compress: bool = True,
+) -> list[BundleEntry]:
+    """Packs installed boilerplates into a bundle.
+
+    A bundle is a tar archive that starts with an index of packed boilerplates
+    followed by the content of each unique file once, so bundles can be
+    imported using :func:`import_bundle` in a single sequential read.
+
+    The archive is written in streaming mode so the file object does not need
+    to be seekable.
+
+    Parameters
+    ~~~~~~~~~~
+    fileobj:
+        The binary file object to write the bundle to.
+    installations: list[tuple[:class:`BundleEntry`, :class:`pathlib.Path`]]
+        The entries to pack along with paths of their installations. The
+        manifest and artifacts of entries are populated by this function.
+    compress: :class:`bool`
+        Whether to gzip compress the bundle. Defaults to True.
+
+    Returns
+    ~~~~~~~
+    list[:class:`BundleEntry`]
+        The packed entries.
+    """
+    blobs: dict[str, tuple[pathlib.Path, int]] = {}
+    entries: list[BundleEntry] = []
+
+    for entry, path in installations:
+        if path.is_dir():
+            entry.manifest = _get_manifest(path)
+            entry.artifacts = _get_artifacts(path)
+
+            for file, (digest, mode) in entry.manifest.files.items():
+                blobs.setdefault(BlobStore.get_blob_name(digest, mode), (path / file, mode))
+
+        entries.append(entry)
+
+    index = json.dumps({
+        'format': BUNDLE_FORMAT,
+        'boilerplates': [entry._dump() for entry in entries],
+        'blobs': sorted(blobs),
+    }).encode()
+
+    with tarfile.open(fileobj=fileobj, mode='w|gz' if compress else 'w|') as tar:
+        info = tarfile.TarInfo(BUNDLE_INDEX)
+        info.size = len(index)
+        tar.addfile(info, io.BytesIO(index))
+
+        for name, (file, mode) in sorted(blobs.items()):
+            _add_file(tar, f'blobs/{name}', file, mode)
+
+        for i, (entry, path) in enumerate(installations):
+            if entry.suffix is not None:
+                _add_file(tar, f'archives/{i}{entry.suffix}', path)
+            for artifact in entry.artifacts:
+                _add_file(tar, f'artifacts/{i}/{artifact}', path / artifact)
+
+    return entries
+
+
+def import_bundle(
+    fileobj: IO[bytes],
+    stage: Callable[[list[BundleEntry]], list[pathlib.Path]],
+    store: BlobStore | None = None,
+) -> list[tuple[BundleEntry, pathlib.Path]]:
+    """Unpacks a bundle created by :func:`export_bundle`.
+
+    The bundle is read sequentially so the file object does not need to be
+    seekable. File contents are verified and streamed directly into the store
+    and files already present in store are skipped.
+
+    Parameters
+    ~~~~~~~~~~
+    fileobj:
+        The binary file object to read the bundle from.
+    stage:
+        The function called with the list of entries once the index is read.
+        It returns the paths to unpack each entry to, which must not exist.
+        It can raise an error to abort the import before any file is read.
+    store: :class:`BlobStore` | None
+        The store to add files to. Defaults to the store in Prept's directory.
+
+    Returns
+    ~~~~~~~
+    list[tuple[:class:`BundleEntry`, :class:`pathlib.Path`]]
+        The unpacked entries and the paths they were unpacked to.
+    """
+    if store is None:
+        store = BlobStore()
+
+    with tarfile.open(fileobj=fileobj, mode='r|*') as tar:
+        members = iter(tar)
+        first = next(members, None)
+        if first is None or first.name != BUNDLE_INDEX:
+            raise ValueError('not a Prept bundle, index is missing')
+
+        f = tar.extractfile(first)
+        assert f is not None
+        data = json.load(f)
+        index = cast('dict[str, Any]', data) if isinstance(data, dict) else None
+
+        if index is None or index.get('format') != BUNDLE_FORMAT:
+            raise ValueError('unsupported bundle format')
+
+        entries = [BundleEntry._from_data(entry) for entry in index['boilerplates']]
+        for entry in entries:
+            relative_paths = [*entry.artifacts, *(entry.manifest.files if entry.manifest else ())]
+            if not all(_is_safe_path(path) for path in relative_paths):
+                raise ValueError(f'bundle entry for {entry.name} {entry.version} contains unsafe paths')
+
+        paths = stage(entries)
+        unpacked = list(zip(entries, paths))
+
+        try:
+            for member in members:
+                if not member.isfile():
+                    continue
+
+                kind, _, name = member.name.partition('/')
+                f = tar.extractfile(member)
+                assert f is not None
+
+                if kind == 'blobs':
+                    # Names are validated before they are used to build paths in store.
+                    if not _BLOB_NAME_RE.fullmatch(name):
+                        raise ValueError(f'invalid blob name {name!r}')
+
+                    digest, _, mode = name.rpartition('-')
+                    store.add_stream(f, digest, int(mode, 8))
+                    continue
+
+                if kind not in ('archives', 'artifacts'):
+                    continue
+
+                i, _, rest = name.partition('/') if kind == 'artifacts' else (name.split('.', 1)[0], '', '')
+                if not _ENTRY_INDEX_RE.fullmatch(i) or int(i) >= len(unpacked):
+                    raise ValueError(f'invalid entry index in {member.name!r}')
+
+                entry, path = unpacked[int(i)]
+
+                if kind == 'archives' and entry.suffix is not None:
+                    target = path
+                elif kind == 'artifacts' and rest in entry.artifacts:
+                    target = path / rest
+                else:
+                    continue
+
+                os.makedirs(target.parent, exist_ok=True)
+                with open(target, 'wb') as dst:
+                    shutil.copyfileobj(f, dst)
+
+            for entry, path in unpacked:
+                if entry.manifest is None:
+                    continue
+
+                for file, blob in entry.manifest.files.items():
+                    store.link(*blob, path / file)
+
+                entry.manifest.save(path)
+        except BaseException:
+            for _, path in unpacked:
+                if path.is_dir():
+                    shutil.rmtree(path, ignore_errors=True)
+                elif path.exists():
+                    os.remove(path)
+            raise
+
+    return unpacked
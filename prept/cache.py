@@ -0,0 +1,227 @@
+# Copyright (C) Izhar Ahmad 2025-2026
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Mapping, cast
+from prept import utils
+
+import os
+import json
+import hashlib
+import pathlib
+import tempfile
+
+if TYPE_CHECKING:
+    from prept.providers import TemplateProvider
+
+__all__ = (
+    'RenderCache',
+)
+
+DEFAULT_RENDER_CACHE_SIZE = 256 * 1024 * 1024  # 256 MiB
+
+# First byte of cache entries indicates the type of rendered content.
+_ENTRY_TEXT = b't'
+_ENTRY_BINARY = b'b'
+
+_JSON_SCALAR_TYPES = (str, int, float, bool, type(None))
+
+
+def _is_json_value(value: Any) -> bool:
+    # Only values that JSON represents exactly are accepted. Types are checked
+    # exactly as e.g. tuples or subclasses of str would be serialized same as
+    # list or str while being rendered differently by templates.
+    if type(value) in _JSON_SCALAR_TYPES:
+        return True
+    if type(value) is list:
+        return all(_is_json_value(item) for item in cast('list[Any]', value))
+    if type(value) is dict:
+        return all(type(key) is str and _is_json_value(item) for key, item in cast('dict[Any, Any]', value).items())
+
+    return False
+
+
+class RenderCache:
+    """On-disk cache of content rendered by template providers.
+
+    Cache entries are keyed by the hash of template file content, identity of
+    template provider, and the values of only those template variables that the
+    template file references. As such, files that do not depend on a variable
+    that differs across generations are rendered only once.
+
+    Only template providers that set :attr:`TemplateProvider.cacheable` are
+    cached. When the total size of cache exceeds the maximum size, the least
+    recently used entries are evicted.
+
+    .. versionadded:: 0.2.0
+
+    Parameters
+    ~~~~~~~~~~
+    directory: :class:`pathlib.Path` | None
+        The directory to store cache in. Defaults to the ``cache/render``
+        directory in Prept's directory.
+    max_size: :class:`int`
+        The maximum size of cache in bytes. Defaults to 256 MiB.
+    """
+    def __init__(self, directory: pathlib.Path | None = None, max_size: int = DEFAULT_RENDER_CACHE_SIZE) -> None:
+        if directory is None:
+            directory = utils.get_prept_dir('cache', 'render')
+
+        self.directory = directory
+        self.max_size = max_size
+
+    def _get_entry_path(self, key: str) -> pathlib.Path:
+        return self.directory / key[:2] / key
+
+    def get_key(
+        self,
+        source: bytes | memoryview,
+        provider: TemplateProvider,
+        variables: Mapping[str, Any],
+        referenced: frozenset[str] | None,
+    ) -> str | None:
+        """Computes the cache key for a template.
+
+        Values of referenced variables must be JSON values (strings, numbers, booleans,
+        ``None`` and lists or dictionaries of them). If any value is of another type,
+        it cannot be reliably represented in the key and ``None`` is returned, in
+        which case the template should not be cached.
+
+        Parameters
+        ~~~~~~~~~~
+        source: :class:`bytes` | :class:`memoryview`
+            The content of template file.
+        provider: :class:`TemplateProvider`
+            The template provider rendering the template.
+        variables:
+            The template variables used for rendering.
+        referenced: frozenset[:class:`str`] | None
+            The names of variables referenced by template. If ``None``, the
+            template cannot be cached and ``None`` is returned.
+
+        Returns
+        ~~~~~~~
+        :class:`str` | None
+            The cache key, if referenced variables are known and their values
+            can be represented.
+        """
+        if referenced is None:
+            # Keying on all variables would evaluate every computed variable
+            # and renders depending on unknown variables are rarely reused.
+            return None
+
+        # Variables missing at generation time are included as well because
+        # providers render missing variables differently than present ones.
+        values = [
+            (name, variables[name] if name in variables else None, name in variables)
+            for name in sorted(referenced)
+        ]
+
+        if not all(_is_json_value(value) for _, value, _ in values):
+            return None
+
+        digest = hashlib.sha256()
+        digest.update(f'{type(provider).__module__}:{type(provider).__qualname__}\0'.encode())
+        digest.update(hashlib.sha256(source).digest())
+        digest.update(json.dumps(values).encode())
+
+        return digest.hexdigest()
+
+    def get(self, key: str) -> str | bytes | None:
+        """Gets the rendered content for the given key.
+
+        Returns ``None`` if there is no cache entry for this key.
+        """
+        path = self._get_entry_path(key)
+        try:
+            data = path.read_bytes()
+        except OSError:
+            return None
+
+        try:
+            # Modification time is used to track the recently used entries.
+            os.utime(path)
+        except OSError:
+            pass
+
+        kind, content = data[:1], data[1:]
+        if kind == _ENTRY_TEXT:
+            return content.decode('utf-8')
+        if kind == _ENTRY_BINARY:
+            return content
+
+        return None
+
+    def put(self, key: str, content: str | bytes) -> None:
+        """Stores the rendered content for the given key."""
+        if isinstance(content, str):
+            data = _ENTRY_TEXT + content.encode('utf-8')
+        else:
+            data = _ENTRY_BINARY + content
+
+        path = self._get_entry_path(key)
+        os.makedirs(path.parent, exist_ok=True)
+
+        # Entry is written to a temporary file first so concurrent generations
+        # sharing the cache never read a partially written entry.
+        fd, temp = tempfile.mkstemp(dir=path.parent, prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(temp, path)
+        except BaseException:
+            try:
+                os.remove(temp)
+            except OSError:
+                pass
+            raise
+
+    def evict(self) -> int:
+        """Evicts the least recently used entries until cache fits the maximum size.
+
+        Returns the number of evicted entries.
+        """
+        entries: list[tuple[int, int, str]] = []
+        total = 0
+
+        if not self.directory.exists():
+            return 0
+
+        for bucket in os.scandir(self.directory):
+            if not bucket.is_dir():
+                continue
+            for entry in os.scandir(bucket.path):
+                if entry.name.startswith('.tmp-'):
+                    continue
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+
+                entries.append((st.st_mtime_ns, st.st_size, entry.path))
+                total += st.st_size
+
+        evicted = 0
+        entries.sort()
+
+        for _, size, path in entries:
+            if total <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+
+            total -= size
+            evicted += 1
+
+        return evicted
+
+    def clear(self) -> None:
+        """Removes all entries from the cache."""
+        max_size = self.max_size
+        self.max_size = 0
+        try:
+            self.evict()
+        finally:
+            self.max_size = max_size
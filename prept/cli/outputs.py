@@ -3,13 +3,17 @@
 from __future__ import annotations
 
 from prept.errors import PreptCLIError
-from typing import Any
+from typing import Any, Generator
 
+import contextlib
+import threading
 import traceback
 import click
 
 __all__ = (
     'cli_msg',
+    'silenced',
+    'echo',
     'echo_error',
     'echo_success',
     'echo_info',
@@ -32,17 +36,34 @@ def cli_msg(
     msg = click.style(message, **(message_opts or {}))
     return pref + msg
 
+_state = threading.local()
+
+@contextlib.contextmanager
+def silenced() -> Generator[None, None, None]:
+    # Output is silenced per thread so that workers running concurrently
+    # do not interleave their output with the output of main thread.
+    previous = getattr(_state, 'silenced', False)
+    _state.silenced = True
+    try:
+        yield
+    finally:
+        _state.silenced = previous
+
+def echo(message: str | None = None, **kwargs: Any):
+    if not getattr(_state, 'silenced', False):
+        click.secho(message, **kwargs)
+
 def echo_error(message: str):
-    click.echo(cli_msg('ERROR', message, prefix_opts={'fg': 'red'}))
+    echo(cli_msg('ERROR', message, prefix_opts={'fg': 'red'}))
 
 def echo_success(message: str):
-    click.echo(cli_msg('SUCCESS', message, prefix_opts={'fg': 'green'}))
+    echo(cli_msg('SUCCESS', message, prefix_opts={'fg': 'green'}))
 
 def echo_info(message: str):
-    click.echo(cli_msg('INFO', message, prefix_opts={'fg': 'blue'}))
+    echo(cli_msg('INFO', message, prefix_opts={'fg': 'blue'}))
 
 def echo_warning(message: str):
-    click.echo(cli_msg('WARNING', message, prefix_opts={'fg': 'yellow'}))
+    echo(cli_msg('WARNING', message, prefix_opts={'fg': 'yellow'}))
 
 def wrap_exception(
     exc: Exception,
@@ -4,7 +4,9 @@
 from __future__ import annotations
 
 from typing import Any
+from prept import installation
 from prept.boilerplate import BoilerplateInfo
+from prept.cli.status import acquire_lock
 
 import click
 
@@ -26,20 +28,25 @@ class BoilerplateParamType(click.ParamType):
         Controls whether resolution includes lookup through installed boilerplates.
 
         If true, only path resolution is done. Defaults to False.
+    lock: :class:`bool`
+        Whether to hold a shared lock on installed boilerplates until the
+        command finishes so that they are not modified while being used.
+        Defaults to True.
     """
     name = "boilerplate"
 
-    def __init__(self, *, installed: bool = True, path: bool = True, git: bool = True) -> None:
+    def __init__(self, *, installed: bool = True, path: bool = True, git: bool = True, lock: bool = True) -> None:
         self.installed = installed
         self.path = path
         self.git = git
+        self.lock = lock
 
     def convert(self, value: Any, param: click.Parameter | None, ctx: click.Context | None) -> BoilerplateInfo:
         if isinstance(value, BoilerplateInfo):
             return value
 
         if isinstance(value, str) and value.startswith('git+') and self.git:
-            return BoilerplateInfo._clone_from_git(value.lstrip('git+'))
+            return BoilerplateInfo._clone_from_git(value[len('git+'):])
 
         if self.path:
             try:
@@ -48,6 +55,13 @@ class BoilerplateParamType(click.ParamType):
                 pass
 
         if self.installed:
+            if self.lock and ctx is not None:
+                name, _ = installation.split_spec(str(value))
+                ctx.with_resource(acquire_lock(
+                    installation.lock_installation(name, shared=True),
+                    f'Waiting for another operation on boilerplate {name!r} to finish...',
+                ))
+
             return BoilerplateInfo.from_installation(value)
 
         # resolve() raises InvalidConfig, ConfigNotFound, or BoilerplateNotFound errors
@@ -55,5 +69,5 @@ class BoilerplateParamType(click.ParamType):
         return BoilerplateInfo.resolve(value)
 
 BOILERPLATE = BoilerplateParamType()
-BOILERPLATE_INSTALLED = BoilerplateParamType(installed=True, path=False)
+BOILERPLATE_INSTALLED = BoilerplateParamType(installed=True, path=False, lock=False)
 BOILERPLATE_INSTALLABLE = BoilerplateParamType(installed=False)
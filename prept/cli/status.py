@@ -2,19 +2,35 @@
 
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Generator
 from typing_extensions import Self
 from prept.cli import outputs
 from prept.errors import PreptCLIError
+from prept.locks import FileLock
 
-import click
 import types
+import contextlib
 
 __all__ = (
     'StatusUpdate',
+    'acquire_lock',
 )
 
 
+@contextlib.contextmanager
+def acquire_lock(lock: FileLock, message: str) -> Generator[FileLock, None, None]:
+    # The message is only shown if the lock is held by another process.
+    if not lock.acquire(blocking=False):
+        outputs.echo_info(message)
+        lock.acquire()
+
+    try:
+        yield lock
+    finally:
+        lock.release()
+
+
+
 class StatusUpdate:
     def __init__(
         self,
@@ -31,16 +47,16 @@ class StatusUpdate:
         self._reraise_prept_error = reraise_prept_error
 
     def __enter__(self) -> Self:
-        click.secho(self._message + ' ... ', nl=False, **self._echo_kwargs)
+        outputs.echo(self._message + ' ... ', nl=False, **self._echo_kwargs)
         return self
 
     def __exit__(self, exc_type: type[Exception] | None, exc: Exception | None, tb: types.TracebackType | None) -> None:
         if exc is None:
-            click.secho('DONE', fg='green')
+            outputs.echo('DONE', fg='green')
             return
 
-        click.secho('ERROR', fg='red')
-        click.echo()
+        outputs.echo('ERROR', fg='red')
+        outputs.echo()
 
         if isinstance(exc, PreptCLIError) and self._reraise_prept_error:
             raise exc from None
@@ -11,6 +11,12 @@ from prept.commands.install import *
 from prept.commands.list import *
 from prept.commands.info import *
 from prept.commands.uninstall import *
+from prept.commands.compile import *
+from prept.commands.gc import *
+from prept.commands.use import *
+from prept.commands.update import *
+from prept.commands.index import *
+from prept.commands.bundle import *
 
 __all__ = (
     'commands_list',
@@ -23,4 +29,10 @@ commands_list = (
     list_bps,
     info,
     uninstall,
+    compile_bp,
+    gc,
+    use,
+    update,
+    index,
+    bundle,
 )
@@ -0,0 +1,235 @@
+# Copyright (C) Izhar Ahmad 2025-2026
+
+from __future__ import annotations
+
+from typing import IO
+from prept import installation
+from prept.bundle import BundleEntry, export_bundle, import_bundle
+from prept.cli import outputs
+from prept.cli.status import StatusUpdate, acquire_lock
+from prept.boilerplate import BoilerplateInfo
+from prept.compiler import CompiledBoilerplate
+from prept.errors import PreptCLIError, BoilerplateNotFound
+from prept.sources import get_archive_suffix
+
+import os
+import shutil
+import pathlib
+import contextlib
+import click
+
+__all__ = (
+    'bundle',
+)
+
+
+def _get_version(path: pathlib.Path) -> str:
+    bp = BoilerplateInfo.from_path(path)
+    bp.source.close()
+    return installation.get_version_key(bp.version)
+
+
+def _collect_installations(names: tuple[str, ...], all_versions: bool) -> list[tuple[BundleEntry, pathlib.Path]]:
+    installations: list[tuple[BundleEntry, pathlib.Path]] = []
+    seen: set[tuple[str, str]] = set()
+
+    for value in names:
+        name, spec = installation.split_spec(value)
+        name = name.lower()
+        current = installation.get_current_version(name)
+
+        if all_versions:
+            paths = installation.get_installed_versions(name)
+            legacy = installation.get_legacy_installation(name)
+            if legacy is not None:
+                current = _get_version(legacy)
+                paths.setdefault(current, legacy)
+        else:
+            path = installation.resolve_installation(name, spec)
+            paths = {} if path is None else {_get_version(path): path}
+
+        if not paths:
+            raise BoilerplateNotFound(value)
+
+        for version, path in paths.items():
+            if (name, version) in seen:
+                continue
+
+            seen.add((name, version))
+            suffix = get_archive_suffix(path) if path.is_file() else None
+            entry = BundleEntry(name, version, current=current in (None, version), suffix=suffix)
+            installations.append((entry, path))
+
+    return installations
+
+
+@click.group()
+def bundle():
+    """Exports and imports bundles of installed boilerplates.
+
+    A bundle packs installed boilerplates along with their installation
+    metadata and precompiled artifacts into a single archive that stores
+    each unique file once. Importing a bundle is a single sequential read
+    which makes bundles suitable for provisioning many hosts.
+    """
+
+
+@bundle.command(name='export')
+@click.pass_context
+@click.argument(
+    'output',
+    type=click.File('wb'),
+)
+@click.argument(
+    'names',
+    nargs=-1,
+)
+@click.option(
+    '--all-versions',
+    is_flag=True,
+    default=False,
+    help='Include all installed versions of boilerplates instead of current version only.',
+)
+def export_cmd(ctx: click.Context, output: IO[bytes], names: tuple[str, ...], all_versions: bool = False):
+    """Exports installed boilerplates to a bundle.
+
+    OUTPUT is the path of bundle file or - for writing to standard output.
+    Bundles are gzip compressed unless OUTPUT ends with .tar.
+
+    NAMES are the names of installed boilerplates to export, optionally followed
+    by @ and a version or version specifier. If not given, all boilerplates
+    installed in Prept directory are exported.
+
+    Examples:
+
+    * prept bundle export boilerplates.tar.gz
+
+    * prept bundle export --all-versions boilerplates.tar.gz basic fastapi-app
+    """
+    if not names:
+        names = tuple(sorted(installation.get_installed_names()))
+
+    # Output is silenced when bundle is written to standard output.
+    with outputs.silenced() if output.name == '<stdout>' else contextlib.nullcontext(), contextlib.ExitStack() as stack:
+        # Boilerplates are locked while exporting so they are not
+        # modified midway.
+        for name in sorted({installation.split_spec(value)[0].lower() for value in names}):
+            stack.enter_context(acquire_lock(
+                installation.lock_installation(name, shared=True),
+                f'Waiting for another operation on boilerplate {name!r} to finish...',
+            ))
+
+        installations = _collect_installations(names, all_versions)
+        if not installations:
+            raise PreptCLIError('No boilerplates are installed.')
+
+        with StatusUpdate(
+            message=outputs.cli_msg(f'Exporting {len(installations)} installed boilerplates to \'{output.name}\''),
+            error_message='Bundle could not be exported due to following error:',
+        ):
+            entries = export_bundle(output, installations, compress=not output.name.endswith('.tar'))
+
+        for entry in entries:
+            outputs.echo(f'- {entry.name} {entry.version}{" (current)" if entry.current else ""}')
+
+
+@bundle.command(name='import')
+@click.pass_context
+@click.argument(
+    'bundle_file',
+    metavar='BUNDLE',
+    type=click.File('rb'),
+)
+@click.option(
+    '--yes', '-y',
+    is_flag=True,
+    default=False,
+    help='Overwrite already installed versions.',
+)
+def import_cmd(ctx: click.Context, bundle_file: IO[bytes], yes: bool = False):
+    """Installs boilerplates from a bundle.
+
+    BUNDLE is the path of bundle file created by "prept bundle export" or -
+    for reading from standard input. The bundle is read once from start to
+    end and file contents are added directly to the store, so bundles can
+    be streamed from network, e.g. using curl.
+
+    Versions marked as current in the bundle become the current versions.
+
+    Examples:
+
+    * prept bundle import boilerplates.tar.gz
+
+    * curl -sSL https://example.com/boilerplates.tar.gz | prept bundle import -
+    """
+    def stage(entries: list[BundleEntry]) -> list[pathlib.Path]:
+        paths: list[pathlib.Path] = []
+        for entry in entries:
+            if not entry.name or entry.name.startswith('.') or any(sep in entry.name + entry.version for sep in ('/', '\\')):
+                raise PreptCLIError(f'Bundle contains invalid boilerplate name or version: {entry.name} {entry.version}')
+
+            if entry.version in installation.get_installed_versions(entry.name) and not yes:
+                raise PreptCLIError(
+                    f'Version {entry.version} of boilerplate {entry.name!r} is already installed.',
+                    'Pass --yes option to overwrite installed versions.',
+                )
+
+            target = installation.get_installation_dir(entry.name) / installation.VERSIONS_DIRECTORY / (entry.version + (entry.suffix or ''))
+            os.makedirs(target.parent, exist_ok=True)
+            paths.append(installation.get_staging_path(target))
+
+        return paths
+
+    with acquire_lock(installation.lock_registry(shared=True), 'Waiting for another Prept process to finish...'):
+        with StatusUpdate(
+            message=outputs.cli_msg(f'Reading bundle from \'{bundle_file.name}\''),
+            error_message='Bundle could not be imported due to following error:',
+        ):
+            try:
+                unpacked = import_bundle(bundle_file, stage)
+            except ValueError as e:
+                raise PreptCLIError(f'Invalid bundle: {e}') from None
+
+        published = 0
+        try:
+            for entry, staging in unpacked:
+                target = installation.get_installation_dir(entry.name) / installation.VERSIONS_DIRECTORY / (entry.version + (entry.suffix or ''))
+
+                if entry.manifest is not None:
+                    # File contents are verified against their hashes so precompiled
+                    # artifacts only need their fingerprint updated.
+                    compiled = CompiledBoilerplate.load(BoilerplateInfo.from_path(staging), verify=False)
+                    if compiled is not None:
+                        compiled.save()
+
+                with acquire_lock(
+                    installation.lock_installation(entry.name),
+                    f'Waiting for another operation on boilerplate {entry.name!r} to finish...',
+                ):
+                    if installation.get_legacy_installation(entry.name) is not None:
+                        installation.migrate_legacy_installation(entry.name)
+
+                    previous = installation.get_installed_versions(entry.name).get(entry.version)
+                    backup = installation.publish_staged(staging, target, previous)
+                    if backup is not None:
+                        if backup.is_dir():
+                            shutil.rmtree(backup)
+                        else:
+                            os.remove(backup)
+
+                    if entry.current or installation.get_current_version(entry.name) is None:
+                        installation.set_current_version(entry.name, entry.version)
+
+                    installation.refresh_index()
+
+                outputs.echo_success(f'Installed {entry.name} {entry.version}')
+                published += 1
+        finally:
+            # Staged installations not published due to an error are removed.
+            for _, staging in unpacked[published:]:
+                if staging.is_dir():
+                    shutil.rmtree(staging, ignore_errors=True)
+                elif staging.exists():
+                    os.remove(staging)
+
+    outputs.echo_success(f'Successfully imported {len(unpacked)} boilerplates.')
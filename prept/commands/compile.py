@@ -0,0 +1,66 @@
+# Copyright (C) Izhar Ahmad 2025-2026
+
+from __future__ import annotations
+
+from prept import installation
+from prept.cli import outputs
+from prept.cli.params import BoilerplateParamType
+from prept.cli.status import StatusUpdate, acquire_lock
+from prept.boilerplate import BoilerplateInfo
+from prept.compiler import CompiledBoilerplate
+from prept.errors import PreptCLIError
+from prept.sources import DirectorySource
+
+import click
+
+__all__ = (
+    'compile_bp',
+)
+
+
+@click.command(name='compile')
+@click.pass_context
+@click.argument(
+    'boilerplate',
+    required=True,
+    # Installed boilerplates are locked exclusively by the command itself.
+    type=BoilerplateParamType(lock=False),
+)
+def compile_bp(ctx: click.Context, boilerplate: BoilerplateInfo):
+    """Precompiles a boilerplate for faster generation.
+
+    This resolves the generated files, classifies template files and paths,
+    and precompiles the templates. The artifacts are stored in the .prept
+    directory of boilerplate and are used by "prept new" as long as the
+    boilerplate is not modified.
+
+    Installed boilerplates are precompiled automatically at installation time.
+
+    BOILERPLATE is either path to a boilerplate directory (containing preptconfig.json)
+    or name of an installed boilerplate.
+    """
+    if not isinstance(boilerplate.source, DirectorySource):
+        raise PreptCLIError(
+            'Boilerplates loaded from archives cannot be precompiled.',
+            'Archives are read without being extracted and do not require precompilation',
+        )
+
+    if boilerplate._installed:
+        # Artifacts are written in installation directory which may be in
+        # use by concurrent generations.
+        ctx.with_resource(acquire_lock(
+            installation.lock_installation(boilerplate.name),
+            f'Waiting for another operation on boilerplate {boilerplate.name!r} to finish...',
+        ))
+
+    with StatusUpdate(
+        outputs.cli_msg(f'Precompiling {boilerplate.name} boilerplate'),
+        error_message='Precompilation failed with following error:',
+    ):
+        compiled = CompiledBoilerplate.compile(boilerplate)
+        compiled.save()
+
+    templates = sum(1 for f in compiled.files if f.template)
+    copy_only = sum(1 for f in compiled.files if f.copy_only)
+
+    outputs.echo_success(f'Precompiled {len(compiled.files)} files ({templates} templates, {copy_only} copy-only)')
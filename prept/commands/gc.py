@@ -0,0 +1,82 @@
+# Copyright (C) Izhar Ahmad 2025-2026
+
+from __future__ import annotations
+
+from prept import utils, installation
+from prept.cli import outputs
+from prept.cli.status import StatusUpdate, acquire_lock
+from prept.store import BlobStore, InstallationManifest
+
+import os
+import shutil
+import pathlib
+import click
+
+__all__ = (
+    'gc',
+)
+
+_LEFTOVER_PREFIXES = ('.staging-', '.previous-', '.removing-')
+
+
+@click.command()
+@click.pass_context
+def gc(ctx: click.Context):
+    """Removes stored files not used by any installed boilerplate.
+
+    Files of installed boilerplates are kept in a content-addressed store
+    shared by all installations. Files are left in the store when boilerplates
+    are uninstalled or updated and this command removes them.
+
+    Files left behind by interrupted installations and uninstallations
+    are removed as well.
+    """
+    bps_dir = utils.get_prept_dir('boilerplates')
+    store = BlobStore()
+    referenced: set[str] = set()
+
+    leftovers: list[pathlib.Path] = []
+
+    # Installations and uninstallations hold the shared lock so none of
+    # them are in progress while the exclusive lock is held.
+    with acquire_lock(installation.lock_registry(), 'Waiting for other Prept processes to finish...'):
+        with StatusUpdate(
+            outputs.cli_msg('Collecting files referenced by installed boilerplates'),
+            error_message='Installed boilerplates could not be scanned due to following error:',
+        ):
+            if bps_dir.exists():
+                for entry in os.scandir(bps_dir):
+                    if entry.name.startswith('.'):
+                        leftovers.append(pathlib.Path(entry.path))
+                        continue
+                    if not entry.is_dir():
+                        continue
+
+                    versions_dir = bps_dir / entry.name / installation.VERSIONS_DIRECTORY
+                    if versions_dir.is_dir():
+                        leftovers.extend(pathlib.Path(e.path) for e in os.scandir(versions_dir) if e.name.startswith(_LEFTOVER_PREFIXES))
+
+                    paths = [bps_dir / entry.name, *installation.get_installed_versions(entry.name).values()]
+                    for path in paths:
+                        manifest = InstallationManifest.load(path) if path.is_dir() else None
+                        if manifest is not None:
+                            referenced.update(manifest.get_blobs())
+
+        if leftovers:
+            with StatusUpdate(
+                outputs.cli_msg(f'Removing {len(leftovers)} leftovers of interrupted installations'),
+                error_message='Leftovers of interrupted installations could not be removed due to following error:',
+            ):
+                for path in leftovers:
+                    if path.is_dir():
+                        shutil.rmtree(path)
+                    else:
+                        os.remove(path)
+
+        with StatusUpdate(
+            outputs.cli_msg(f'Removing unreferenced files from store at \'{store.directory}\''),
+            error_message='Unreferenced files could not be removed due to following error:',
+        ):
+            removed, freed = store.collect(referenced)
+
+    outputs.echo_success(f'Removed {removed} unreferenced files ({freed / (1024 * 1024):.2f} MiB freed)')
@@ -0,0 +1,59 @@
+# Copyright (C) Izhar Ahmad 2025-2026
+
+from __future__ import annotations
+
+from prept import utils, installation
+from prept.cli import outputs
+from prept.cli.status import StatusUpdate
+
+import click
+
+__all__ = (
+    'index',
+)
+
+
+@click.command()
+@click.pass_context
+@click.option(
+    '--remove',
+    is_flag=True,
+    default=False,
+    help='Remove the index so that installed boilerplates are resolved by scanning the directory.',
+)
+def index(ctx: click.Context, remove: bool = False):
+    """Indexes installed boilerplates for sharing the Prept directory.
+
+    Boilerplates are resolved from shared Prept directories listed in
+    PREPT_PATH environment variable (in addition to the user's Prept
+    directory) and indexed directories are resolved from without scanning
+    them, which is faster on network mounted file systems. Once indexed,
+    the index is kept up to date by commands modifying installations.
+
+    To prepare a shared directory, install boilerplates in it by setting
+    PREPT_HOME environment variable and index it:
+
+    * PREPT_HOME=/opt/prept prept install ./basic-boilerplate
+
+    * PREPT_HOME=/opt/prept prept index
+
+    Then use it from other users or hosts (e.g. through a read-only mount):
+
+    * PREPT_PATH=/opt/prept prept new basic-boilerplate
+    """
+    root = utils.get_prept_dir()
+
+    if remove:
+        if installation.remove_index():
+            outputs.echo_success(f'Removed index of Prept directory at \'{root}\'')
+        else:
+            outputs.echo_info(f'Prept directory at \'{root}\' is not indexed.')
+        return
+
+    with StatusUpdate(
+        message=outputs.cli_msg(f'Indexing installed boilerplates in \'{root}\''),
+        error_message='Installed boilerplates could not be indexed due to following error:',
+    ):
+        indexed = installation.build_index()
+
+    outputs.echo_success(f'Indexed {len(indexed)} installed boilerplates.')
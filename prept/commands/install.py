@@ -3,17 +3,23 @@
 from __future__ import annotations
 
 from typing import Any
-from prept import utils
+from prept import installation
 from prept.cli import outputs
 from prept.cli.params import BOILERPLATE_INSTALLABLE
-from prept.cli.status import StatusUpdate
-from prept.errors import BoilerplateNotFound
+from prept.cli.status import StatusUpdate, acquire_lock
+from prept.errors import PreptCLIError
 from prept.boilerplate import BoilerplateInfo
+from prept.compiler import CompiledBoilerplate
+from prept.sources import DirectorySource, get_archive_suffix
+from prept.store import BlobStore, InstallationManifest
 
 import os
 import stat
 import errno
+import sys
 import shutil
+import pathlib
+import concurrent.futures
 import click
 
 __all__ = (
@@ -32,51 +38,382 @@ def _handle_rm_read_only(func: Any, path: str, exc: BaseException):
         raise
 
 
+DEFAULT_JOBS = 4
+
+
+class _InstallRecord:
+    # Record of a completed installation used to roll it back.
+    def __init__(
+        self,
+        boilerplate: BoilerplateInfo,
+        target: pathlib.Path,
+        previous_current: str | None,
+        previous_path: pathlib.Path | None,
+        backup: pathlib.Path | None,
+    ) -> None:
+        self.boilerplate = boilerplate
+        self.target = target
+        self.previous_current = previous_current
+        self.previous_path = previous_path
+        self.backup = backup
+
+
 @click.command()
 @click.pass_context
 @click.argument(
-    'boilerplate',
-    type=BOILERPLATE_INSTALLABLE,
-    required=True,
+    'boilerplates',
+    nargs=-1,
+)
+@click.option(
+    '--from-file', '-r',
+    type=click.Path(exists=True, dir_okay=False, path_type=pathlib.Path),
+    default=None,
+    help='File listing the boilerplates to install, one path or git+ URL per line.',
+)
+@click.option(
+    '--jobs', '-j',
+    type=click.IntRange(min=1),
+    default=DEFAULT_JOBS,
+    show_default=True,
+    help='Maximum number of boilerplates installed concurrently.',
+)
+@click.option(
+    '--all-or-nothing',
+    is_flag=True,
+    default=False,
+    help='Roll back all installations if any boilerplate fails to install.',
 )
-def install(ctx: click.Context, boilerplate: BoilerplateInfo):
-    """Installs a boilerplate globally.
+@click.option(
+    '--yes', '-y',
+    is_flag=True,
+    default=False,
+    help='Overwrite already installed versions without prompting for confirmation.',
+)
+def install(
+    ctx: click.Context,
+    boilerplates: tuple[Any, ...],
+    from_file: pathlib.Path | None = None,
+    jobs: int = DEFAULT_JOBS,
+    all_or_nothing: bool = False,
+    yes: bool = False,
+):
+    """Installs boilerplates globally.
 
     Global installations allow generation from boilerplates directly using
     prept new BOILERPLATE using boilerplate name instead of having to pass
     paths.
 
-    BOILERPLATE can be a path to a valid boilerplate directory (containing
-    preptconfig.json) that is to be installed. If current working directory
+    BOILERPLATES are paths to valid boilerplate directories (containing
+    preptconfig.json) that are to be installed. If current working directory
     is the boilerplate template, use the "prept install ." command.
 
     It is also possible to install boilerplates through Git by passing a
-    repository URL with "git+" suffix. Git must be installed and on PATH
-    for this mode of installation.
+    repository URL with "git+" suffix, optionally followed by "@" and a branch,
+    tag or commit. Git must be installed and on PATH for this mode of installation.
+    Repositories are mirrored in Prept's directory so later installations and
+    "prept update" only fetch new changes. Installing a commit that is already
+    installed makes no changes.
+
+    Boilerplate files are stored once in a content-addressed store shared by
+    all installations and linked into the installation directory. Use the
+    "prept gc" command to remove files no longer used by any installation.
+
+    Boilerplates packaged as zip or tar archives are installed as archives
+    and are not extracted.
+
+    Multiple boilerplates, given as arguments or listed in a file passed to
+    --from-file, are installed concurrently. Installed versions are only
+    overwritten with --yes in this case. If multiple versions of a boilerplate
+    are installed, the version given last becomes the current version. Blank
+    lines and lines starting with # are ignored in the file and relative paths
+    are resolved from the file's directory.
 
     Examples:
 
     * prept install ./basic-boilerplate                     (install from path)
+    * prept install ./basic-boilerplate.zip                 (install from archive)
     * prept install git+https://github.com/user/repo.git    (install from git)
+    * prept install git+https://github.com/user/repo.git@v1 (install from git tag or branch)
+    * prept install -r boilerplates.txt --all-or-nothing    (install from a list)
     """
-    overwrite = False
+    sources = list(boilerplates)
+    if from_file is not None:
+        sources.extend(_read_sources_file(from_file))
 
-    try:
-        bp_installed = BoilerplateInfo.from_installation(boilerplate.name)
-    except BoilerplateNotFound:
-        pass
-    else:
-        outputs.echo_warning(f'Another boilerplate with name {boilerplate.name!r} is already installed.')
-        outputs.echo_info(f'Installed Version: {bp_installed.version or 'N/A'}')
-        outputs.echo_info(f'Installing Version: {bp_installed.version or 'N/A'}')
+    if not sources:
+        raise PreptCLIError(
+            'No boilerplate to install.',
+            'Pass paths or git+ URLs of boilerplates or a file listing them with --from-file option.'
+        )
 
-        if not click.confirm(outputs.cli_msg('Proceed and overwrite current installation?')):
-            outputs.echo_info('Installation aborted with no changes.')
+    # Shared registry lock prevents "prept gc" from removing files from
+    # store before installations reference them.
+    with acquire_lock(installation.lock_registry(shared=True), 'Waiting for another Prept process to finish...'):
+        if len(sources) > 1:
+            _install_many(sources, jobs=jobs, yes=yes, all_or_nothing=all_or_nothing)
             return
 
-        overwrite = True
+        boilerplate = BOILERPLATE_INSTALLABLE.convert(sources[0], None, ctx)
+        try:
+            _install(boilerplate, yes)
+        finally:
+            if boilerplate._from_git:
+                _cleanup_git_clone(boilerplate)
+
+
+def _read_sources_file(path: pathlib.Path) -> list[str]:
+    sources: list[str] = []
+    with open(path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+
+            if not line.startswith('git+') and not os.path.isabs(line):
+                line = os.path.join(path.parent, line)
+
+            sources.append(line)
+
+    return sources
+
+
+def _describe_error(exc: BaseException) -> str:
+    if not isinstance(exc, click.ClickException):
+        return f'{type(exc).__name__}: {exc}'
+
+    # Wrapped errors include a traceback after the message, the last
+    # line of which describes the error.
+    lines = [line.strip() for line in exc.message.splitlines() if line.strip()]
+    if not lines:
+        return type(exc).__name__
+
+    return lines[0] if len(lines) == 1 else f'{lines[0]} {lines[-1]}'
+
+
+def _resolve_source(source: str) -> BoilerplateInfo:
+    with outputs.silenced():
+        return BOILERPLATE_INSTALLABLE.convert(source, None, None)
+
+
+def _install_many(sources: list[str], *, jobs: int, yes: bool, all_or_nothing: bool) -> None:
+    total = len(sources)
+    failed: list[str] = []
+    resolved: list[tuple[int, BoilerplateInfo]] = []
+    installed: list[tuple[int, BoilerplateInfo]] = []
+    records: list[_InstallRecord] = []
+    unchanged = 0
+
+    outputs.echo_info(f'Installing {total} boilerplates with up to {jobs} concurrent workers')
+    outputs.echo()
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=jobs) as executor:
+        sources_futures = {executor.submit(_resolve_source, source): (i, source) for i, source in enumerate(sources)}
+        for future in concurrent.futures.as_completed(sources_futures):
+            i, source = sources_futures[future]
+            try:
+                resolved.append((i, future.result()))
+            except Exception as e:
+                failed.append(source)
+                outputs.echo_error(f'Failed to load {source}: {_describe_error(e)}')
+
+        try:
+            if failed and all_or_nothing:
+                resolved_count = len(resolved)
+                raise PreptCLIError(
+                    f'{len(failed)} of {total} boilerplates could not be loaded.',
+                    f'No boilerplates were installed ({resolved_count} loaded successfully).'
+                )
+
+            # Versions of the same boilerplate are installed one at a time
+            # as each installation holds the lock on boilerplate. Current
+            # versions are switched once all installations are complete.
+            def worker(bp: BoilerplateInfo) -> _InstallRecord | None:
+                with outputs.silenced():
+                    return _install(bp, yes, interactive=False, keep_previous=all_or_nothing, switch_current=False)
+
+            futures = {executor.submit(worker, bp): (i, bp) for i, bp in resolved}
+            for done, future in enumerate(concurrent.futures.as_completed(futures), start=len(failed) + 1):
+                i, bp = futures[future]
+                version = bp.version or '\b'
+                label = f'{bp.name} {version}'
+
+                try:
+                    record = future.result()
+                except Exception as e:
+                    failed.append(label)
+                    outputs.echo_error(f'[{done}/{total}] Failed to install {label}: {_describe_error(e)}')
+                    continue
+
+                installed.append((i, bp))
+                if record is None:
+                    unchanged += 1
+                    outputs.echo_info(f'[{done}/{total}] {label} is up to date')
+                else:
+                    records.append(record)
+                    outputs.echo_success(f'[{done}/{total}] Installed {label}')
+        finally:
+            with outputs.silenced():
+                for _, bp in resolved:
+                    if bp._from_git:
+                        try:
+                            _cleanup_git_clone(bp)
+                        except PreptCLIError:
+                            pass
+
+    outputs.echo()
+
+    if failed and all_or_nothing:
+        with StatusUpdate(
+            message=outputs.cli_msg(f'Rolling back {len(records)} completed installations'),
+            error_message='Installations could not be rolled back due to following error:',
+        ):
+            # Reverse order restores the current version pointers of
+            # boilerplates installed more than once.
+            for record in reversed(records):
+                with installation.lock_installation(record.boilerplate.name):
+                    _rollback(record)
+                    installation.refresh_index()
+
+        raise PreptCLIError(
+            f'{len(failed)} of {total} boilerplates could not be installed.',
+            'All installations were rolled back and no changes were made.'
+        )
+
+    # Installations finish in arbitrary order so current versions are
+    # switched here, in order of arguments, for the version given last to
+    # become current as it would when installed one after another.
+    current: dict[str, tuple[str, str]] = {}
+    for _, bp in sorted(installed, key=lambda entry: entry[0]):
+        current[bp.name.lower()] = (bp.name, installation.get_version_key(bp.version))
+
+    for name, version in current.values():
+        with installation.lock_installation(name):
+            installation.set_current_version(name, version)
+            installation.refresh_index()
+
+    for record in records:
+        _discard_backup(record)
+
+    outputs.echo_info(f'Installed: {len(records)}, Up to date: {unchanged}, Failed: {len(failed)}')
+
+    if failed:
+        raise PreptCLIError(f'{len(failed)} of {total} boilerplates could not be installed: {", ".join(failed)}')
+
+    outputs.echo_success(f'Successfully installed {total} boilerplates globally.')
+
+
+def _remove_path(path: pathlib.Path) -> None:
+    if path.is_dir():
+        if sys.version_info >= (3, 12):
+            shutil.rmtree(path, onexc=_handle_rm_read_only)
+        else:
+            # onerror is deprecated in favour of onexc since Python 3.12.
+            shutil.rmtree(path, onerror=lambda func, path, exc_info: _handle_rm_read_only(func, path, exc_info[1]))
+    elif path.exists():
+        os.remove(path)
+
 
-    target = utils.get_prept_dir('boilerplates', boilerplate.name.lower())
+def _rollback(record: _InstallRecord) -> None:
+    _remove_path(record.target)
+    if record.backup is not None:
+        assert record.previous_path is not None
+        os.replace(record.backup, record.previous_path)
+
+    installation.set_current_version(record.boilerplate.name, record.previous_current)
+
+    name = record.boilerplate.name
+    if not installation.get_installed_versions(name) and installation.get_legacy_installation(name) is None:
+        # Boilerplate was not installed before this installation.
+        _remove_path(installation.get_installation_dir(name))
+
+
+def _discard_backup(record: _InstallRecord) -> None:
+    if record.backup is not None:
+        _remove_path(record.backup)
+
+
+def _install(
+    boilerplate: BoilerplateInfo,
+    yes: bool,
+    *,
+    interactive: bool = True,
+    keep_previous: bool = False,
+    switch_current: bool = True,
+) -> _InstallRecord | None:
+    # If keep_previous is true, an overwritten installation is moved aside
+    # instead of being removed so that the installation can be rolled back.
+    # If switch_current is false, current version is left for the caller to set.
+    with acquire_lock(
+        installation.lock_installation(boilerplate.name),
+        f'Waiting for another operation on boilerplate {boilerplate.name!r} to finish...',
+    ):
+        record = _install_locked(boilerplate, yes, interactive=interactive, keep_previous=keep_previous, switch_current=switch_current)
+        installation.refresh_index()
+
+    return record
+
+
+def _install_locked(
+    boilerplate: BoilerplateInfo,
+    yes: bool,
+    *,
+    interactive: bool,
+    keep_previous: bool,
+    switch_current: bool,
+) -> _InstallRecord | None:
+    version = installation.get_version_key(boilerplate.version)
+
+    if installation.get_legacy_installation(boilerplate.name) is not None:
+        with StatusUpdate(
+            message=outputs.cli_msg('Migrating existing installation to versioned installations layout'),
+            error_message='Existing installation could not be migrated due to following error:',
+        ):
+            installation.migrate_legacy_installation(boilerplate.name)
+
+    installed = installation.get_installed_versions(boilerplate.name)
+    current = installation.get_current_version(boilerplate.name)
+    overwrite = version in installed
+
+    if overwrite and boilerplate._git_origin is not None:
+        previous = InstallationManifest.load(installed[version])
+        origin = boilerplate._git_origin
+
+        if previous is not None and previous.origin is not None and (previous.origin.get('url'), previous.origin.get('commit')) == (origin['url'], origin['commit']):
+            outputs.echo_info(f'Version {version} of boilerplate {boilerplate.name!r} is already installed from commit {origin["commit"]}.')
+            if previous.origin.get('ref') != origin['ref']:
+                # Same commit installed through a different ref, only the
+                # ref tracked by prept update changes.
+                previous.origin = origin
+                previous.save(installed[version])
+
+            if switch_current and current != version:
+                installation.set_current_version(boilerplate.name, version)
+                outputs.echo_info(f'Switched current version to {version}')
+
+            outputs.echo_success('Boilerplate is up to date, no changes were made.')
+            return None
+
+    if overwrite and not yes and not interactive:
+        raise PreptCLIError(
+            f'Version {version} of boilerplate {boilerplate.name!r} is already installed.',
+            'Pass --yes option to overwrite installed versions.'
+        )
+
+    if overwrite:
+        outputs.echo_warning(f'Version {version} of boilerplate {boilerplate.name!r} is already installed.')
+
+        if not yes and not click.confirm(outputs.cli_msg('Proceed and overwrite this version?')):
+            outputs.echo_info('Installation aborted with no changes.')
+            return None
+    elif installed:
+        outputs.echo_info(f'Installed Versions: {", ".join(sorted(installed))} (current: {current or "N/A"})')
+
+    archive = not isinstance(boilerplate.source, DirectorySource)
+    suffix = get_archive_suffix(boilerplate.path) if archive else None
+    target = installation.get_installation_target(boilerplate, suffix)
+    staging = installation.get_staging_path(target)
+    previous_path = installed.get(version)
+    backup = None
 
     # \b in messages below prevents double spacing if version is not present
     if overwrite:
@@ -85,35 +422,89 @@ def install(ctx: click.Context, boilerplate: BoilerplateInfo):
         outputs.echo_info(f'Installing {boilerplate.name} {boilerplate.version or '\b'} globally...')
 
     outputs.echo_info(f'From boilerplate at \'{boilerplate.path.absolute()}\' to \'{target.absolute()}\'')
-    outputs.echo_info(f'Copying files to installation root at \'{target}\'')
-    click.echo()
 
-    for file in boilerplate._get_installation_files():
-        bp_file = boilerplate.path / file
-        target_dir = target / os.path.dirname(file)
+    # Installation is staged and moved in place once complete so a failed
+    # installation leaves the previous installation intact.
+    try:
+        if archive:
+            with StatusUpdate(
+                message=outputs.cli_msg(f'Copying archive to staging path \'{staging}\''),
+                error_message=f'Copying of {boilerplate.path} failed with following error:',
+            ):
+                os.makedirs(staging.parent, exist_ok=True)
+                shutil.copy(boilerplate.path, staging)
+        else:
+            _install_files(boilerplate, staging)
+    except BaseException:
+        _remove_path(staging)
+        raise
 
-        with StatusUpdate(
-            message=outputs.cli_msg(f'├── Copying \'{boilerplate.path.name / file}\''),
-            error_message=f'Copying of {bp_file} failed with following error:',
-        ):
-            os.makedirs(target_dir, exist_ok=True)
-            shutil.copy(bp_file, target_dir)
+    outputs.echo()
+
+    with StatusUpdate(
+        message=outputs.cli_msg(f'Moving staged installation to \'{target}\''),
+        error_message='Staged installation could not be moved due to following error:',
+    ):
+        backup = installation.publish_staged(staging, target, previous_path)
+
+    if backup is not None and not keep_previous:
+        _remove_path(backup)
+        backup = None
+
+    # Other versions remain installed and current version is only switched
+    # after the new version is completely installed.
+    if switch_current:
+        with StatusUpdate(outputs.cli_msg(f'Switching current version to {version}')):
+            installation.set_current_version(boilerplate.name, version)
 
-    click.echo()
+    outputs.echo()
 
     # \b prevents double spacing if version is not present.
     outputs.echo_success(f'Successfully installed {boilerplate.name} {boilerplate.version or '\b'} boilerplate globally.')
     outputs.echo_info(f'Use \'prept new {boilerplate.name}\' to bootstrap a project from this boilerplate.')
 
-    if boilerplate._from_git:
-        outputs.echo_info('Cleaning up cloned git repository')
-        try:
-            shutil.rmtree(boilerplate.path.absolute(), onexc=_handle_rm_read_only)
-        except Exception as e:
-            raise outputs.wrap_exception(
-                e,
-                'The following error occured in clean up of git repository:',
-                f'Git repository cloned at {boilerplate.path.absolute()} could not be removed. However, boilerplate was installed successfully.'
-            ) from None
-        else:
-            outputs.echo_success('Successfully removed cloned git repository and installed boilerplate')
+    return _InstallRecord(boilerplate, target, current, previous_path, backup)
+
+
+def _cleanup_git_clone(boilerplate: BoilerplateInfo) -> None:
+    outputs.echo_info('Cleaning up cloned git repository')
+    try:
+        shutil.rmtree(boilerplate.path.absolute(), onexc=_handle_rm_read_only)
+    except Exception as e:
+        raise outputs.wrap_exception(
+            e,
+            'The following error occured in clean up of git repository:',
+            f'Git repository cloned at {boilerplate.path.absolute()} could not be removed.'
+        ) from None
+    else:
+        outputs.echo_success('Successfully removed cloned git repository')
+
+
+def _install_files(boilerplate: BoilerplateInfo, target: pathlib.Path) -> None:
+    store = BlobStore()
+    manifest = InstallationManifest(origin=boilerplate._git_origin)
+
+    outputs.echo_info(f'Linking files to staging path \'{target}\' from store at \'{store.directory}\'')
+    outputs.echo()
+
+    for file in boilerplate._get_installation_files():
+        bp_file = boilerplate.path / file
+
+        with StatusUpdate(
+            message=outputs.cli_msg(f'├── Installing \'{boilerplate.path.name / file}\''),
+            error_message=f'Installation of {bp_file} failed with following error:',
+        ):
+            blob = store.add(bp_file)
+            manifest.files[file.as_posix()] = blob
+            store.link(*blob, target / file)
+
+    manifest.save(target)
+    outputs.echo()
+
+    try:
+        with StatusUpdate(outputs.cli_msg('Precompiling boilerplate templates')):
+            CompiledBoilerplate.compile(BoilerplateInfo.from_path(target)).save()
+    except PreptCLIError:
+        # Precompilation is only an optimization, generation falls back to
+        # processing the boilerplate directly if artifacts are not present.
+        outputs.echo_warning('Boilerplate could not be precompiled, it will be processed at generation time.')
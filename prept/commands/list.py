@@ -2,11 +2,10 @@
 
 from __future__ import annotations
 
-from prept import utils
+from prept import utils, installation
 from prept.cli import outputs
 from prept.boilerplate import BoilerplateInfo
 
-import os
 import click
 
 __all__ = (
@@ -17,24 +16,35 @@ __all__ = (
 @click.pass_context
 def list_bps(ctx: click.Context):
     """Show the list of installed boilerplates."""
-    bps_dir = utils.get_prept_dir('boilerplates')
     total = 0
     listed = 0
+    seen: set[str] = set()
 
     click.echo('Listing installed boilerplates...\n')
 
-    for bp in os.listdir(bps_dir):
-        if not (bps_dir / bp / 'preptconfig.json').exists():
-            continue
-
-        total += 1
-        try:
-            bp = BoilerplateInfo.from_installation(bp)
-        except Exception:
-            continue
-        else:
-            click.echo(f'- {bp.name} {bp.version or ""}')
-            listed += 1
+    for root in utils.get_prept_path():
+        shared = root != utils.get_prept_dir()
+
+        for name in installation.get_installed_names(root):
+            if name.lower() in seen:
+                # Shadowed by installation in a directory that takes precedence
+                continue
+
+            seen.add(name.lower())
+            total += 1
+            try:
+                bp = BoilerplateInfo.from_installation(name)
+            except Exception:
+                continue
+            else:
+                bp.source.close()
+                details = f' (shared: {root})' if shared else ''
+                others = sorted(set(installation.get_installed_versions(bp.name, root)) - {installation.get_version_key(bp.version)})
+                if others:
+                    details += f' (also installed: {", ".join(others)})'
+
+                click.echo(f'- {bp.name} {bp.version or ""}{details}')
+                listed += 1
 
     if total == 0:
         outputs.echo_info('No boilerplates are installed.')
@@ -3,30 +3,51 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Callable, cast
 from prept.cli import outputs
 from prept.cli.status import StatusUpdate
 from prept.cli.params import BOILERPLATE
+from prept.errors import PreptCLIError
+from prept.dependencies import DependencyIndex
+from prept.compiler import CompiledBoilerplate
+from prept.conditions import PathSelector
+from prept.cache import RenderCache, DEFAULT_RENDER_CACHE_SIZE
+from prept.providers import STREAMING_THRESHOLD, TemplateProviderIndex
+from prept.sinks import OutputSink, StagedFilesystemSink, TarSink, ZipSink
+from prept.formatters import FormattingSink
+from prept.store import _hash_file
+from concurrent.futures import ThreadPoolExecutor
 
 import click
-import shutil
+import collections
+import hashlib
+import json
 import os
 import pathlib
+import shutil
 
 if TYPE_CHECKING:
+    from typing import BinaryIO, Iterator, TextIO
     from prept.boilerplate import BoilerplateInfo
+    from prept.context import GenerationContext
+    from prept.engine import GenerationEngine, _Transform
+    from prept.providers import TemplateProvider
+    from prept.variables import FanoutFile
     from types import TracebackType
 
 __all__ = (
     'new',
 )
 
+_JOURNAL_NAME = '.prept-journal'
+
 
 class _OutputDirectory:
-    def __init__(self, bp: BoilerplateInfo, output: pathlib.Path | None) -> None:
+    def __init__(self, bp: BoilerplateInfo, output: pathlib.Path | None, resumable: bool = False) -> None:
         self._bp = bp
-        self._owned = False
+        self._resumable = resumable
         self.output = output
+        self.sink: OutputSink | None = None
 
     def __enter__(self) -> _OutputDirectory:
         outputs.echo_info(f'Generating project from boilerplate: {self._bp.name}')
@@ -42,34 +63,390 @@ class _OutputDirectory:
             if not click.confirm(outputs.cli_msg('Do you wish to overwrite existing directory content?')):
                 self.output = None
                 outputs.echo_info('Exited without making any changes.')
+                return self
         else:
-            outputs.echo_info(f'No existing directory found. Creating project directory at \'{out_abs}\'')
-            self._owned = True
-            try:
-                self.output.mkdir()
-            except Exception as e:
-                # Directory not created, we will not try to delete in __exit__
-                self.output = None
-                raise outputs.wrap_exception(
-                    e,
-                    'Project directory creation failed with following error:',
-                    'Ensure proper permissions are granted to create directory at given path',
-                ) from None
-            else:
-                outputs.echo_info(f'Successfully created project directory at {out_abs}')
+            outputs.echo_info(f'No existing directory found. Project directory will be created at \'{out_abs}\'')
+
+        if not self._resumable and StagedFilesystemSink._get_resumable_directory(self.output).is_dir():
+            outputs.echo_info('Files of an incomplete previous generation were found, use --resume to continue it.')
+
+        # Files are generated in a staging directory next to output directory
+        # and only published once generation succeeds. On failure, the staging
+        # directory is discarded leaving the output directory untouched unless
+        # generation is resumable.
+        try:
+            self.sink = StagedFilesystemSink(self.output, resumable=self._resumable)
+        except Exception as e:
+            self.output = None
+            raise outputs.wrap_exception(
+                e,
+                'Project directory creation failed with following error:',
+                'Ensure proper permissions are granted to create directory at given path',
+            ) from None
 
         return self
 
     def __exit__(self, exc_type: type[Exception] | None, exc: Exception | None, tb: TracebackType | None) -> None:
-        if not exc:
+        if self.sink is None:
+            return
+        if exc:
+            self.sink.discard()
+            if self._resumable:
+                outputs.echo_info(
+                    'Files generated so far have been kept, run the command again with --resume '
+                    'to continue the generation.'
+                )
             return
-        if self._owned and self.output:
+
+        assert self.output is not None
+        with StatusUpdate(
+            outputs.cli_msg(f'Publishing generated files to \'{self.output.absolute()}\''),
+            error_message='Generated files could not be published due to following error:',
+        ):
+            self.sink.close()
+
+
+class _ArchiveOutput:
+    def __init__(self, bp: BoilerplateInfo, output: pathlib.Path | None, archive: pathlib.Path) -> None:
+        self._bp = bp
+        self._archive = archive
+        self._file: BinaryIO | None = None
+        self.output = output
+        self.sink: OutputSink | None = None
+
+    def __enter__(self) -> _ArchiveOutput:
+        outputs.echo_info(f'Generating project from boilerplate: {self._bp.name}')
+
+        if self.output is None:
+            self.output = pathlib.Path(self._bp.default_generate_directory)
+
+        name = self._archive.name.lower()
+        try:
+            self._file = open(self._archive, 'wb')
+            if name.endswith('.zip'):
+                self.sink = ZipSink(self._file)
+            elif name.endswith('.tar'):
+                self.sink = TarSink(self._file, compression='')
+            else:
+                self.sink = TarSink(self._file)
+        except Exception as e:
+            if self._file is not None:
+                self._file.close()
+            raise outputs.wrap_exception(
+                e,
+                'Archive creation failed with following error:',
+                'Ensure proper permissions are granted to create file at given path',
+            ) from None
+
+        outputs.echo_info(f'Writing project to archive at \'{self._archive.absolute()}\'')
+        return self
+
+    def __exit__(self, exc_type: type[Exception] | None, exc: Exception | None, tb: TracebackType | None) -> None:
+        assert self.sink is not None and self._file is not None
+
+        try:
+            self.sink.__exit__(exc_type, exc, tb)
+        finally:
+            self._file.close()
+
+        if exc:
             try:
-                shutil.rmtree(self.output)
-            except Exception:
-                # XXX: raise exception here?
+                os.remove(self._archive)
+            except OSError:
                 return
 
+
+class _TransformedWriter:
+    # Writes generated content to sink after applying post-rendering transforms.
+    # Content whose transforms are all pure is transformed in a thread pool while
+    # other files are generated. Results are written to sink, which is not
+    # thread-safe, from the main thread in the order they were submitted.
+
+    def __init__(self, engine: GenerationEngine | None, ctx: GenerationContext, sink: OutputSink) -> None:
+        self._engine = engine
+        self._ctx = ctx
+        self._sink = sink
+        self._pending: collections.deque[Callable[[], None]] = collections.deque()
+        self._executor = None
+        self._max_pending = 0
+
+        if engine is not None and engine._has_pure_transforms():
+            # Same as the default of ThreadPoolExecutor, transforms are often
+            # I/O bound (e.g. calling external tools) and release the GIL.
+            workers = min(32, (os.cpu_count() or 1) + 4)
+            self._executor = ThreadPoolExecutor(max_workers=workers)
+            self._max_pending = workers * 4
+
+    def __enter__(self) -> _TransformedWriter:
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+
+    def _write(self, output_file: pathlib.Path, output_path: str, content: Callable[[], str | bytes], source: pathlib.Path | None) -> None:
+        with StatusUpdate(
+            outputs.cli_msg(f'├── Creating {output_file}'),
+            error_message=f'Writing of {output_file} failed with following error:',
+        ):
+            self._sink.write(output_path, content(), source=source)
+
+    def write(
+        self,
+        output_file: pathlib.Path,
+        output_path: str,
+        path: str,
+        content: str | bytes,
+        transforms: list[_Transform],
+        *,
+        source: pathlib.Path | None = None,
+    ) -> None:
+        if not transforms:
+            self._write(output_file, output_path, lambda: content, source)
+            return
+
+        engine = self._engine
+        assert engine is not None
+
+        if self._executor is None or not all(transform.pure for transform in transforms):
+            self._write(output_file, output_path, lambda: engine._apply_transforms(transforms, path, content, self._ctx), source)
+            return
+
+        future = self._executor.submit(engine._apply_transforms, transforms, path, content, self._ctx)
+        self._pending.append(lambda: self._write(output_file, output_path, future.result, source))
+        self.flush(self._max_pending)
+
+    def defer(self, callback: Callable[[], None]) -> None:
+        # Calls the callback once all content submitted so far is written.
+        if self._pending:
+            self._pending.append(callback)
+        else:
+            callback()
+
+    def flush(self, limit: int = 0) -> None:
+        while len(self._pending) > limit:
+            self._pending.popleft()()
+
+
+class _GenerationJournal:
+    # Journal of files completed by a resumable generation kept in the staging
+    # directory. Each completed boilerplate file is appended as a line holding
+    # digest of its source and digests of the files generated from it so that
+    # a resumed generation can skip the files that are unchanged.
+    #
+    # The first line holds a key derived from boilerplate and the generation
+    # options. If the key does not match, the staged files are of a different
+    # generation and are removed.
+
+    def __init__(self, directory: pathlib.Path, key: str) -> None:
+        self.directory = directory
+        self.path = directory / _JOURNAL_NAME
+        self.entries: dict[str, tuple[str, dict[str, str]]] = {}
+
+        if not self._load(key):
+            self.entries.clear()
+            for child in directory.iterdir():
+                if child.is_dir() and not child.is_symlink():
+                    shutil.rmtree(child)
+                else:
+                    child.unlink()
+
+        # The journal is rewritten so that a line left incomplete by an
+        # interrupted generation is not followed by new entries.
+        self._file: TextIO = open(self.path, 'w', encoding='utf-8')
+        self._append({'key': key})
+        for file, (digest, outputs) in self.entries.items():
+            self._append({'file': file, 'digest': digest, 'outputs': outputs})
+
+    def __enter__(self) -> _GenerationJournal:
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self._file.close()
+
+    def _load(self, key: str) -> bool:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                header = json.loads(f.readline() or 'null')
+                if not isinstance(header, dict) or cast('dict[str, Any]', header).get('key') != key:
+                    return False
+
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        self.entries[entry['file']] = (entry['digest'], entry['outputs'])
+                    except (ValueError, KeyError, TypeError):
+                        break
+        except (OSError, ValueError):
+            return False
+
+        return True
+
+    def _append(self, entry: dict[str, Any]) -> None:
+        self._file.write(json.dumps(entry) + '\n')
+        self._file.flush()
+
+    def get_outputs(self, file: str, digest: str) -> list[str] | None:
+        # Returns the outputs of file if it was completed from the same source
+        # and none of its staged outputs have been changed since.
+        entry = self.entries.get(file)
+        if entry is None or entry[0] != digest:
+            return None
+
+        for path, expected in entry[1].items():
+            try:
+                if _hash_file(self.directory / path) != expected:
+                    return None
+            except OSError:
+                return None
+
+        return list(entry[1])
+
+    def complete(self, file: str, digest: str, outputs: dict[str, str]) -> None:
+        self.entries[file] = (digest, outputs)
+        self._append({'file': file, 'digest': digest, 'outputs': outputs})
+
+    def remove(self) -> None:
+        self._file.close()
+        self.path.unlink()
+
+
+class _JournalSink(OutputSink):
+    # Wraps the sink writing to staging directory and records the digests
+    # of written files for the journal.
+
+    def __init__(self, sink: OutputSink, directory: pathlib.Path) -> None:
+        self._sink = sink
+        self._directory = directory
+        self._written: dict[str, str] = {}
+
+    def _record(self, path: str) -> None:
+        self._written[path] = _hash_file(self._directory / path)
+
+    def copy(self, path: str, source: pathlib.Path) -> None:
+        self._sink.copy(path, source)
+        self._record(path)
+
+    def write(self, path: str, content: str | bytes, *, source: pathlib.Path | None = None) -> None:
+        self._sink.write(path, content, source=source)
+        self._record(path)
+
+    def write_stream(self, path: str, chunks: Iterator[str | bytes], *, source: pathlib.Path | None = None) -> None:
+        self._sink.write_stream(path, chunks, source=source)
+        self._record(path)
+
+    def take(self) -> dict[str, str]:
+        # Returns the files written since the last call.
+        written = self._written
+        self._written = {}
+        return written
+
+
+def _get_journal_key(
+    boilerplate: BoilerplateInfo,
+    variables: dict[str, Any],
+    only: tuple[str, ...] | None,
+    only_affected_by: tuple[str, ...] | None,
+) -> str:
+    data = {
+        'path': str(boilerplate.path.absolute()),
+        'config': boilerplate.dump(),
+        'variables': variables,
+        'only': sorted(only or ()),
+        'only_affected_by': sorted(only_affected_by or ()),
+    }
+    return hashlib.sha256(json.dumps(data, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _hash_source(boilerplate: BoilerplateInfo, path: str) -> str:
+    digest = hashlib.sha256()
+    with boilerplate.source.open(path) as f:
+        while chunk := f.read(1024 * 1024):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def _generate_fanout(
+    fanout: FanoutFile,
+    tp: TemplateProvider,
+    ctx: GenerationContext,
+    writer: _TransformedWriter,
+    output: pathlib.Path,
+    file: pathlib.Path,
+    artifact: bytes | None,
+    transforms: list[_Transform],
+    source: pathlib.Path | None,
+) -> None:
+    items = fanout.get_items(ctx.variables)
+    if not items:
+        click.echo(outputs.cli_msg(f'├── Skipping generation of {file} (no items in {fanout.variable})'))
+        return
+
+    with StatusUpdate(
+        outputs.cli_msg(f'├── Loading template {file} for {len(items)} items of {fanout.variable}'),
+        error_message=f'An error occured while loading template {file}:'
+    ):
+        render = tp.get_renderer(ctx.current_file, artifact)
+
+    generated: set[str] = set()
+    for item in items:
+        with fanout._bind(ctx, item):
+            with StatusUpdate(
+                outputs.cli_msg(f'├── Processing template {file} for {fanout.item}={item!r}'),
+                error_message=f'An error occured while processing template {file} for {fanout.item}={item!r}:'
+            ):
+                output_file = tp.process_path(output / file, ctx)
+                content = render(ctx)
+
+        output_path = output_file.relative_to(output).as_posix()
+        if output_path in generated:
+            raise PreptCLIError(
+                f'Fan-out of {file} generated {output_file} more than once',
+                hint=f'Ensure that the path of file references the {fanout.item!r} variable.',
+            )
+
+        generated.add(output_path)
+        writer.write(output_file, output_path, file.as_posix(), content, transforms, source=source)
+
+
+def _get_selected_variables(
+    boilerplate: BoilerplateInfo,
+    selector: PathSelector,
+    compiled: CompiledBoilerplate | None,
+    index: DependencyIndex,
+) -> frozenset[str] | None:
+    if compiled is None:
+        selected = list(boilerplate._get_generated_files(boilerplate._get_path_filter(None, selector)))
+    else:
+        selected = [entry.path for entry in compiled.files if selector.matches(entry.path.as_posix())]
+
+    if not selected:
+        raise PreptCLIError(
+            f'No files in boilerplate match the given paths: {", ".join(selector.patterns)}',
+            hint=f'Use "prept info {boilerplate.name}" to see the details of boilerplate.',
+        )
+
+    outputs.echo_info(f'Selected {len(selected)} files matching the given paths')
+
+    names = index.get_referenced_variables(selected)
+    engine = boilerplate.engine
+    if names is not None and engine is not None and not names.isdisjoint(engine._computed_variables):
+        # Computed variables may depend on any variable.
+        return None
+
+    return names
+
+
+def _echo_timings(ctx: GenerationContext) -> None:
+    outputs.echo_info('Time taken by processors and hooks:')
+
+    entries = sorted(ctx._timings.items(), key=lambda entry: entry[1][1], reverse=True)
+    for i, (name, (calls, total, longest)) in enumerate(entries):
+        branch = '└──' if i == len(entries) - 1 else '├──'
+        click.echo(outputs.cli_msg(f'{branch} {name}: {total:.3f}s total, {int(calls)} calls, {longest:.3f}s longest'))
+
+
 @click.command()
 @click.pass_context
 @click.argument(
@@ -89,6 +466,18 @@ class _OutputDirectory:
         'created by Prept.'
     )
 )
+@click.option(
+    '--archive', '-A',
+    required=False,
+    default=None,
+    type=click.Path(file_okay=True, dir_okay=False, writable=True, path_type=pathlib.Path),
+    help=(
+        'Write the generated project to an archive file instead of a directory.\n\n'
+        'The archive format is determined by file extension. Files ending with .zip are written as zip '
+        'archives, .tar as uncompressed tar archives and everything else as gzip compressed tar archives. '
+        'Boilerplates with post-generation hooks or tasks cannot be generated into archives.'
+    )
+)
 @click.option(
     '--var', '-V',
     nargs=2,
@@ -104,41 +493,216 @@ class _OutputDirectory:
         'to be thrown.'
     )
 )
+@click.option(
+    '--only-affected-by',
+    multiple=True,
+    required=False,
+    default=None,
+    metavar='VAR',
+    help=(
+        'Only regenerate the files whose content or path references the given template variable.\n\n'
+        'This option can be passed multiple times. Files whose referenced variables cannot be determined '
+        'by the template provider and files that reference computed variables are always regenerated.'
+    )
+)
+@click.option(
+    '--render-cache/--no-render-cache',
+    default=False,
+    envvar='PREPT_RENDER_CACHE',
+    help=(
+        'Whether to use the on-disk render cache.\n\n'
+        'When enabled, rendered template content is cached based on template content and values of '
+        'the variables it references and reused in later generations. This can also be enabled by '
+        'setting the PREPT_RENDER_CACHE environment variable.'
+    )
+)
+@click.option(
+    '--render-cache-size',
+    default=DEFAULT_RENDER_CACHE_SIZE // (1024 * 1024),
+    envvar='PREPT_RENDER_CACHE_SIZE',
+    type=click.IntRange(min=0),
+    show_default=True,
+    help='The maximum size of render cache in MiB. Least recently used entries are evicted beyond this size.'
+)
+@click.option(
+    '--only',
+    multiple=True,
+    required=False,
+    default=None,
+    metavar='PATTERN',
+    help=(
+        'Only generate the boilerplate files matching the given gitignore-like pattern.\n\n'
+        'This option can be passed multiple times and is useful for adding a part of boilerplate '
+        'to an existing project. Only the template variables referenced by matching files are '
+        'prompted and other files in output directory are left untouched.'
+    )
+)
+@click.option(
+    '--resume',
+    is_flag=True,
+    default=False,
+    help=(
+        'Keep the generated files if generation fails and continue from where a previous generation stopped.\n\n'
+        'Files are generated in a staging directory next to output directory along with a journal of '
+        'completed files. When resuming with the same boilerplate and variables, files whose source and '
+        'generated content are unchanged since the previous generation are skipped.'
+    )
+)
+@click.option(
+    '--timings',
+    is_flag=True,
+    default=False,
+    help='Show the time taken by processors and hooks of generation engine once generation completes.'
+)
 def new(
     ctx: click.Context,
     boilerplate: BoilerplateInfo,
     output: pathlib.Path | None = None,
+    archive: pathlib.Path | None = None,
     var: list[tuple[str, str]] | None = None,
+    only_affected_by: tuple[str, ...] | None = None,
+    render_cache: bool = False,
+    render_cache_size: int = DEFAULT_RENDER_CACHE_SIZE // (1024 * 1024),
+    timings: bool = False,
+    only: tuple[str, ...] | None = None,
+    resume: bool = False,
 ):
     """Bootstrap project from a boilerplate.
 
     BOILERPLATE is the name or path of boilerplate (containing preptconfig.json) to
     generate the project from.
     """
-    with _OutputDirectory(boilerplate, output) as output_mgr:
+    if only_affected_by and not boilerplate.allow_extra_variables:
+        invalid = set(only_affected_by).difference(boilerplate.template_variables)
+        if invalid:
+            raise PreptCLIError(f'Invalid template variables provided to --only-affected-by: {", ".join(invalid)}')
+
+    if resume and archive is not None:
+        raise PreptCLIError('--resume cannot be used with --archive')
+
+    engine = boilerplate.engine
+    if archive is not None and engine and (engine._post_generation_hooks or engine._post_generation_tasks):
+        # Post-generation hooks and tasks operate on output directory which
+        # is not created when generating into an archive.
+        raise PreptCLIError(
+            f'Boilerplate {boilerplate.name!r} cannot be generated into an archive',
+            hint='Post-generation hooks and tasks of this boilerplate require an output directory. Use --output instead.',
+        )
+
+    selector = PathSelector(only) if only else None
+    output_ctx = _OutputDirectory(boilerplate, output, resume) if archive is None else _ArchiveOutput(boilerplate, output, archive)
+
+    with output_ctx as output_mgr:
         output = output_mgr.output
+        sink = output_mgr.sink
 
-        if output is None:
+        if output is None or sink is None:
             return
 
-        variables = boilerplate._resolve_variables(var or [])
+        providers = TemplateProviderIndex(boilerplate)
+        compiled = CompiledBoilerplate.load(boilerplate)
+        cacheable = any(provider.cacheable for provider in providers.providers)
+        cache = RenderCache(max_size=render_cache_size * 1024 * 1024) if render_cache and cacheable else None
+        unaffected = 0
+        resumed = 0
+
+        if compiled is None:
+            index = DependencyIndex(boilerplate, providers)
+        else:
+            outputs.echo_info('Using precompiled boilerplate artifacts')
+            index = compiled.get_dependency_index(providers)
+
+        names = None
+        if selector is not None:
+            names = _get_selected_variables(boilerplate, selector, compiled, index)
+
+        variables = boilerplate._resolve_variables(var or [], names)
         genctx = boilerplate._get_generation_context(
-            output=output,
+            output=sink.directory if isinstance(sink, StagedFilesystemSink) else output,
             variables=variables,
         )
-        tp = boilerplate.template_provider() if boilerplate.template_provider else None
-        engine = boilerplate.engine
 
-        if engine:
-            outputs.echo_info('Calling the pre-generation hook')
+        if engine and engine._pre_generation_hooks:
+            outputs.echo_info('Calling the pre-generation hooks')
             engine._call_hook(genctx, pre=True)
 
         outputs.echo_info(f'Creating project files at \'{output.absolute()}\'')
         click.echo()
 
-        for file in boilerplate._get_generated_files():
+        formatting = None
+        if engine and engine._formatters:
+            # Files to be formatted are collected and formatted at once after generation.
+            sink = formatting = ctx.with_resource(FormattingSink(sink, engine._formatters))
+
+        journal = journal_sink = None
+        if resume:
+            assert isinstance(output_mgr.sink, StagedFilesystemSink)
+            staging = output_mgr.sink.directory
+            with StatusUpdate(
+                outputs.cli_msg('├── Loading journal of previous generation'),
+                error_message='Journal of previous generation could not be loaded due to following error:',
+            ):
+                key = _get_journal_key(boilerplate, variables, only, only_affected_by)
+                journal = ctx.with_resource(_GenerationJournal(staging, key))
+
+            sink = journal_sink = _JournalSink(sink, staging)
+
+        writer = ctx.with_resource(_TransformedWriter(engine, genctx, sink))
+
+        # Conditions are evaluated after the pre-generation hook so that
+        # variables updated by the hook are taken into account.
+        path_filter = boilerplate._get_path_filter(genctx, selector)
+
+        affected_by = only_affected_by
+        if affected_by and engine and engine._computed_variables:
+            # Computed variables may depend on any variable so files that
+            # reference them are always regarded as affected.
+            affected_by = (*affected_by, *engine._computed_variables)
+
+        if compiled is None:
+            files = boilerplate._get_generated_files(path_filter)
+        elif path_filter.active:
+            files = (entry for entry in compiled.files if not path_filter.is_excluded(entry.path.as_posix()))
+        else:
+            files = iter(compiled.files)
+
+        for entry in files:
+            file = entry if isinstance(entry, pathlib.Path) else entry.path
+            tp = providers.get(file)
+
+            if isinstance(entry, pathlib.Path):
+                compiled_file = None
+                is_template = tp is not None and boilerplate._is_template(file)
+                is_template_path = tp is not None and boilerplate._is_template(file, path=True)
+            else:
+                compiled_file = entry
+                is_template = tp is not None and entry.template and not entry.copy_only
+                is_template_path = tp is not None and entry.template_path
+
             bp_file = boilerplate.path / file
             output_file = output / file
+            fanout = boilerplate._get_fanout(file)
+
+            if (
+                affected_by
+                and not (fanout is not None and fanout.variable in affected_by)
+                and not index.is_affected(file, affected_by)
+            ):
+                unaffected += 1
+                continue
+
+            digest = None
+            if journal is not None:
+                digest = _hash_source(boilerplate, file.as_posix())
+                completed = journal.get_outputs(file.as_posix(), digest)
+                if completed is not None:
+                    if formatting is not None:
+                        # Staged files are formatted once generation completes.
+                        for path in completed:
+                            formatting._add_existing(path)
+
+                    resumed += 1
+                    continue
 
             genctx._set_current_file(file.name, bp_file)
             assert genctx._current_file is not None
@@ -150,35 +714,147 @@ def new(
                     click.echo(outputs.cli_msg(f'├── Skipping generation of {file} (processor signal)'))
                     continue
 
-            if tp and boilerplate._is_template(file, path=True):
+            if tp and is_template_path and fanout is None:
                 with StatusUpdate(
                     outputs.cli_msg(f'├── Processing template path {output_file}'),
                     error_message=f'An error occured while processing template path {output_file}:'
                 ):
                     output_file = tp.process_path(pathlib.Path(output_file), genctx)
 
-            with StatusUpdate(
-                outputs.cli_msg(f'├── Creating {output_file}'),
-                error_message=f'Copying of {bp_file} to installation directory at {output_file} failed with following error:',
-            ):
-                os.makedirs(os.path.dirname(output_file), exist_ok=True)
-                shutil.copy2(bp_file, output_file)
+            output_path = output_file.relative_to(output).as_posix()
+            local_file = boilerplate.source.get_local_path(file.as_posix())
+
+            rel_path = file.as_posix()
+            pre_transforms = engine._get_transforms(rel_path, 'pre') if engine else []
+            post_transforms = engine._get_transforms(rel_path, 'post') if engine else []
+
+            if pre_transforms:
+                assert engine is not None
+                with StatusUpdate(
+                    outputs.cli_msg(f'├── Transforming source of {output_file}'),
+                    error_message=f'An error occured while transforming source of {output_file}:'
+                ):
+                    transformed = engine._apply_transforms(pre_transforms, rel_path, genctx.current_file.read(binary=True), genctx)
+                    genctx.current_file._set_content(transformed)
+
+                if compiled_file is not None:
+                    # Precompiled files are marked static based on their original source
+                    # which does not apply to source changed by transforms.
+                    is_template = tp is not None and boilerplate._is_template(file)
 
-            if boilerplate._is_template(file) and tp is not None:
+            if fanout is not None:
+                if tp is None:
+                    raise PreptCLIError(
+                        f'No template provider is set for fan-out file {file}',
+                        hint='Set template_provider or template_providers option in preptconfig.json',
+                    )
+
+                artifact = compiled.read_artifact(compiled_file) if compiled and compiled_file and not pre_transforms else None
+                _generate_fanout(fanout, tp, genctx, writer, output, file, artifact, post_transforms, local_file)
+
+            elif (
+                tp and is_template
+                and not pre_transforms and not post_transforms
+                and boilerplate.source.get_size(rel_path) >= STREAMING_THRESHOLD
+            ):
+                # Large template files are rendered in chunks that are written
+                # directly to output. These are not cached or precompiled. Files
+                # with transforms are always processed in memory.
                 with StatusUpdate(
-                    outputs.cli_msg(f'├── Processing template content {output_file}'),
+                    outputs.cli_msg(f'├── Streaming template content {output_file}'),
                     error_message=f'An error occured while processing template content of {output_file}:'
                 ):
-                    content = tp.process_content(genctx.current_file, genctx)
+                    sink.write_stream(output_path, tp.stream_content(genctx.current_file, genctx), source=local_file)
+
+            elif tp and is_template:
+                # Artifacts are compiled from the original source which does not
+                # apply to source changed by transforms.
+                artifact = compiled.read_artifact(compiled_file) if compiled and compiled_file and not pre_transforms else None
+
+                cache_key = None
+                content = None
+
+                # Variables referenced by file are determined from the original source
+                # and would not include the ones introduced by transforms.
+                if cache is not None and tp.cacheable and not pre_transforms:
+                    cache_key = cache.get_key(
+                        genctx.current_file.read_bytes_view(),
+                        tp,
+                        genctx.variables,
+                        index.get_content_variables(file),
+                    )
+                    if cache_key is not None:
+                        content = cache.get(cache_key)
 
-                mode = 'wb' if isinstance(content, bytes) else 'w'
+                if content is not None:
+                    click.echo(outputs.cli_msg(f'├── Using cached template content for {output_file}'))
+                else:
+                    with StatusUpdate(
+                        outputs.cli_msg(f'├── Processing template content {output_file}'),
+                        error_message=f'An error occured while processing template content of {output_file}:'
+                    ):
+                        if artifact is None:
+                            content = tp.process_content(genctx.current_file, genctx)
+                        else:
+                            content = tp.render_compiled(artifact, genctx)
 
-                with open(output_file, mode) as f:
-                    f.write(content)  # type: ignore
+                    if cache is not None and cache_key is not None:
+                        cache.put(cache_key, content)
+
+                writer.write(output_file, output_path, rel_path, content, post_transforms, source=local_file)
+
+            elif pre_transforms or post_transforms:
+                writer.write(output_file, output_path, rel_path, genctx.current_file.read(binary=True), post_transforms, source=local_file)
+
+            else:
+                with StatusUpdate(
+                    outputs.cli_msg(f'├── Creating {output_file}'),
+                    error_message=f'Copying of {bp_file} to installation directory at {output_file} failed with following error:',
+                ):
+                    if local_file is None:
+                        sink.write(output_path, genctx.current_file.read(binary=True))
+                    else:
+                        sink.copy(output_path, local_file)
 
-    if engine:
-        outputs.echo_info('Calling the post-generation hook')
+            if journal is not None and journal_sink is not None and digest is not None:
+                # Files are completed once their (possibly deferred) writes are done.
+                writer.defer(lambda file=file.as_posix(), digest=digest: journal.complete(file, digest, journal_sink.take()))
+
+        writer.flush()
+
+        if formatting is not None:
+            click.echo()
+            formatting.format()
+
+        if journal is not None:
+            journal.remove()
+
+        if genctx._current_file is not None:
+            genctx._current_file.close()
+
+        if resumed:
+            click.echo(outputs.cli_msg(f'├── Skipped {resumed} files completed by previous generation'))
+
+        if unaffected:
+            click.echo(outputs.cli_msg(f'├── Skipped {unaffected} files not affected by {", ".join(only_affected_by or ())}'))
+
+        if cache is not None:
+            cache.evict()
+
+    # Generated files are now published to the output directory.
+    genctx.output_dir = output
+
+    if engine and engine._post_generation_hooks:
+        outputs.echo_info('Calling the post-generation hooks')
         engine._call_hook(genctx, pre=False)
 
+    if engine and engine._post_generation_tasks:
+        outputs.echo_info(f'Running {len(engine._post_generation_tasks)} post-generation tasks')
+        engine._run_post_generation_tasks(genctx)
+
+    if timings and genctx._timings:
+        _echo_timings(genctx)
+
     click.echo()
-    outputs.echo_success(f'Successfully generated project from {boilerplate.name!r} boilerplate at \'{output.absolute()}\'')
+    location = output.absolute() if archive is None else archive.absolute()
+    outputs.echo_success(f'Successfully generated project from {boilerplate.name!r} boilerplate at \'{location}\'')
@@ -2,18 +2,35 @@
 
 from __future__ import annotations
 
+from prept import installation
 from prept.cli import outputs
 from prept.cli.params import BOILERPLATE_INSTALLED
+from prept.cli.status import acquire_lock
 from prept.errors import PreptCLIError
 from prept.boilerplate import BoilerplateInfo
 
+import os
+import uuid
 import shutil
+import pathlib
 import click
 
 __all__ = (
     'uninstall',
 )
 
+def _remove(path: pathlib.Path) -> None:
+    # Path is moved aside before removal so an interrupted removal does
+    # not leave a partially removed installation in place.
+    trash = path.with_name(f'.removing-{uuid.uuid4().hex}-{path.name}')
+    os.replace(path, trash)
+
+    if trash.is_dir():
+        shutil.rmtree(trash)
+    else:
+        os.remove(trash)
+
+
 @click.command()
 @click.pass_context
 @click.argument(
@@ -21,26 +38,81 @@ __all__ = (
     type=BOILERPLATE_INSTALLED,
     required=True,
 )
-def uninstall(ctx: click.Context, boilerplate: BoilerplateInfo):
+@click.option(
+    '--all-versions',
+    is_flag=True,
+    default=False,
+    help='Uninstall all installed versions of the boilerplate.',
+)
+def uninstall(ctx: click.Context, boilerplate: BoilerplateInfo, all_versions: bool = False):
     """Uninstalls a boilerplate.
 
-    ``BOILERPLATE`` is the name of a globally installed boilerplate.
+    ``BOILERPLATE`` is the name of a globally installed boilerplate. By default,
+    the current version is uninstalled. A specific version can be uninstalled
+    using ``name@version`` format.
+
+    If the current version is uninstalled, the highest remaining version
+    becomes the current version.
     """
     if not boilerplate.path.exists():
         raise PreptCLIError('This boilerplate is not installed.')
-    
-    outputs.echo_warning(f'Boilerplate {boilerplate.name} {boilerplate.version or '\b'} will be uninstalled.')
+
+    if installation.is_shared_installation(boilerplate.path):
+        raise PreptCLIError(f'Boilerplate {boilerplate.name!r} is installed in a shared Prept directory and cannot be uninstalled.')
+
+    if all_versions:
+        outputs.echo_warning(f'All versions of boilerplate {boilerplate.name} will be uninstalled.')
+    else:
+        outputs.echo_warning(f'Boilerplate {boilerplate.name} {boilerplate.version or '\b'} will be uninstalled.')
 
     if not click.confirm(outputs.cli_msg('Do you wish to proceed?')):
         outputs.echo_info('Aborted. No changes were made.')
         return
 
-    outputs.echo_info(f'Removing installation directory from {boilerplate.path.absolute()}')
+    boilerplate.source.close()
+    bp_dir = installation.get_installation_dir(boilerplate.name)
+    version = installation.get_version_key(boilerplate.version)
+
+    # Locks are acquired after confirmation so that other operations on
+    # the boilerplate are not blocked while waiting for input.
+    registry_lock = acquire_lock(installation.lock_registry(shared=True), 'Waiting for another Prept process to finish...')
+    lock = acquire_lock(
+        installation.lock_installation(boilerplate.name),
+        f'Waiting for another operation on boilerplate {boilerplate.name!r} to finish...',
+    )
+
+    outputs.echo_info(f'Removing installation from {boilerplate.path.absolute()}')
     try:
-        shutil.rmtree(boilerplate.path)
+        with registry_lock, lock:
+            if not boilerplate.path.exists():
+                raise PreptCLIError('This boilerplate is not installed.')
+
+            current = installation.get_current_version(boilerplate.name)
+
+            if all_versions or boilerplate.path == installation.get_legacy_installation(boilerplate.name):
+                _remove(boilerplate.path)
+                if bp_dir.exists():
+                    _remove(bp_dir)
+            else:
+                _remove(boilerplate.path)
+                remaining = list(installation.get_installed_versions(boilerplate.name))
+
+                if not remaining:
+                    _remove(bp_dir)
+                elif current == version:
+                    latest = installation.get_latest_version(remaining)
+                    installation.set_current_version(boilerplate.name, latest)
+                    outputs.echo_info(f'Switched current version to {latest}')
+
+            installation.refresh_index()
+    except PreptCLIError:
+        raise
     except Exception as e:
-        outputs.echo_error('Failed to uninstall the boilerplate. Installation directory could not be removed.')
+        outputs.echo_error('Failed to uninstall the boilerplate. Installation could not be removed.')
         click.echo(outputs.cli_msg('The following error occured:'))
         click.echo(outputs.cli_msg(str(e)))
     else:
-        outputs.echo_success(f'Successfully uninstalled {boilerplate.name} {boilerplate.version or '\b'} boilerplate.')
+        if all_versions:
+            outputs.echo_success(f'Successfully uninstalled all versions of {boilerplate.name} boilerplate.')
+        else:
+            outputs.echo_success(f'Successfully uninstalled {boilerplate.name} {boilerplate.version or '\b'} boilerplate.')
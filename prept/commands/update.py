@@ -0,0 +1,86 @@
+# Copyright (C) Izhar Ahmad 2025-2026
+
+from __future__ import annotations
+
+from prept import installation
+from prept.cli import outputs
+from prept.cli.status import StatusUpdate
+from prept.commands.install import install
+from prept.boilerplate import BoilerplateInfo
+from prept.errors import PreptCLIError
+from prept.git import GitMirror
+from prept.store import InstallationManifest
+
+import click
+
+__all__ = (
+    'update',
+)
+
+
+@click.command()
+@click.pass_context
+@click.argument(
+    'names',
+    nargs=-1,
+)
+def update(ctx: click.Context, names: tuple[str, ...]):
+    """Updates boilerplates installed from git repositories.
+
+    The cached mirror of each boilerplate's repository is fetched and the
+    installed ref (or the default branch if no ref was given at installation)
+    is resolved. Boilerplates are only reinstalled if the ref points to a
+    different commit than the installed one.
+
+    NAMES are the names of installed boilerplates to update. If not given,
+    all boilerplates installed from git repositories are updated.
+
+    Examples:
+
+    * prept update
+
+    * prept update basic fastapi-app
+    """
+    if not names:
+        names = tuple(sorted(installation.get_installed_names()))
+
+    updated = 0
+
+    for name in names:
+        path = installation.resolve_installation(name)
+        if path is None:
+            raise PreptCLIError(f'No boilerplate with name {name!r} is installed.')
+
+        if installation.is_shared_installation(path):
+            outputs.echo_info(f'Skipping {name} as it is installed in a shared Prept directory.')
+            continue
+
+        manifest = InstallationManifest.load(path) if path.is_dir() else None
+        if manifest is None or manifest.origin is None:
+            outputs.echo_info(f'Skipping {name} as it was not installed from a git repository.')
+            continue
+
+        url, ref = manifest.origin['url'], manifest.origin.get('ref')
+        mirror = GitMirror(url)
+
+        with StatusUpdate(
+            message=outputs.cli_msg(f'Fetching changes for {name} from {url}'),
+            error_message=f'Changes for {name} could not be fetched due to following error:',
+        ):
+            mirror.sync()
+
+        commit = mirror.resolve(ref)
+        if commit == manifest.origin.get('commit'):
+            outputs.echo_info(f'{name} is up to date at commit {commit}.')
+            continue
+
+        click.echo()
+        outputs.echo_info(f'Updating {name} from commit {manifest.origin.get("commit")} to {commit}')
+
+        # Mirror is already synced so it is not fetched again.
+        boilerplate = BoilerplateInfo._clone_from_git(f'{url}@{ref}' if ref else url, sync=False)
+        ctx.invoke(install, boilerplates=(boilerplate,), yes=True)
+        updated += 1
+        click.echo()
+
+    outputs.echo_success(f'Updated {updated} boilerplate(s).')
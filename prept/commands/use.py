@@ -0,0 +1,64 @@
+# Copyright (C) Izhar Ahmad 2025-2026
+
+from __future__ import annotations
+
+from prept import installation
+from prept.cli import outputs
+from prept.cli.params import BOILERPLATE_INSTALLED
+from prept.cli.status import StatusUpdate, acquire_lock
+from prept.boilerplate import BoilerplateInfo
+from prept.errors import PreptCLIError
+
+import click
+
+__all__ = (
+    'use',
+)
+
+
+@click.command()
+@click.pass_context
+@click.argument(
+    'boilerplate',
+    type=BOILERPLATE_INSTALLED,
+    required=True,
+)
+def use(ctx: click.Context, boilerplate: BoilerplateInfo):
+    """Switches the current version of an installed boilerplate.
+
+    The current version is used when boilerplate is referred to by its
+    name only. Switching versions does not modify any installed files so
+    it can also be used to roll back to a previously installed version.
+
+    BOILERPLATE is the name of installed boilerplate followed by @ and a
+    version or PEP 440 version specifier. If a specifier is given, the highest
+    installed version matching it is used.
+
+    Examples:
+
+    * prept use basic@1.4
+
+    * prept use "basic@>=1.2,<2"
+    """
+    version = installation.get_version_key(boilerplate.version)
+
+    if installation.is_shared_installation(boilerplate.path):
+        raise PreptCLIError(f'Boilerplate {boilerplate.name!r} is installed in a shared Prept directory and cannot be modified.')
+
+    with acquire_lock(
+        installation.lock_installation(boilerplate.name),
+        f'Waiting for another operation on boilerplate {boilerplate.name!r} to finish...',
+    ):
+        installed = installation.get_installed_versions(boilerplate.name)
+
+        if installed.get(version) != boilerplate.path:
+            raise PreptCLIError(
+                f'Boilerplate {boilerplate.name!r} is not installed in versioned installations layout.',
+                'Installing another version of this boilerplate migrates it to versioned installations layout',
+            )
+
+        with StatusUpdate(outputs.cli_msg(f'Switching current version of {boilerplate.name} to {version}')):
+            installation.set_current_version(boilerplate.name, version)
+            installation.refresh_index()
+
+    outputs.echo_success(f'{boilerplate.name} {version} is now the current version.')
@@ -0,0 +1,354 @@
+# Copyright (C) Izhar Ahmad 2025-2026
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Iterator, cast
+from typing_extensions import Self
+from prept import utils
+from prept.dependencies import DependencyIndex
+from prept.providers import STREAMING_THRESHOLD, TemplateProviderIndex
+from prept.sources import DirectorySource
+
+import os
+import json
+import hashlib
+import pathlib
+
+if TYPE_CHECKING:
+    from prept.boilerplate import BoilerplateInfo
+    from prept.providers import TemplateProvider
+
+__all__ = (
+    'CompiledFile',
+    'CompiledBoilerplate',
+)
+
+COMPILED_DIRECTORY = '.prept'
+COMPILED_MANIFEST = 'compiled.json'
+COMPILED_FORMAT = 1
+
+# Directories that are not considered when fingerprinting the boilerplate.
+FINGERPRINT_IGNORED_DIRS = {COMPILED_DIRECTORY, '.git', '__pycache__'}
+
+
+def _get_provider_identity(provider: type[TemplateProvider] | None) -> str | None:
+    if provider is None:
+        return None
+
+    return f'{provider.__module__}:{provider.__qualname__}:{getattr(provider, "artifact_version", None)}'
+
+
+class CompiledFile:
+    """Precompiled information about a single boilerplate file.
+
+    .. versionadded:: 0.2.0
+
+    Attributes
+    ~~~~~~~~~~
+    path: :class:`pathlib.Path`
+        The path of file, relative to boilerplate directory.
+    template: :class:`bool`
+        Whether the file is a template file.
+    template_path: :class:`bool`
+        Whether the file's path is a template path.
+    copy_only: :class:`bool`
+        Whether the file is a template that has no placeholders and can
+        be copied without processing through template provider.
+    content_variables: frozenset[:class:`str`] | None
+        The variables referenced by file content, see :meth:`DependencyIndex.get_content_variables`.
+    path_variables: frozenset[:class:`str`] | None
+        The variables referenced by file path, see :meth:`DependencyIndex.get_path_variables`.
+    artifact: :class:`str` | None
+        The name of precompiled template artifact, if any.
+    """
+
+    __slots__ = (
+        'path',
+        'template',
+        'template_path',
+        'copy_only',
+        'content_variables',
+        'path_variables',
+        'artifact',
+    )
+
+    def __init__(
+        self,
+        path: pathlib.Path,
+        template: bool = False,
+        template_path: bool = False,
+        copy_only: bool = False,
+        content_variables: frozenset[str] | None = frozenset(),
+        path_variables: frozenset[str] | None = frozenset(),
+        artifact: str | None = None,
+    ) -> None:
+        self.path = path
+        self.template = template
+        self.template_path = template_path
+        self.copy_only = copy_only
+        self.content_variables = content_variables
+        self.path_variables = path_variables
+        self.artifact = artifact
+
+    @classmethod
+    def _from_data(cls, data: dict[str, Any]) -> Self:
+        content_variables = data.get('content_variables', [])
+        path_variables = data.get('path_variables', [])
+
+        return cls(
+            path=pathlib.Path(data['path']),
+            template=data.get('template', False),
+            template_path=data.get('template_path', False),
+            copy_only=data.get('copy_only', False),
+            content_variables=None if content_variables is None else frozenset(content_variables),
+            path_variables=None if path_variables is None else frozenset(path_variables),
+            artifact=data.get('artifact'),
+        )
+
+    def _dump(self) -> dict[str, Any]:
+        return {
+            'path': self.path.as_posix(),
+            'template': self.template,
+            'template_path': self.template_path,
+            'copy_only': self.copy_only,
+            'content_variables': None if self.content_variables is None else sorted(self.content_variables),
+            'path_variables': None if self.path_variables is None else sorted(self.path_variables),
+            'artifact': self.artifact,
+        }
+
+
+class CompiledBoilerplate:
+    """Precompiled artifacts of a boilerplate.
+
+    Precompilation resolves the list of generated files, classifies them
+    as template files and paths, records the variables they reference and
+    precompiles template files through :meth:`TemplateProvider.compile_template`.
+
+    The artifacts are stored in the ``.prept`` directory inside the boilerplate
+    directory along with a fingerprint of boilerplate configuration and files.
+    At generation time, artifacts are only used if the fingerprint still matches.
+
+    Only boilerplates loaded from directories (see :class:`DirectorySource`)
+    can be precompiled.
+
+    .. versionadded:: 0.2.0
+
+    Attributes
+    ~~~~~~~~~~
+    boilerplate: :class:`BoilerplateInfo`
+        The compiled boilerplate.
+    files: list[:class:`CompiledFile`]
+        The generated files of boilerplate.
+    """
+    def __init__(
+        self,
+        boilerplate: BoilerplateInfo,
+        files: list[CompiledFile],
+        directories: list[str],
+        fingerprint: str,
+    ) -> None:
+        self.boilerplate = boilerplate
+        self.files = files
+        self._directories = directories
+        self._fingerprint = fingerprint
+        self._artifacts: dict[str, bytes] = {}
+
+    @staticmethod
+    def _get_directory(boilerplate: BoilerplateInfo) -> pathlib.Path:
+        return boilerplate.path / COMPILED_DIRECTORY
+
+    @staticmethod
+    def _walk_directories(boilerplate: BoilerplateInfo) -> Iterator[str]:
+        for root, dirs, _ in os.walk(boilerplate.path):
+            dirs[:] = [d for d in dirs if d not in FINGERPRINT_IGNORED_DIRS]
+            yield pathlib.Path(root).relative_to(boilerplate.path).as_posix()
+
+    @staticmethod
+    def _compute_fingerprint(
+        boilerplate: BoilerplateInfo,
+        files: Iterator[pathlib.Path] | list[pathlib.Path],
+        directories: list[str],
+    ) -> str | None:
+        # The fingerprint is computed from configuration content and stat
+        # information of files and directories. Adding or removing a file
+        # changes modification time of its parent directory so it is not
+        # necessary to walk the boilerplate again to check for new files.
+        digest = hashlib.sha256()
+        digest.update(str(COMPILED_FORMAT).encode())
+        digest.update(str(_get_provider_identity(boilerplate.template_provider)).encode())
+        for pattern, provider in boilerplate.template_providers.items():
+            digest.update(f'{pattern}:{_get_provider_identity(provider)}'.encode())
+
+        try:
+            digest.update((boilerplate.path / 'preptconfig.json').read_bytes())
+
+            for directory in directories:
+                st = os.stat(boilerplate.path / directory)
+                digest.update(f'd:{directory}:{st.st_mtime_ns}'.encode())
+
+            for file in files:
+                st = os.stat(boilerplate.path / file)
+                digest.update(f'f:{file.as_posix()}:{st.st_size}:{st.st_mtime_ns}'.encode())
+        except OSError:
+            return None
+
+        return digest.hexdigest()
+
+    @classmethod
+    def compile(cls, boilerplate: BoilerplateInfo) -> Self:
+        """Precompiles the given boilerplate.
+
+        Note that this does not store the artifacts, :meth:`.save` must
+        be called for that.
+
+        Raises :class:`ValueError` if the boilerplate is not loaded from
+        a directory.
+
+        Parameters
+        ~~~~~~~~~~
+        boilerplate: :class:`BoilerplateInfo`
+            The boilerplate to compile.
+
+        Returns
+        ~~~~~~~
+        :class:`CompiledBoilerplate`
+            The compiled boilerplate.
+        """
+        if not isinstance(boilerplate.source, DirectorySource):
+            raise ValueError('only boilerplates loaded from directories can be precompiled')
+
+        providers = TemplateProviderIndex(boilerplate)
+        index = DependencyIndex(boilerplate, providers)
+        directories = list(cls._walk_directories(boilerplate))
+        files: list[CompiledFile] = []
+        artifacts: dict[str, bytes] = {}
+
+        for path in boilerplate._get_generated_files():
+            file = CompiledFile(
+                path=path,
+                template=boilerplate._is_template(path),
+                template_path=boilerplate._is_template(path, path=True),
+                content_variables=index.get_content_variables(path),
+                path_variables=index.get_path_variables(path),
+            )
+
+            # Files large enough to be streamed at generation time are not
+            # precompiled as their artifacts would never be used.
+            provider = providers.get(path)
+            if provider is not None and file.template and os.path.getsize(boilerplate.path / path) < STREAMING_THRESHOLD:
+                try:
+                    source = (boilerplate.path / path).read_text()
+                except UnicodeDecodeError:
+                    source = None
+
+                if source is not None and provider.is_static(source):
+                    file.copy_only = True
+                elif source is not None:
+                    artifact = provider.compile_template(source)
+                    if artifact is not None:
+                        file.artifact = hashlib.sha256(path.as_posix().encode()).hexdigest()
+                        artifacts[file.artifact] = artifact
+
+            files.append(file)
+
+        fingerprint = cls._compute_fingerprint(boilerplate, [f.path for f in files], directories)
+        assert fingerprint is not None
+
+        compiled = cls(boilerplate, files, directories, fingerprint)
+        compiled._artifacts = artifacts
+        return compiled
+
+    @classmethod
+    def load(cls, boilerplate: BoilerplateInfo, *, verify: bool = True) -> Self | None:
+        """Loads the precompiled artifacts of given boilerplate.
+
+        ``None`` is returned if boilerplate is not compiled or the compiled
+        artifacts are outdated.
+
+        Parameters
+        ~~~~~~~~~~
+        boilerplate: :class:`BoilerplateInfo`
+            The boilerplate to load artifacts for.
+        verify: :class:`bool`
+            Whether to check that artifacts are up to date using the fingerprint.
+
+            This should only be disabled if boilerplate files are known to be
+            unchanged since compilation, such as when they are copied with their
+            content verified. Saving the loaded artifacts updates the fingerprint.
+        """
+        if not isinstance(boilerplate.source, DirectorySource):
+            return None
+
+        try:
+            with open(cls._get_directory(boilerplate) / COMPILED_MANIFEST, 'r') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+        if not isinstance(data, dict):
+            return None
+
+        manifest = cast('dict[str, Any]', data)
+        if manifest.get('format') != COMPILED_FORMAT:
+            return None
+
+        try:
+            files = [CompiledFile._from_data(entry) for entry in manifest['files']]
+            directories: list[str] = manifest['directories']
+            fingerprint: str = manifest['fingerprint']
+        except (KeyError, TypeError):
+            return None
+
+        if verify and cls._compute_fingerprint(boilerplate, [f.path for f in files], directories) != fingerprint:
+            return None
+
+        return cls(boilerplate, files, directories, fingerprint)
+
+    def save(self) -> None:
+        """Stores the compiled artifacts in boilerplate directory."""
+        directory = self._get_directory(self.boilerplate)
+        os.makedirs(directory / 'templates', exist_ok=True)
+
+        # Creating the artifacts directory changes modification time of
+        # boilerplate directory so fingerprint has to be computed again.
+        fingerprint = self._compute_fingerprint(self.boilerplate, [f.path for f in self.files], self._directories)
+        if fingerprint is not None:
+            self._fingerprint = fingerprint
+
+        # Files are replaced atomically as boilerplate may be in use by
+        # concurrent generations.
+        for name, artifact in self._artifacts.items():
+            utils.write_atomic(directory / 'templates' / name, artifact)
+
+        data = {
+            'format': COMPILED_FORMAT,
+            'fingerprint': self._fingerprint,
+            'directories': self._directories,
+            'files': [file._dump() for file in self.files],
+        }
+
+        utils.write_atomic(directory / COMPILED_MANIFEST, json.dumps(data))
+
+    def read_artifact(self, file: CompiledFile) -> bytes | None:
+        """Reads the precompiled template artifact for the given file.
+
+        Returns ``None`` if the file has no artifact.
+        """
+        if file.artifact is None:
+            return None
+        if file.artifact in self._artifacts:
+            return self._artifacts[file.artifact]
+
+        try:
+            return (self._get_directory(self.boilerplate) / 'templates' / file.artifact).read_bytes()
+        except OSError:
+            return None
+
+    def get_dependency_index(self, provider: TemplateProvider | TemplateProviderIndex | None) -> DependencyIndex:
+        """Returns a :class:`DependencyIndex` populated from the compiled data."""
+        index = DependencyIndex(self.boilerplate, provider)
+        for file in self.files:
+            index._content_variables[file.path] = file.content_variables
+            index._path_variables[file.path] = file.path_variables
+
+        return index
@@ -0,0 +1,308 @@
+# Copyright (C) Izhar Ahmad 2025-2026
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Callable, Mapping, Sequence, cast
+
+import ast
+import fnmatch
+import operator
+import pathspec
+
+if TYPE_CHECKING:
+    from prept.boilerplate import BoilerplateInfo
+    from prept.context import GenerationContext
+
+__all__ = (
+    'Condition',
+    'PathSelector',
+)
+
+# Values of variables input from command line are strings so these
+# strings are treated as false in boolean context.
+FALSE_STRINGS = {'', '0', 'false', 'no', 'off', 'n'}
+
+_LITERAL_NAMES = {'true': True, 'false': False, 'null': None}
+
+_COMPARISON_OPERATORS: dict[type[ast.cmpop], Callable[[Any, Any], Any]] = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.In: lambda left, right: left in right,
+    ast.NotIn: lambda left, right: left not in right,
+}
+
+
+def _is_true(value: Any) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() not in FALSE_STRINGS
+
+    return bool(value)
+
+
+def _coerce(left: Any, right: Any) -> tuple[Any, Any]:
+    # Compare string values of variables with numbers numerically.
+    if isinstance(left, str) and isinstance(right, (int, float)) and not isinstance(right, bool):
+        try:
+            return type(right)(left), right
+        except ValueError:
+            return left, right
+    if isinstance(right, str) and isinstance(left, (int, float)) and not isinstance(left, bool):
+        right, left = _coerce(right, left)
+
+    return left, right
+
+
+def _as_list(value: Any) -> list[Any] | None:
+    # Lists are only produced by list literals and list-valued variables.
+    return cast('list[Any]', value) if isinstance(value, list) else None
+
+
+class Condition:
+    """A condition over template variables.
+
+    Conditions are simple Python-like expressions. The following syntax
+    is supported:
+
+    - Names of template variables. Variables that are not provided evaluate to ``None``.
+    - String and number literals, ``true``, ``false`` and ``null`` (or their Python equivalents)
+      and lists of literals.
+    - Comparisons using ``==``, ``!=``, ``<``, ``<=``, ``>``, ``>=``, ``in`` and ``not in``.
+    - Boolean operators ``and``, ``or`` and ``not`` and parentheses.
+
+    As variables provided from command line are strings, the strings ``false``, ``no``,
+    ``n``, ``off``, ``0`` and empty string (case-insensitive) are false in boolean context.
+    Strings compared with numbers are converted to numbers.
+
+    For example, ``frontend and framework in ['react', 'vue']``.
+
+    .. versionadded:: 0.2.0
+
+    Parameters
+    ~~~~~~~~~~
+    expression: :class:`str`
+        The expression of condition.
+
+        :class:`ValueError` is raised if the expression is invalid or uses
+        unsupported syntax.
+    """
+    def __init__(self, expression: str) -> None:
+        try:
+            tree = ast.parse(expression.strip(), mode='eval')
+        except SyntaxError:
+            raise ValueError(f'invalid condition {expression!r}') from None
+
+        self.expression = expression
+        self._tree = tree.body
+        self._validate(self._tree)
+
+    def __repr__(self) -> str:
+        return f'Condition({self.expression!r})'
+
+    @property
+    def variables(self) -> frozenset[str]:
+        """The names of template variables referenced by the condition."""
+        return frozenset(
+            node.id for node in ast.walk(self._tree)
+            if isinstance(node, ast.Name) and node.id not in _LITERAL_NAMES
+        )
+
+    def _validate(self, node: ast.AST) -> None:
+        if isinstance(node, ast.BoolOp):
+            for value in node.values:
+                self._validate(value)
+        elif isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+            self._validate(node.operand)
+        elif isinstance(node, ast.Compare):
+            if not all(type(op) in _COMPARISON_OPERATORS for op in node.ops):
+                raise ValueError(f'unsupported operator in condition {self.expression!r}')
+            for value in (node.left, *node.comparators):
+                self._validate(value)
+        elif isinstance(node, (ast.List, ast.Tuple)):
+            for element in node.elts:
+                self._validate(element)
+        elif isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub) and isinstance(node.operand, ast.Constant):
+            return
+        elif not isinstance(node, (ast.Name, ast.Constant)):
+            raise ValueError(f'unsupported syntax {ast.unparse(node)!r} in condition {self.expression!r}')
+
+    def _evaluate(self, node: ast.AST, variables: Mapping[str, Any]) -> Any:
+        if isinstance(node, ast.Constant):
+            return node.value
+        if isinstance(node, ast.Name):
+            if node.id not in variables and node.id in _LITERAL_NAMES:
+                return _LITERAL_NAMES[node.id]
+            return variables.get(node.id)
+        if isinstance(node, (ast.List, ast.Tuple)):
+            return [self._evaluate(element, variables) for element in node.elts]
+        if isinstance(node, ast.BoolOp):
+            values = (_is_true(self._evaluate(value, variables)) for value in node.values)
+            return all(values) if isinstance(node.op, ast.And) else any(values)
+        if isinstance(node, ast.UnaryOp):
+            operand = self._evaluate(node.operand, variables)
+            return not _is_true(operand) if isinstance(node.op, ast.Not) else -operand
+
+        assert isinstance(node, ast.Compare)
+        left = self._evaluate(node.left, variables)
+        for op, comparator in zip(node.ops, node.comparators):
+            right = self._evaluate(comparator, variables)
+            elements = _as_list(right)
+            if isinstance(op, (ast.In, ast.NotIn)) and elements is not None:
+                found = any(operator.eq(*_coerce(left, element)) for element in elements)
+                result = found if isinstance(op, ast.In) else not found
+            else:
+                try:
+                    result = _COMPARISON_OPERATORS[type(op)](*_coerce(left, right))
+                except TypeError:
+                    # Comparisons between incompatible values (e.g. with None
+                    # for variables that are not provided) are false.
+                    result = False
+            if not result:
+                return False
+            left = right
+
+        return True
+
+    def evaluate(self, variables: Mapping[str, Any]) -> bool:
+        """Evaluates the condition with the given variables.
+
+        Parameters
+        ~~~~~~~~~~
+        variables: Mapping[:class:`str`, Any]
+            The values of template variables.
+        """
+        return _is_true(self._evaluate(self._tree, variables))
+
+
+class PathSelector:
+    """Selects a subset of boilerplate files using gitignore-like patterns.
+
+    This is used by :option:`prept new --only` option to only generate the
+    matching files of a boilerplate. Paths are relative to the boilerplate
+    directory and use forward slashes as separator.
+
+    .. versionadded:: 0.2.0
+
+    Parameters
+    ~~~~~~~~~~
+    patterns: Sequence[:class:`str`]
+        The patterns of files to select. A pattern matching a directory
+        selects all files inside it.
+    """
+    def __init__(self, patterns: Sequence[str]) -> None:
+        if isinstance(patterns, str):
+            patterns = [patterns]
+        if not patterns:
+            raise ValueError('at least one pattern must be given')
+
+        self.patterns = list(patterns)
+        self._spec = pathspec.PathSpec.from_lines('gitwildmatch', self.patterns)
+        self._segments: list[list[str] | None] = []
+
+        for pattern in self.patterns:
+            pattern = pattern.strip()
+            if not pattern or pattern.startswith(('#', '!')):
+                # Negated patterns only deselect files.
+                continue
+
+            pattern = pattern.rstrip('/')
+            if '/' not in pattern:
+                # Patterns without a slash match at any depth.
+                self._segments.append(None)
+            else:
+                self._segments.append(pattern.lstrip('/').split('/'))
+
+    def __repr__(self) -> str:
+        return f'PathSelector({self.patterns!r})'
+
+    def matches(self, path: str) -> bool:
+        """Checks whether the file with given path is selected.
+
+        Parameters
+        ~~~~~~~~~~
+        path: :class:`str`
+            The relative path of file.
+        """
+        return self._spec.match_file(path)
+
+    def may_contain(self, directory: str) -> bool:
+        """Checks whether the given directory may contain selected files.
+
+        This returns False only when no file inside the directory can be
+        selected which allows skipping the directory entirely.
+
+        Parameters
+        ~~~~~~~~~~
+        directory: :class:`str`
+            The relative path of directory.
+        """
+        parts = directory.split('/')
+        for segments in self._segments:
+            if segments is None:
+                return True
+
+            # The directory is either an ancestor of the paths matched by
+            # pattern or inside a directory matched by the pattern.
+            for part, segment in zip(parts, segments):
+                if segment == '**':
+                    return True
+                if not fnmatch.fnmatchcase(part, segment):
+                    break
+            else:
+                return True
+
+        return False
+
+
+class PathFilter:
+    # Filters the generated files based on conditional paths, directory
+    # processors and selected paths. Directories are evaluated once and
+    # results are cached so files in an excluded directory are skipped
+    # without being matched. Without a context, only selected paths are
+    # taken into account.
+
+    def __init__(self, boilerplate: BoilerplateInfo, ctx: GenerationContext | None, selector: PathSelector | None = None) -> None:
+        if ctx is None:
+            excluded: list[str] = []
+            engine = None
+        else:
+            excluded = [pattern for pattern, condition in boilerplate._conditions if not condition.evaluate(ctx.variables)]
+            engine = boilerplate.engine
+
+        self._spec = pathspec.PathSpec.from_lines('gitwildmatch', excluded) if excluded else None
+        self._engine = engine if engine is not None and engine._directory_processors else None
+        self._selector = selector
+        self._ctx = ctx
+        self._directories: dict[str, bool] = {'': False}
+
+    @property
+    def active(self) -> bool:
+        return self._spec is not None or self._engine is not None or self._selector is not None
+
+    def is_directory_excluded(self, directory: str) -> bool:
+        excluded = self._directories.get(directory)
+        if excluded is not None:
+            return excluded
+
+        excluded = self.is_directory_excluded(directory.rpartition('/')[0])
+        if not excluded and self._selector is not None:
+            excluded = not self._selector.may_contain(directory)
+        if not excluded and self._spec is not None:
+            excluded = self._spec.match_file(f'{directory}/')
+        if not excluded and self._engine is not None:
+            assert self._ctx is not None
+            excluded = not self._engine._call_directory_processors(directory, self._ctx)
+
+        self._directories[directory] = excluded
+        return excluded
+
+    def is_excluded(self, file: str) -> bool:
+        if self.is_directory_excluded(file.rpartition('/')[0]):
+            return True
+        if self._selector is not None and not self._selector.matches(file):
+            return True
+
+        return self._spec is not None and self._spec.match_file(file)
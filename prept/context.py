@@ -2,20 +2,117 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, Mapping
+from typing import TYPE_CHECKING, Any, Iterator, Mapping
 from types import MappingProxyType, SimpleNamespace
+from collections.abc import ItemsView, KeysView, ValuesView
 from prept.file import BoilerplateFile
+from prept.errors import PreptCLIError, TimeBudgetExceeded
+from prept.cli import outputs
 
+import time
 import pathlib
+import threading
 
 if TYPE_CHECKING:
     from prept.boilerplate import BoilerplateInfo
+    from prept.engine import GenerationEngine
 
 __all__ = (
     'GenerationContext',
 )
 
 
+class _Variables(dict[str, Any]):
+    # Template variables including computed variables of generation engine.
+    # Computed variables are evaluated when first accessed and the value is
+    # stored in the dictionary so later accesses do not evaluate them again.
+    # Membership tests and iteration include computed variables that have
+    # not yet been evaluated.
+
+    def __init__(self, values: dict[str, Any], engine: GenerationEngine, ctx: GenerationContext) -> None:
+        super().__init__(values)
+        self._computed = {name: callback for name, callback in engine._computed_variables.items() if name not in values}
+        self._engine = engine
+        self._ctx = ctx
+        self._lock = threading.Lock()
+        self._pending: dict[str, tuple[int, threading.Event]] = {}
+
+    def __missing__(self, name: str) -> Any:
+        with self._lock:
+            if super().__contains__(name):
+                # Evaluated by another thread in the meantime.
+                return super().__getitem__(name)
+            if name not in self._computed:
+                raise KeyError(name)
+
+            callback = self._computed[name]
+            event = threading.Event()
+            pending = self._pending.get(name)
+            if pending is None:
+                self._pending[name] = (threading.get_ident(), event)
+
+        if pending is not None:
+            owner, evaluated = pending
+            if owner == threading.get_ident():
+                raise PreptCLIError(f'Computed variable {name!r} depends on itself')
+
+            # Wait for the thread evaluating the variable and access it again.
+            evaluated.wait()
+            return self[name]
+
+        try:
+            value = self._engine._call(callback, 'Computed variable', self._ctx, subject=name)
+        except Exception as e:
+            if isinstance(e, PreptCLIError):
+                raise
+            raise outputs.wrap_exception(e, f'In evaluation of computed variable {name!r}, the following error occured:') from None
+        else:
+            with self._lock:
+                self._computed.pop(name, None)
+                super().__setitem__(name, value)
+        finally:
+            with self._lock:
+                del self._pending[name]
+            event.set()
+
+        return value
+
+    def __setitem__(self, name: str, value: Any) -> None:
+        with self._lock:
+            self._computed.pop(name, None)
+            super().__setitem__(name, value)
+
+    def __delitem__(self, name: str) -> None:
+        with self._lock:
+            if self._computed.pop(name, None) is not None and not super().__contains__(name):
+                return
+            super().__delitem__(name)
+
+    def __contains__(self, name: object) -> bool:
+        return super().__contains__(name) or name in self._computed
+
+    def __iter__(self) -> Iterator[str]:
+        names = list(super().__iter__())
+        evaluated = set(names)
+        names.extend(name for name in list(self._computed) if name not in evaluated)
+        return iter(names)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def get(self, name: str, default: Any = None) -> Any:
+        return self[name] if name in self else default
+
+    def keys(self) -> KeysView[str]:  # type: ignore
+        return KeysView(self)
+
+    def values(self) -> ValuesView[Any]:  # type: ignore
+        return ValuesView(self)
+
+    def items(self) -> ItemsView[str, Any]:  # type: ignore
+        return ItemsView(self)
+
+
 class GenerationContext:
     """The boilerplate generation context.
 
@@ -26,6 +123,10 @@ class GenerationContext:
     ~~~~~~~~~~
     output_dir: :class:`pathlib.Path`
         The path to output directory where files are being generated.
+
+        When generating to a directory, this is the staging directory that
+        files are written to until generation completes. In post-generation
+        hook, this is the final output directory.
     state:
         Attribute to store arbitrary data.
 
@@ -42,13 +143,35 @@ class GenerationContext:
     ):
         self.output_dir = output_dir
         self.state: Any = SimpleNamespace()
-        self._variables = variables or {}
         self._boilerplate = boilerplate
-        self._current_file = None
+        self._current_file: BoilerplateFile | None = None
+        self._local = threading.local()
+        self._cancelled = False
+        self._timings: dict[str, list[float]] = {}
+
+        engine = boilerplate.engine
+        if engine is not None and engine._computed_variables:
+            self._variables: dict[str, Any] = _Variables(variables or {}, engine, self)
+        else:
+            self._variables = variables or {}
 
     def _set_current_file(self, filename: str, path: pathlib.Path) -> None:
+        if self._current_file is not None:
+            # Release content buffer of previously generated file.
+            self._current_file.close()
+
         self._current_file = BoilerplateFile(boilerplate=self.boilerplate, filename=filename, path=path)
 
+    def _record_timing(self, name: str, elapsed: float) -> None:
+        # Stores the number of calls, total and maximum time taken.
+        timing = self._timings.get(name)
+        if timing is None:
+            self._timings[name] = [1, elapsed, elapsed]
+        else:
+            timing[0] += 1
+            timing[1] += elapsed
+            timing[2] = max(timing[2], elapsed)
+
     @property
     def boilerplate(self) -> BoilerplateInfo:
         """The boilerplate that is being generated."""
@@ -56,7 +179,11 @@ class GenerationContext:
 
     @property
     def variables(self) -> Mapping[str, Any]:
-        """Read-only mapping of template variables used for generating template files."""
+        """Read-only mapping of template variables used for generating template files.
+
+        This includes the computed variables of generation engine (see :meth:`GenerationEngine.variable`)
+        which are evaluated when they are first accessed.
+        """
         return MappingProxyType(self._variables)
 
     @property
@@ -86,3 +213,50 @@ class GenerationContext:
         If template variable does not exist, a KeyError is raised.
         """
         del self._variables[name]
+
+    @property
+    def _budget(self) -> tuple[str, float, float] | None:
+        # Budgets are bound to the thread running the processor or hook so
+        # that the budget stays in effect for a function that is still running
+        # after its caller has stopped waiting for it.
+        return getattr(self._local, 'budget', None)
+
+    @_budget.setter
+    def _budget(self, value: tuple[str, float, float] | None) -> None:
+        self._local.budget = value
+
+    @property
+    def remaining_time(self) -> float | None:
+        """The number of seconds left in the time budget of currently running processor or hook.
+
+        This is None if the processor or hook has no time budget.
+
+        .. versionadded:: 0.2.0
+        """
+        if self._budget is None:
+            return None
+
+        return max(0.0, self._budget[2] - time.monotonic())
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether the currently running processor or hook has exceeded its time budget.
+
+        Processors and hooks exceeding their time budget cannot be interrupted and
+        keep running in background while generation fails. Long running processors
+        should periodically check this property (or call :meth:`.check_cancelled`)
+        and stop once it is True.
+
+        .. versionadded:: 0.2.0
+        """
+        return self._cancelled or self.remaining_time == 0
+
+    def check_cancelled(self) -> None:
+        """Raises :class:`TimeBudgetExceeded` if the currently running processor
+        or hook has exceeded its time budget.
+
+        .. versionadded:: 0.2.0
+        """
+        if self._budget is not None and self.cancelled:
+            name, timeout, _ = self._budget
+            raise TimeBudgetExceeded(name, timeout)
@@ -0,0 +1,178 @@
+# Copyright (C) Izhar Ahmad 2025-2026
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Iterable
+
+import pathlib
+
+from prept.providers import TemplateProviderIndex
+
+if TYPE_CHECKING:
+    from prept.boilerplate import BoilerplateInfo
+    from prept.providers import TemplateProvider
+
+__all__ = (
+    'DependencyIndex',
+)
+
+
+class DependencyIndex:
+    """Index of template variables that the boilerplate files depend on.
+
+    For each template file and template path, this index records the names
+    of template variables referenced by it. This is determined through the
+    :meth:`TemplateProvider.find_variables` method of the template provider.
+
+    Files that are neither template files nor template paths do not depend
+    on any variable. If template provider cannot analyse a template, the
+    file is conservatively regarded as depending on every variable.
+
+    The index is populated lazily i.e. files are only scanned when their
+    dependencies are first requested.
+
+    .. versionadded:: 0.2.0
+
+    Parameters
+    ~~~~~~~~~~
+    boilerplate: :class:`BoilerplateInfo`
+        The boilerplate to index.
+    provider: :class:`TemplateProvider` | :class:`TemplateProviderIndex` | None
+        The template provider used for generation, if any. For boilerplates
+        using multiple providers, this is the index of providers.
+    """
+    def __init__(self, boilerplate: BoilerplateInfo, provider: TemplateProvider | TemplateProviderIndex | None) -> None:
+        self.boilerplate = boilerplate
+        self.provider = provider
+        self._content_variables: dict[pathlib.Path, frozenset[str] | None] = {}
+        self._path_variables: dict[pathlib.Path, frozenset[str] | None] = {}
+
+    def _get_provider(self, file: pathlib.Path) -> TemplateProvider | None:
+        if isinstance(self.provider, TemplateProviderIndex):
+            return self.provider.get(file)
+
+        return self.provider
+
+    def _scan(self, provider: TemplateProvider, source: str) -> frozenset[str] | None:
+        names = provider.find_variables(source)
+        return None if names is None else frozenset(names)
+
+    def get_content_variables(self, file: pathlib.Path) -> frozenset[str] | None:
+        """Returns the variables referenced by content of the given file.
+
+        ``None`` is returned if the referenced variables could not be
+        determined.
+
+        Parameters
+        ~~~~~~~~~~
+        file: :class:`pathlib.Path`
+            The path of file, relative to boilerplate directory.
+        """
+        if file in self._content_variables:
+            return self._content_variables[file]
+
+        provider = self._get_provider(file)
+        if provider is None or not self.boilerplate._is_template(file):
+            names: frozenset[str] | None = frozenset()
+        else:
+            try:
+                source = self.boilerplate.source.read_text(file.as_posix())
+            except UnicodeDecodeError:
+                names = None
+            else:
+                names = self._scan(provider, source)
+
+        self._content_variables[file] = names
+        return names
+
+    def get_path_variables(self, file: pathlib.Path) -> frozenset[str] | None:
+        """Returns the variables referenced by the path of given file.
+
+        ``None`` is returned if the referenced variables could not be
+        determined.
+
+        Parameters
+        ~~~~~~~~~~
+        file: :class:`pathlib.Path`
+            The path of file, relative to boilerplate directory.
+        """
+        if file in self._path_variables:
+            return self._path_variables[file]
+
+        provider = self._get_provider(file)
+        if provider is None or not self.boilerplate._is_template(file, path=True):
+            names: frozenset[str] | None = frozenset()
+        else:
+            names = self._scan(provider, str(file))
+
+        self._path_variables[file] = names
+        return names
+
+    def get_variables(self, file: pathlib.Path) -> frozenset[str] | None:
+        """Returns the variables referenced by the given file's content or path.
+
+        ``None`` is returned if the referenced variables could not be
+        determined.
+
+        Parameters
+        ~~~~~~~~~~
+        file: :class:`pathlib.Path`
+            The path of file, relative to boilerplate directory.
+        """
+        content = self.get_content_variables(file)
+        path = self.get_path_variables(file)
+
+        if content is None or path is None:
+            return None
+
+        return content | path
+
+    def is_affected(self, file: pathlib.Path, variables: Iterable[str]) -> bool:
+        """Checks whether the given file depends on any of the given variables.
+
+        Files whose dependencies could not be determined are always
+        regarded as affected.
+
+        Parameters
+        ~~~~~~~~~~
+        file: :class:`pathlib.Path`
+            The path of file, relative to boilerplate directory.
+        variables:
+            The names of variables to check.
+        """
+        names = self.get_variables(file)
+        if names is None:
+            return True
+
+        return not names.isdisjoint(variables)
+
+    def get_referenced_variables(self, files: Iterable[pathlib.Path]) -> frozenset[str] | None:
+        """Returns the variables that the given files depend on.
+
+        Besides the variables referenced by content and paths of files, this
+        includes the variables of :attr:`~BoilerplateInfo.fanout_files` and
+        :attr:`~BoilerplateInfo.conditional_paths`. This is used to determine
+        which variables are needed for generating a subset of boilerplate files.
+
+        ``None`` is returned if the referenced variables of any file could not
+        be determined.
+
+        .. versionadded:: 0.2.0
+
+        Parameters
+        ~~~~~~~~~~
+        files:
+            The paths of files, relative to boilerplate directory.
+        """
+        referenced = {name for _, condition in self.boilerplate._conditions for name in condition.variables}
+        for file in files:
+            names = self.get_variables(file)
+            if names is None:
+                return None
+
+            referenced.update(names)
+            fanout = self.boilerplate._get_fanout(file)
+            if fanout is not None:
+                referenced.add(fanout.variable)
+
+        return frozenset(referenced)
@@ -2,24 +2,69 @@
 
 from __future__ import annotations
 
-from typing import Callable, Any, TYPE_CHECKING
+from typing import Callable, Any, Literal, Sequence, TYPE_CHECKING, overload
 from collections import OrderedDict
-from prept.errors import PreptCLIError, EngineNotFound
+from prept.errors import PreptCLIError, EngineNotFound, TimeBudgetExceeded
+from prept.tasks import PostGenerationTask, run_tasks
+from prept.formatters import Formatter
 from prept.cli import outputs
 
 import importlib
 import pathspec
+import threading
+import time
 
 if TYPE_CHECKING:
     from prept.context import GenerationContext
 
     ProcessorFunctionT = Callable[[GenerationContext], bool | None]
+    DirectoryProcessorFunctionT = Callable[[GenerationContext, str], bool | None]
     GenerationHook = Callable[[GenerationContext], Any]
+    TransformFunctionT = Callable[[GenerationContext, str, str | bytes], str | bytes]
+    TaskFunctionT = Callable[[GenerationContext], Any]
+    ComputedVariableT = Callable[[GenerationContext], Any]
+
+TransformStageT = Literal['pre', 'post']
 
 __all__ = (
     'GenerationEngine',
 )
 
+class _Transform:
+    __slots__ = ('func', 'stage', 'pure')
+
+    def __init__(self, func: TransformFunctionT, stage: TransformStageT, pure: bool) -> None:
+        self.func = func
+        self.stage = stage
+        self.pure = pure
+
+
+class _Callback:
+    # A registered processor, hook or computed variable along with its time
+    # budget. The same function may be registered more than once with
+    # different budgets.
+    __slots__ = ('func', 'timeout')
+
+    def __init__(self, func: Callable[..., Any], timeout: float | None) -> None:
+        _check_timeout(timeout)
+        self.func = func
+        self.timeout = timeout
+
+
+def _check_timeout(timeout: float | None) -> None:
+    if timeout is not None and timeout <= 0:
+        raise ValueError('timeout must be greater than 0')
+
+
+def _remove_callback(callbacks: list[_Callback], func: Callable[..., Any]) -> bool:
+    for callback in callbacks:
+        if callback.func == func:
+            callbacks.remove(callback)
+            return True
+
+    return False
+
+
 class GenerationEngine:
     """Engine for dynamic operations at generation time.
 
@@ -27,11 +72,27 @@ class GenerationEngine:
     time behavior.
 
     .. versionadded:: 0.2.0
+
+    Parameters
+    ~~~~~~~~~~
+    timeout: :class:`float` | None
+        The default time budget, in seconds, of processors and hooks that are
+        registered without a timeout. By default, no time budget is applied.
+
+        See :meth:`.add_processor` for details on time budgets.
     """
-    def __init__(self) -> None:
-        self._file_processors: OrderedDict[str, list[ProcessorFunctionT]] = OrderedDict()
-        self._pre_generation_hook: GenerationHook | None = None
-        self._post_generation_hook: GenerationHook | None = None
+    def __init__(self, *, timeout: float | None = None) -> None:
+        _check_timeout(timeout)
+
+        self.timeout = timeout
+        self._file_processors: OrderedDict[str, list[_Callback]] = OrderedDict()
+        self._directory_processors: OrderedDict[str, list[_Callback]] = OrderedDict()
+        self._transforms: OrderedDict[str, tuple[pathspec.PathSpec[pathspec.Pattern], list[_Transform]]] = OrderedDict()
+        self._pre_generation_hooks: list[_Callback] = []
+        self._post_generation_hooks: list[_Callback] = []
+        self._post_generation_tasks: OrderedDict[str, PostGenerationTask] = OrderedDict()
+        self._formatters: list[Formatter] = []
+        self._computed_variables: dict[str, _Callback] = {}
         self._spec = None
 
     @classmethod
@@ -55,13 +116,60 @@ class GenerationEngine:
         engine._spec = spec
         return engine
 
-    def _wrapped_call_processor(self, proc: ProcessorFunctionT, ctx: GenerationContext) -> bool:
+    def _call(self, callback: _Callback, kind: str, ctx: GenerationContext, *args: Any, subject: str | None = None) -> Any:
+        func = callback.func
+        name = f'{kind} {getattr(func, "__qualname__", func)}'
+        timeout = self.timeout if callback.timeout is None else callback.timeout
+        started = time.perf_counter()
+
+        try:
+            if timeout is None:
+                return func(ctx, *args)
+
+            return self._call_with_budget(func, name if subject is None else f'{name} (processing {subject!r})', timeout, ctx, args)
+        finally:
+            ctx._record_timing(name, time.perf_counter() - started)
+
+    def _call_with_budget(self, func: Callable[..., Any], name: str, timeout: float, ctx: GenerationContext, args: tuple[Any, ...]) -> Any:
+        # Functions are called in a separate thread so that generation is not
+        # stalled by a function that does not return. Python threads cannot be
+        # interrupted so the function is left running in background and can
+        # stop cooperatively through GenerationContext.cancelled.
+        result: list[Any] = []
+        errors: list[BaseException] = []
+        done = threading.Event()
+
+        def runner() -> None:
+            # The budget is bound to this thread so nested budgets (e.g. when a
+            # processor accesses a computed variable) do not affect the caller
+            # and the budget stays expired once the caller stops waiting.
+            ctx._budget = budget
+            try:
+                result.append(func(ctx, *args))
+            except BaseException as e:
+                errors.append(e)
+            finally:
+                done.set()
+
+        budget = (name, timeout, time.monotonic() + timeout)
+        threading.Thread(target=runner, name=f'prept-{name}', daemon=True).start()
+
+        if not done.wait(timeout):
+            ctx._cancelled = True
+            raise TimeBudgetExceeded(name, timeout)
+
+        if errors:
+            raise errors[0]
+
+        return result[0]
+
+    def _wrapped_call_processor(self, proc: _Callback, ctx: GenerationContext) -> bool:
         try:
-            result = proc(ctx)
+            result = self._call(proc, 'Processor', ctx, subject=ctx.current_file._get_source_path())
         except Exception as e:
             if isinstance(e, PreptCLIError):
                 raise
-            raise outputs.wrap_exception(e, f'In processing of {ctx.current_file.path!r}, the following error occured in processor {proc}:') from None
+            raise outputs.wrap_exception(e, f'In processing of {ctx.current_file.path!r}, the following error occured in processor {proc.func}:') from None
         else:
             # If processor function does not return any value, default it to True.
             return True if result is None else result
@@ -82,18 +190,68 @@ class GenerationEngine:
         # Returns boolean indicating whether context file should be generated or not.
         return True
 
-    def _call_hook(self, ctx: GenerationContext, pre: bool = False) -> None:
-        hook = self._pre_generation_hook if pre else self._post_generation_hook
-        if hook is None:
-            return
-        try:
-            hook(ctx)
-        except Exception as e:
-            if isinstance(e, PreptCLIError):
-                raise
-            raise outputs.wrap_exception(e, f'In pre-generation hook {hook}, the following error occured:') from None
+    def _call_directory_processors(self, path: str, ctx: GenerationContext) -> bool:
+        spec = pathspec.PathSpec.from_lines('gitwildmatch', self._directory_processors.keys())
+        result = spec.check_file(f'{path}/')
+
+        if result.index is None:
+            return True
+
+        processors = list(self._directory_processors.values())[result.index]
+        for proc in processors:
+            try:
+                keep = self._call(proc, 'Directory processor', ctx, path, subject=path)
+            except Exception as e:
+                if isinstance(e, PreptCLIError):
+                    raise
+                raise outputs.wrap_exception(e, f'In processing of directory {path!r}, the following error occured in processor {proc.func}:') from None
+
+            # Processors not returning any value default to True.
+            if keep is not None and not keep:
+                return False
+
+        return True
+
+    def _get_transforms(self, path: str, stage: TransformStageT) -> list[_Transform]:
+        # Unlike processors, transforms of all matching patterns are chained
+        # in order of registration of patterns.
+        return [
+            transform
+            for spec, transforms in self._transforms.values() if spec.match_file(path)
+            for transform in transforms if transform.stage == stage
+        ]
+
+    def _has_pure_transforms(self) -> bool:
+        return any(transform.pure for _, transforms in self._transforms.values() for transform in transforms)
 
-    def add_processor(self, path: str, proc_func: ProcessorFunctionT) -> None:
+    def _apply_transforms(self, transforms: list[_Transform], path: str, content: str | bytes, ctx: GenerationContext) -> str | bytes:
+        for transform in transforms:
+            try:
+                content = transform.func(ctx, path, content)
+            except Exception as e:
+                if isinstance(e, PreptCLIError):
+                    raise
+                raise outputs.wrap_exception(e, f'In processing of {path!r}, the following error occured in transform {transform.func}:') from None
+
+            if not isinstance(content, (str, bytes)):
+                raise PreptCLIError(f'Transform {transform.func} returned {type(content).__qualname__} for {path!r}, expected str or bytes')
+
+        return content
+
+    def _call_hook(self, ctx: GenerationContext, pre: bool = False) -> None:
+        hooks = self._pre_generation_hooks if pre else self._post_generation_hooks
+        for hook in hooks:
+            try:
+                self._call(hook, 'Pre-generation hook' if pre else 'Post-generation hook', ctx)
+            except Exception as e:
+                if isinstance(e, PreptCLIError):
+                    raise
+                raise outputs.wrap_exception(e, f'In {"pre" if pre else "post"}-generation hook {hook.func}, the following error occured:') from None
+
+    def _run_post_generation_tasks(self, ctx: GenerationContext) -> None:
+        run_tasks(list(self._post_generation_tasks.values()), ctx)
+
+    def add_processor(self, path: str, proc_func: ProcessorFunctionT, *, timeout: float | None = None) -> None:
         """Registers a processor function for given path.
 
         Processor function must take :class:`GenerationContext` as the
@@ -106,11 +264,22 @@ class GenerationEngine:
             Files at this path will be processed through this processor.
         proc_func:
             The processor function.
+        timeout: :class:`float` | None
+            The time budget of processor in seconds. If not given, the engine's
+            default :attr:`.timeout` is used.
+
+            If processor exceeds its time budget, generation fails with
+            :class:`TimeBudgetExceeded` error. As running processor cannot be
+            interrupted, it should stop cooperatively by checking
+            :attr:`GenerationContext.cancelled`.
+
+            .. versionadded:: 0.2.0
         """
+        callback = _Callback(proc_func, timeout)
         if path not in self._file_processors:
             self._file_processors[path] = []
 
-        self._file_processors[path].append(proc_func)
+        self._file_processors[path].append(callback)
 
     def get_processors(self, path: str) -> tuple[ProcessorFunctionT, ...]:
         """Get the processors registered for the given path.
@@ -120,7 +289,7 @@ class GenerationEngine:
         if path not in self._file_processors:
             return ()
 
-        return tuple(self._file_processors[path])
+        return tuple(callback.func for callback in self._file_processors[path])
 
     def remove_processor(self, path: str, proc_func: ProcessorFunctionT) -> None:
         """Registers a processor function for given path.
@@ -138,10 +307,8 @@ class GenerationEngine:
         proc_func:
             The processor function.
         """
-        try:
-            self._file_processors[path].remove(proc_func)
-        except (ValueError, KeyError):
-            raise ValueError('No processor is registered for this path') from None
+        if not _remove_callback(self._file_processors.get(path, []), proc_func):
+            raise ValueError('No processor is registered for this path')
 
     def clear_processors(self, path: str) -> None:
         """Removes all processors for the given path."""
@@ -150,7 +317,7 @@ class GenerationEngine:
 
         del self._file_processors[path]
 
-    def processor(self, path: str) -> Callable[[ProcessorFunctionT], ProcessorFunctionT]:
+    def processor(self, path: str, *, timeout: float | None = None) -> Callable[[ProcessorFunctionT], ProcessorFunctionT]:
         """Decorator interface for :meth:`.add_processor`
 
         This decorator takes the same parameters as :meth:`.add_processor` method
@@ -158,31 +325,396 @@ class GenerationEngine:
         parameter.
         """
         def __wrapper(func: ProcessorFunctionT):
-            self.add_processor(path, func)
+            self.add_processor(path, func, timeout=timeout)
             return func
 
         return __wrapper
 
-    def pre_generation_hook(self, func: GenerationHook) -> GenerationHook:
+    def add_directory_processor(self, path: str, proc_func: DirectoryProcessorFunctionT, *, timeout: float | None = None) -> None:
+        """Registers a directory processor function for given path.
+
+        Directory processors are called once for each matching directory
+        while boilerplate files are being walked, before any file inside the
+        directory is processed. If a directory processor returns False, the
+        directory and all files and directories inside it are skipped without
+        being walked.
+
+        Processor function must take :class:`GenerationContext` and the path of
+        directory (relative to boilerplate directory, using forward slashes)
+        as parameters.
+
+        .. versionadded:: 0.2.0
+
+        Parameters
+        ~~~~~~~~~~
+        path: :class:`str`
+            The path or gitignore-like pattern for which processor is being defined.
+        proc_func:
+            The directory processor function.
+        timeout: :class:`float` | None
+            The time budget of processor in seconds. See :meth:`.add_processor`
+            for details.
+        """
+        callback = _Callback(proc_func, timeout)
+        if path not in self._directory_processors:
+            self._directory_processors[path] = []
+
+        self._directory_processors[path].append(callback)
+
+    def remove_directory_processor(self, path: str, proc_func: DirectoryProcessorFunctionT) -> None:
+        """Removes a directory processor function for given path.
+
+        ValueError is raised if the processor is not registered for the given path.
+
+        .. versionadded:: 0.2.0
+        """
+        if not _remove_callback(self._directory_processors.get(path, []), proc_func):
+            raise ValueError('No directory processor is registered for this path')
+
+    def directory_processor(self, path: str, *, timeout: float | None = None) -> Callable[[DirectoryProcessorFunctionT], DirectoryProcessorFunctionT]:
+        """Decorator interface for :meth:`.add_directory_processor`
+
+        This decorator takes the same parameters as :meth:`.add_directory_processor`.
+
+        .. versionadded:: 0.2.0
+        """
+        def __wrapper(func: DirectoryProcessorFunctionT):
+            self.add_directory_processor(path, func, timeout=timeout)
+            return func
+
+        return __wrapper
+
+    def add_transform(
+        self,
+        path: str,
+        func: TransformFunctionT,
+        *,
+        stage: TransformStageT = 'post',
+        pure: bool = False,
+    ) -> None:
+        """Registers a content transform for given path.
+
+        Transforms take the content of file in memory and return the transformed
+        content. The transforms are chained and the final content is written to
+        output once, so transforms do not need to read or write files themselves.
+
+        Transform function must take :class:`GenerationContext`, the path of file
+        (relative to boilerplate directory, using forward slashes) and the content
+        (:class:`str` or :class:`bytes`) as parameters and return the transformed
+        content as :class:`str` or :class:`bytes`.
+
+        Transforms of all patterns matching a file are applied in the order that
+        they were registered.
+
+        .. versionadded:: 0.2.0
+
+        Parameters
+        ~~~~~~~~~~
+        path: :class:`str`
+            The path or gitignore-like pattern of files to transform.
+        func:
+            The transform function.
+        stage: :class:`str`
+            The stage at which transform is applied. This can be one of:
+
+            - ``pre``: The transform receives the source content of file as bytes before
+              it is rendered by template provider. Rendering uses the transformed content.
+            - ``post`` (default): The transform receives the rendered content before it is
+              written to output. For files that are not templates, the content is bytes.
+
+            For files that are not templates, ``pre`` transforms are applied before ``post``
+            transforms.
+        pure: :class:`bool`
+            Whether the transform is pure and thread-safe, i.e. its result only depends
+            on the given path and content and it can be called concurrently.
+
+            When all ``post`` transforms for a file are pure, they are ran in a background
+            thread, in parallel with generation of other files. Pure transforms must not
+            access :attr:`GenerationContext.current_file` or modify the context.
+        """
+        if stage not in ('pre', 'post'):
+            raise ValueError(f'stage must be either \'pre\' or \'post\' (got {stage!r})')
+
+        if path not in self._transforms:
+            self._transforms[path] = (pathspec.PathSpec.from_lines('gitwildmatch', [path]), [])
+
+        self._transforms[path][1].append(_Transform(func, stage, pure))
+
+    def remove_transform(self, path: str, func: TransformFunctionT) -> None:
+        """Removes a content transform for given path.
+
+        ValueError is raised if the transform is not registered for the given path.
+
+        .. versionadded:: 0.2.0
+        """
+        transforms = self._transforms[path][1] if path in self._transforms else []
+        for transform in transforms:
+            if transform.func == func:
+                transforms.remove(transform)
+                return
+
+        raise ValueError('No transform is registered for this path')
+
+    def transform(
+        self,
+        path: str,
+        *,
+        stage: TransformStageT = 'post',
+        pure: bool = False,
+    ) -> Callable[[TransformFunctionT], TransformFunctionT]:
+        """Decorator interface for :meth:`.add_transform`
+
+        This decorator takes the same parameters as :meth:`.add_transform`.
+
+        .. versionadded:: 0.2.0
+        """
+        def __wrapper(func: TransformFunctionT):
+            self.add_transform(path, func, stage=stage, pure=pure)
+            return func
+
+        return __wrapper
+
+    def add_formatter(
+        self,
+        paths: str | Sequence[str],
+        command: str | Sequence[str],
+        *,
+        chunk_size: int | None = None,
+        timeout: float | None = None,
+    ) -> Formatter:
+        """Registers an external formatter for generated files.
+
+        Unlike calling a formatter from a transform, which spawns a process for each
+        file, the formatter command is invoked once with the paths of all generated
+        files matching the given patterns (or in chunks when paths do not fit in a
+        single command line).
+
+        Formatters are ran after all files have been generated and before the files
+        are published to output directory or written to archive. When more than one
+        formatter matches a file, formatters are ran in order of registration.
+
+        .. versionadded:: 0.2.0
+
+        Parameters
+        ~~~~~~~~~~
+        paths: :class:`str` | Sequence[:class:`str`]
+            The gitignore-like pattern(s) of files to format.
+        command: :class:`str` | Sequence[:class:`str`]
+            The formatter command, for example ``black -q``.
+        chunk_size: :class:`int` | None
+            The maximum number of files passed to a single invocation of
+            command. Chunks are formatted concurrently.
+        timeout: :class:`float` | None
+            The number of seconds after which an invocation of command is killed.
+
+        Returns
+        ~~~~~~~
+        :class:`Formatter`
+            The registered formatter.
+        """
+        formatter = Formatter(paths, command, chunk_size=chunk_size, timeout=timeout)
+        self._formatters.append(formatter)
+        return formatter
+
+    def remove_formatter(self, formatter: Formatter) -> None:
+        """Removes a formatter registered by :meth:`.add_formatter`.
+
+        If formatter is not registered, ValueError is raised.
+
+        .. versionadded:: 0.2.0
+        """
+        self._formatters.remove(formatter)
+
+    def add_variable(self, name: str, func: ComputedVariableT, *, timeout: float | None = None) -> None:
+        """Registers a computed template variable.
+
+        Computed variables are derived at generation time, for example a package name
+        from the project name. Unlike setting variables in pre-generation hook, the
+        function is only called when the variable is first accessed through
+        :attr:`GenerationContext.variables` (e.g. by a template provider, condition or
+        processor) and its value is reused for rest of the generation. Variables that
+        are not referenced by any generated file are never evaluated.
+
+        Values provided for a variable of same name (e.g. through :option:`prept new -V`)
+        take precedence over computed variables.
+
+        .. versionadded:: 0.2.0
+
+        Parameters
+        ~~~~~~~~~~
+        name: :class:`str`
+            The name of variable.
+        func:
+            The function computing the value of variable. It takes :class:`GenerationContext`
+            as the only parameter and returns the value of variable.
+        timeout: :class:`float` | None
+            The time budget of function in seconds. See :meth:`.add_processor` for details.
+        """
+        if not callable(func):
+            raise TypeError('computed variable function must be callable')
+
+        self._computed_variables[name] = _Callback(func, timeout)
+
+    def remove_variable(self, name: str) -> None:
+        """Removes a computed variable.
+
+        If no computed variable is registered with the given name, KeyError is raised.
+
+        .. versionadded:: 0.2.0
+        """
+        del self._computed_variables[name]
+
+    def variable(self, name: str | None = None, *, timeout: float | None = None) -> Callable[[ComputedVariableT], ComputedVariableT]:
+        """Decorator interface for :meth:`.add_variable`.
+
+        The name of variable defaults to the name of decorated function. Other
+        parameters are same as :meth:`.add_variable`. For example::
+
+            @engine.variable('package_name')
+            def package_name(ctx):
+                return ctx.variables['project_name'].lower().replace('-', '_')
+
+        .. versionadded:: 0.2.0
+        """
+        def __wrapper(func: ComputedVariableT):
+            self.add_variable(name or func.__name__, func, timeout=timeout)
+            return func
+
+        return __wrapper
+
+    @overload
+    def pre_generation_hook(self, func: GenerationHook, *, timeout: float | None = ...) -> GenerationHook:
+        ...
+
+    @overload
+    def pre_generation_hook(self, *, timeout: float | None = ...) -> Callable[[GenerationHook], GenerationHook]:
+        ...
+
+    def pre_generation_hook(self, func: GenerationHook | None = None, *, timeout: float | None = None) -> Any:
         """Decorator to register a pre-generation hook.
 
         The function decorated by this method will be called when
         generation starts, before generation of any file.
+
+        Multiple hooks can be registered and are called in order
+        of registration.
+
+        This decorator can be used with or without parentheses. The ``timeout``
+        parameter sets the time budget of hook in seconds (see :meth:`.add_processor`
+        for details).
         """
+        if func is None:
+            def __wrapper(func: GenerationHook) -> GenerationHook:
+                return self.pre_generation_hook(func, timeout=timeout)
+
+            return __wrapper
         if not callable(func):
             raise TypeError('pre-generation hook must be callable')
 
-        self._pre_generation_hook = func
+        self._pre_generation_hooks.append(_Callback(func, timeout))
         return func
 
-    def post_generation_hook(self, func: GenerationHook) -> GenerationHook:
+    @overload
+    def post_generation_hook(self, func: GenerationHook, *, timeout: float | None = ...) -> GenerationHook:
+        ...
+
+    @overload
+    def post_generation_hook(self, *, timeout: float | None = ...) -> Callable[[GenerationHook], GenerationHook]:
+        ...
+
+    def post_generation_hook(self, func: GenerationHook | None = None, *, timeout: float | None = None) -> Any:
         """Decorator to register a post-generation hook.
 
         The function decorated by this method will be called when
         all files have been generated successfully.
+
+        Multiple hooks can be registered and are called in order of
+        registration, before any post-generation tasks are ran.
+
+        This decorator can be used with or without parentheses. The ``timeout``
+        parameter sets the time budget of hook in seconds (see :meth:`.add_processor`
+        for details).
         """
+        if func is None:
+            def __wrapper(func: GenerationHook) -> GenerationHook:
+                return self.post_generation_hook(func, timeout=timeout)
+
+            return __wrapper
         if not callable(func):
             raise TypeError('post-generation hook must be callable')
 
-        self._post_generation_hook = func
+        self._post_generation_hooks.append(_Callback(func, timeout))
         return func
+
+    def add_post_generation_task(
+        self,
+        name: str,
+        action: TaskFunctionT | str | Sequence[str],
+        *,
+        after: Sequence[str] = (),
+        timeout: float | None = None,
+    ) -> PostGenerationTask:
+        """Registers a post-generation task.
+
+        Post-generation tasks are ran after all files have been generated and
+        post-generation hooks have been called. Tasks that do not depend on each
+        other (through ``after``) are ran concurrently and a timing report is shown
+        once all tasks complete.
+
+        If a task fails, no further tasks are started and generation fails once
+        the running tasks complete.
+
+        .. versionadded:: 0.2.0
+
+        Parameters
+        ~~~~~~~~~~
+        name: :class:`str`
+            The unique name of task.
+        action:
+            The function, coroutine function or command ran by the task. See
+            :class:`PostGenerationTask` for details.
+        after: Sequence[:class:`str`]
+            The names of tasks that must complete before this task is started.
+        timeout: :class:`float` | None
+            The number of seconds after which the task is failed.
+
+        Returns
+        ~~~~~~~
+        :class:`PostGenerationTask`
+            The registered task.
+        """
+        if name in self._post_generation_tasks:
+            raise ValueError(f'post-generation task {name!r} is already registered')
+
+        task = PostGenerationTask(name, action, after=after, timeout=timeout)
+        self._post_generation_tasks[name] = task
+        return task
+
+    def remove_post_generation_task(self, name: str) -> None:
+        """Removes a post-generation task.
+
+        If no task is registered with the given name, KeyError is raised.
+
+        .. versionadded:: 0.2.0
+        """
+        del self._post_generation_tasks[name]
+
+    def post_generation_task(
+        self,
+        name: str | None = None,
+        *,
+        after: Sequence[str] = (),
+        timeout: float | None = None,
+    ) -> Callable[[TaskFunctionT], TaskFunctionT]:
+        """Decorator to register a function as post-generation task.
+
+        The name of task defaults to the name of function. Other parameters
+        are same as :meth:`.add_post_generation_task`.
+
+        .. versionadded:: 0.2.0
+        """
+        def __wrapper(func: TaskFunctionT):
+            self.add_post_generation_task(name or func.__name__, func, after=after, timeout=timeout)
+            return func
+
+        return __wrapper
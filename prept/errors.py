@@ -16,6 +16,7 @@ __all__ = (
     'BoilerplateNotFound',
     'TemplateProviderNotFound',
     'EngineNotFound',
+    'TimeBudgetExceeded',
 )
 
 
@@ -125,3 +126,25 @@ class EngineNotFound(PreptCLIError):
 
     def __init__(self, spec: str, reason: str) -> None:
         super().__init__(f'Failed to resolve generation engine from spec {spec!r} ({reason})')
+
+
+class TimeBudgetExceeded(PreptCLIError):
+    """Error raised when a processor or hook exceeds its time budget.
+
+    .. versionadded:: 0.2.0
+
+    Parameters
+    ~~~~~~~~~~
+    name: :class:`str`
+        The description of processor or hook that exceeded the time budget.
+    timeout: :class:`float`
+        The time budget in seconds.
+    """
+
+    def __init__(self, name: str, timeout: float) -> None:
+        self.name = name
+        self.timeout = timeout
+        super().__init__(
+            f'{name} exceeded its time budget of {timeout} seconds',
+            'Increase the timeout of processor or hook, or ensure that it completes within the time budget.',
+        )
@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Literal, overload
+from typing import TYPE_CHECKING, BinaryIO, Literal, overload
 
+import io
+import locale
 import pathlib
 
 if TYPE_CHECKING:
@@ -20,6 +22,13 @@ class BoilerplateFile:
     This class provides interface for interacting with the file, usually at
     the generation time.
 
+    The file content is read once, on first access, and shared by every
+    subsequent read so processors and template provider do not read the
+    same file repeatedly. The content is read through the boilerplate's
+    :attr:`~BoilerplateInfo.source` so large files in directories and
+    uncompressed files in zip archives are memory-mapped rather than
+    loaded into memory.
+
     Attributes
     ~~~~~~~~~~
     boilerplate: :class:`BoilerplateInfo`
@@ -29,6 +38,9 @@ class BoilerplateFile:
     path: :class:`pathlib.Path`
         The path towards file. This is the path in the boilerplate
         directory, not the directory in which file is being generated.
+
+        For boilerplates loaded from archives, this path is inside the
+        archive and does not exist on file system.
     """
 
     def __init__(
@@ -40,6 +52,26 @@ class BoilerplateFile:
         self.boilerplate = boilerplate
         self.filename = filename
         self.path = path
+        self._buffer: memoryview | None = None
+
+    def _get_source_path(self) -> str:
+        return self.path.relative_to(self.boilerplate.path).as_posix()
+
+    def _get_buffer(self) -> memoryview:
+        if self._buffer is None:
+            self._buffer = self.boilerplate.source.read_view(self._get_source_path())
+
+        return self._buffer
+
+    def _set_content(self, content: str | bytes) -> None:
+        # Replaces the shared content buffer, used for applying pre-rendering
+        # transforms so template providers read the transformed content.
+        if isinstance(content, str):
+            # Encoded the same way as text is decoded by read().
+            content = content.encode(locale.getpreferredencoding(False))
+
+        self.close()
+        self._buffer = memoryview(content)
 
     @overload
     def read(self) -> str:
@@ -54,11 +86,55 @@ class BoilerplateFile:
         ...
 
     def read(self, *, binary: bool = False) -> str | bytes:
-        """Opens the file, reads its content, and closes it.
+        """Reads the content of file.
+
+        .. versionchanged:: 0.2.0
+            The content is now read from the shared content buffer.
 
         Attributes
         ~~~~~~~~~~
         binary: :class:`bool`
             Whether to open file in binary mode.
         """
-        return self.path.read_bytes() if binary else self.path.read_text()
+        buffer = self._get_buffer()
+        if binary:
+            return buffer.tobytes()
+
+        # TextIOWrapper applies the same decoding and newline translation
+        # that opening the file in text mode does.
+        with io.TextIOWrapper(io.BytesIO(buffer)) as f:
+            return f.read()
+
+    def read_bytes_view(self) -> memoryview:
+        """Returns a read-only view of the file content without copying it.
+
+        The returned view must not be used after :meth:`.close` is called.
+
+        .. versionadded:: 0.2.0
+        """
+        return self._get_buffer().toreadonly()
+
+    def open(self) -> BinaryIO:
+        """Opens the file for reading in binary mode.
+
+        Unlike :meth:`.read`, this does not use the shared content buffer and
+        is suitable for processing large files incrementally. The returned
+        file object must be closed by the caller.
+
+        .. versionadded:: 0.2.0
+        """
+        return self.boilerplate.source.open(self._get_source_path())
+
+    def close(self) -> None:
+        """Releases the shared content buffer of file.
+
+        This is called by Prept once the file has been generated. Reading the
+        file after closing it populates the buffer again.
+
+        .. versionadded:: 0.2.0
+        """
+        buffer, self._buffer = self._buffer, None
+        if buffer is not None:
+            # Memory-mapped content is unmapped once all views over
+            # it, including ones from read_bytes_view(), are released.
+            buffer.release()
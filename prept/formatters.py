@@ -0,0 +1,260 @@
+# Copyright (C) Izhar Ahmad 2025-2026
+
+from __future__ import annotations
+
+from typing import Iterator, Sequence
+from prept.errors import PreptCLIError
+from prept.cli import outputs
+from prept.sinks import OutputSink, FilesystemSink
+from concurrent.futures import ThreadPoolExecutor
+
+import os
+import time
+import click
+import shlex
+import shutil
+import pathlib
+import pathspec
+import tempfile
+import subprocess
+
+__all__ = (
+    'Formatter',
+)
+
+# Used when the limit of command line length cannot be determined.
+_DEFAULT_ARGUMENT_LIMIT = 128 * 1024
+
+# Room left in command line for the formatter command itself and anything
+# added to environment by the time the formatter is spawned.
+_ARGUMENT_HEADROOM = 4096
+
+
+def _get_argument_limit() -> int:
+    if os.name == 'nt':
+        # CreateProcess() limits the command line to 32767 characters.
+        return 32767 - _ARGUMENT_HEADROOM
+
+    try:
+        limit = os.sysconf('SC_ARG_MAX')
+    except (AttributeError, ValueError, OSError):
+        limit = -1
+
+    if limit <= 0:
+        limit = _DEFAULT_ARGUMENT_LIMIT
+
+    # Environment variables are passed along with arguments and share the limit.
+    environ = sum(len(os.fsencode(key)) + len(os.fsencode(value)) + 2 + 8 for key, value in os.environ.items())
+    return max(limit - environ - _ARGUMENT_HEADROOM, _ARGUMENT_HEADROOM)
+
+
+def _argument_size(argument: str) -> int:
+    # Each argument takes its length, the null terminator and a pointer.
+    return len(os.fsencode(argument)) + 1 + 8
+
+
+class Formatter:
+    """An external formatter ran over generated files.
+
+    Formatters are registered through :meth:`GenerationEngine.add_formatter`. Once
+    all files have been generated, the formatter command is invoked with paths of
+    all generated files that match the formatter's patterns passed as arguments.
+    Files are formatted before being published to output directory or written to
+    archive so the formatted content is what ends up in output.
+
+    When paths do not fit in a single command line (or ``chunk_size`` is set), the
+    command is invoked multiple times with chunks of paths which are ran concurrently.
+
+    .. versionadded:: 0.2.0
+
+    Parameters
+    ~~~~~~~~~~
+    paths: Sequence[:class:`str`]
+        The gitignore-like patterns of files to format.
+    command: :class:`str` | Sequence[:class:`str`]
+        The formatter command, for example ``black -q``. Commands given as string
+        are split using shell-like syntax. The command is ran in output directory
+        and paths are passed relative to it.
+    chunk_size: :class:`int` | None
+        The maximum number of files passed to a single invocation of command. By
+        default, as many files are passed as the command line length permits.
+    timeout: :class:`float` | None
+        The number of seconds after which an invocation of command is killed
+        and generation fails.
+    """
+    def __init__(
+        self,
+        paths: Sequence[str],
+        command: str | Sequence[str],
+        *,
+        chunk_size: int | None = None,
+        timeout: float | None = None,
+    ) -> None:
+        if isinstance(paths, str):
+            paths = [paths]
+        if isinstance(command, str):
+            command = shlex.split(command)
+        if not command:
+            raise ValueError('formatter command must not be empty')
+        if chunk_size is not None and chunk_size < 1:
+            raise ValueError('chunk_size must be greater than 0')
+        if timeout is not None and timeout <= 0:
+            raise ValueError('timeout must be greater than 0')
+
+        self.paths = list(paths)
+        self.command = list(command)
+        self.chunk_size = chunk_size
+        self.timeout = timeout
+        self._spec = pathspec.PathSpec.from_lines('gitwildmatch', self.paths)
+
+    def __repr__(self) -> str:
+        return f'Formatter(paths={self.paths!r}, command={self.command!r})'
+
+    @property
+    def name(self) -> str:
+        """The name of formatter, this is the name of command's executable."""
+        return pathlib.PurePath(self.command[0]).name
+
+    def matches(self, path: str) -> bool:
+        """Checks whether the file with given path is formatted by this formatter.
+
+        Parameters
+        ~~~~~~~~~~
+        path: :class:`str`
+            The relative path of file with forward slashes as separator.
+        """
+        return self._spec.match_file(path)
+
+    def _get_chunks(self, paths: Sequence[str], limit: int) -> Iterator[list[str]]:
+        base = sum(_argument_size(argument) for argument in self.command)
+        chunk: list[str] = []
+        size = base
+
+        for path in paths:
+            if path.startswith('-'):
+                # Prevent paths from being parsed as options.
+                path = f'./{path}'
+
+            path_size = _argument_size(path)
+            if chunk and (size + path_size > limit or len(chunk) == self.chunk_size):
+                yield chunk
+                chunk = []
+                size = base
+
+            chunk.append(path)
+            size += path_size
+
+        if chunk:
+            yield chunk
+
+    def _run(self, directory: pathlib.Path, paths: list[str]) -> None:
+        executable = shutil.which(self.command[0]) or self.command[0]
+        try:
+            proc = subprocess.run(
+                [executable, *self.command[1:], *paths],
+                cwd=directory,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                timeout=self.timeout,
+            )
+        except FileNotFoundError:
+            raise PreptCLIError(
+                f'Formatter command {self.command[0]!r} could not be found',
+                hint='Ensure that the formatter is installed and available in PATH.'
+            ) from None
+        except subprocess.TimeoutExpired:
+            raise PreptCLIError(f'Formatter {self.name!r} timed out after {self.timeout} seconds') from None
+
+        if proc.returncode:
+            output = proc.stdout.decode(errors='replace').strip()
+            raise PreptCLIError(
+                f'Formatter {self.name!r} returned non-zero exit code {proc.returncode}'
+                + (f', the following output was captured:\n{output}' if output else '')
+            )
+
+
+class FormattingSink(OutputSink):
+    # Wraps the output sink and records the generated files that are to be
+    # formatted. For filesystem sinks, these files are formatted in place.
+    # Other sinks (e.g. archives) cannot be formatted in place so matching
+    # files are written to a temporary directory and passed to wrapped sink
+    # once formatted.
+
+    def __init__(self, sink: OutputSink, formatters: Sequence[Formatter]) -> None:
+        self._sink = sink
+        self._formatters = formatters
+        self._paths: dict[str, None] = {}
+        self._temporary = not isinstance(sink, FilesystemSink)
+
+        if isinstance(sink, FilesystemSink):
+            self._local = sink
+        else:
+            self._local = FilesystemSink(pathlib.Path(tempfile.mkdtemp(prefix='prept-format-')))
+
+    def _get_sink(self, path: str) -> OutputSink:
+        if not any(formatter.matches(path) for formatter in self._formatters):
+            return self._sink
+
+        self._paths[path] = None
+        return self._local
+
+    def _add_existing(self, path: str) -> None:
+        # Adds a file already present in local directory, e.g. one staged
+        # by a previous generation that is being resumed.
+        if any(formatter.matches(path) for formatter in self._formatters):
+            self._paths[path] = None
+
+    def copy(self, path: str, source: pathlib.Path) -> None:
+        self._get_sink(path).copy(path, source)
+
+    def write(self, path: str, content: str | bytes, *, source: pathlib.Path | None = None) -> None:
+        self._get_sink(path).write(path, content, source=source)
+
+    def write_stream(self, path: str, chunks: Iterator[str | bytes], *, source: pathlib.Path | None = None) -> None:
+        self._get_sink(path).write_stream(path, chunks, source=source)
+
+    def format(self) -> None:
+        paths = list(self._paths)
+        if not paths:
+            return
+
+        outputs.echo_info(f'Formatting {len(paths)} generated files')
+
+        limit = _get_argument_limit()
+        directory = self._local.directory
+
+        with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as executor:
+            # Formatters are ran one after another as more than one formatter
+            # may format the same file.
+            for formatter in self._formatters:
+                matched = [path for path in paths if formatter.matches(path)]
+                if not matched:
+                    continue
+
+                started = time.perf_counter()
+                futures = [executor.submit(formatter._run, directory, chunk) for chunk in formatter._get_chunks(matched, limit)]
+                try:
+                    for future in futures:
+                        future.result()
+                except BaseException:
+                    for future in futures:
+                        future.cancel()
+                    raise
+
+                click.echo(outputs.cli_msg(
+                    f'├── Formatted {len(matched)} files with {formatter.name} in '
+                    f'{time.perf_counter() - started:.2f}s ({len(futures)} invocations)'
+                ))
+
+        if self._temporary:
+            for path in paths:
+                file = directory / path
+                self._sink.write(path, file.read_bytes(), source=file)
+
+    def close(self) -> None:
+        # The wrapped sink is owned by the caller and is not closed.
+        if self._temporary:
+            shutil.rmtree(self._local.directory, ignore_errors=True)
+
+    def discard(self) -> None:
+        self.close()
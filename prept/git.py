@@ -0,0 +1,153 @@
+# Copyright (C) Izhar Ahmad 2025-2026
+
+from __future__ import annotations
+
+from prept import utils
+from prept.errors import PreptCLIError
+from prept.locks import FileLock
+
+import os
+import hashlib
+import pathlib
+import tarfile
+import subprocess
+
+__all__ = (
+    'GitMirror',
+)
+
+# Extraction filters are only available in newer Python versions.
+_EXTRACT_OPTIONS = {'filter': 'data'} if hasattr(tarfile, 'data_filter') else {}
+
+
+def _run_git(*args: str, cwd: pathlib.Path | None = None) -> bytes:
+    proc = subprocess.Popen(
+        ['git', *args],
+        cwd=cwd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    stdout, stderr = proc.communicate()
+    if proc.returncode:
+        raise PreptCLIError(f'git {args[0]} returned non-zero exit code {proc.returncode}, the following error was captured on stderr:\n{stderr.decode()}')
+
+    return stdout
+
+
+class GitMirror:
+    """Cached bare mirror of a git repository.
+
+    Mirrors are stored in the ``git`` directory in Prept's directory and
+    are reused across installations. Once a mirror is created, only new
+    objects are fetched from the remote repository on subsequent syncs.
+
+    .. versionadded:: 0.2.0
+
+    Parameters
+    ~~~~~~~~~~
+    url: :class:`str`
+        The URL of remote repository.
+    directory: :class:`pathlib.Path` | None
+        The directory of mirror. Defaults to a directory derived from the URL
+        inside Prept's directory.
+    """
+    def __init__(self, url: str, directory: pathlib.Path | None = None) -> None:
+        if directory is None:
+            directory = utils.get_prept_dir('git', hashlib.sha256(url.encode()).hexdigest()[:32])
+
+        self.url = url
+        self.directory = directory
+
+    @staticmethod
+    def parse_spec(spec: str) -> tuple[str, str | None]:
+        """Splits a ``URL@ref`` installation spec into URL and ref.
+
+        The ref is recognized after the last ``@`` in the path of URL so that
+        URLs with user information (e.g. ``ssh://git@host/repo``) are parsed
+        correctly and refs may contain slashes (e.g. ``repo@release/1.0``).
+        The ref is ``None`` if not given.
+
+        :class:`PreptCLIError` is raised if the spec cannot be parsed.
+        """
+        scheme, sep, rest = spec.partition('://')
+        host, colon, _ = spec.partition(':')
+        if sep:
+            # The path starts after the host of URL.
+            slash = rest.find('/')
+            start = len(scheme) + len(sep) + (len(rest) if slash == -1 else slash)
+        elif colon and '/' not in host and len(host) > 1:
+            # scp-like syntax (e.g. git@host:user/repo), excluding Windows drives.
+            start = len(host) + len(colon)
+        else:
+            start = 0
+
+        path, sep, ref = spec[start:].rpartition('@')
+        if not sep:
+            return spec, None
+
+        if not path.strip('/'):
+            raise PreptCLIError(f'Invalid git spec {spec!r}, repository path is missing')
+        if not ref or ref.startswith('-') or any(ch.isspace() for ch in ref):
+            raise PreptCLIError(
+                f'Invalid git spec {spec!r}, {ref!r} is not a valid ref',
+                hint='Pass a branch, tag or commit after "@", e.g. git+https://host/repo.git@release/1.0',
+            )
+
+        return spec[:start] + path, ref
+
+    def sync(self) -> None:
+        """Creates the mirror or fetches the changes from remote repository.
+
+        Concurrent syncs of the same mirror, including from other processes,
+        are performed one at a time.
+        """
+        with FileLock(self.directory.with_name(self.directory.name + '.lock')):
+            if (self.directory / 'HEAD').exists():
+                _run_git('fetch', '--prune', '--force', 'origin', cwd=self.directory)
+            else:
+                os.makedirs(self.directory.parent, exist_ok=True)
+                _run_git('clone', '--mirror', '--quiet', self.url, str(self.directory))
+
+    def resolve(self, ref: str | None = None) -> str:
+        """Resolves the given ref to a commit SHA.
+
+        If ref is not given, the default branch of repository is resolved.
+        """
+        try:
+            out = _run_git('rev-parse', '--verify', '--quiet', f'{ref or "HEAD"}^{{commit}}', cwd=self.directory)
+        except PreptCLIError:
+            raise PreptCLIError(f'Ref {ref or "HEAD"!r} could not be resolved in git repository {self.url}') from None
+
+        return out.decode().strip()
+
+    def materialize(self, commit: str, target: pathlib.Path) -> None:
+        """Writes the tree of given commit to the target directory.
+
+        This does not create a working tree or copy the repository history,
+        only the files of commit are written.
+        """
+        os.makedirs(target, exist_ok=True)
+        proc = subprocess.Popen(
+            ['git', 'archive', '--format=tar', commit],
+            cwd=self.directory,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        assert proc.stdout is not None and proc.stderr is not None
+
+        try:
+            with tarfile.open(fileobj=proc.stdout, mode='r|') as tar:
+                for member in tar:
+                    if not (member.isfile() or member.isdir()) or member.name.startswith('/') or '..' in member.name.split('/'):
+                        # Symbolic links, special files and paths outside target
+                        # directory are skipped.
+                        continue
+                    tar.extract(member, target, set_attrs=member.isfile(), **_EXTRACT_OPTIONS)  # type: ignore
+        finally:
+            proc.stdout.close()
+            stderr = proc.stderr.read()
+            proc.stderr.close()
+            returncode = proc.wait()
+
+        if returncode:
+            raise PreptCLIError(f'git archive returned non-zero exit code {returncode}, the following error was captured on stderr:\n{stderr.decode()}')
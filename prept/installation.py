@@ -0,0 +1,483 @@
+# Copyright (C) Izhar Ahmad 2025-2026
+
+"""Layout of boilerplate installations.
+
+Each installed boilerplate has a directory in ``boilerplates/`` directory
+with the following layout::
+
+    <name>/
+        current             # Name of current version
+        versions/
+            1.0/            # Installed from a directory
+            1.1.zip         # Installed from an archive
+
+Installations are staged in hidden directories inside ``versions/`` and moved
+in place once complete. Installing and uninstalling a boilerplate hold an
+exclusive lock on it and reading it (e.g. for generation) holds a shared
+lock. The lock files are stored in ``locks/`` directory so they are not
+removed with installations.
+
+Boilerplates are installed in the Prept directory (see :func:`utils.get_prept_dir`)
+and are additionally resolved from shared, read-only Prept directories listed
+in ``PREPT_PATH`` environment variable. A Prept directory can be indexed in
+``boilerplates/index.json`` so that boilerplates are resolved from it without
+scanning the directory.
+
+Boilerplates installed before versioned installations were introduced are
+stored directly in ``<name>/`` (or as ``<name>.<archive suffix>``) and are
+migrated to the versioned layout when another version is installed.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, cast
+from packaging.version import Version, InvalidVersion
+from packaging.specifiers import SpecifierSet, InvalidSpecifier
+from prept import utils
+from prept.locks import FileLock
+from prept.sources import ARCHIVE_SUFFIXES, get_archive_suffix
+
+import os
+import json
+import uuid
+import shutil
+import pathlib
+
+if TYPE_CHECKING:
+    from prept.boilerplate import BoilerplateInfo
+
+__all__ = (
+    'UNVERSIONED',
+    'split_spec',
+    'get_version_key',
+    'get_installation_dir',
+    'get_legacy_installation',
+    'get_installed_versions',
+    'get_current_version',
+    'set_current_version',
+    'get_latest_version',
+    'resolve_installation',
+    'migrate_legacy_installation',
+    'get_installation_target',
+    'get_staging_path',
+    'publish_staged',
+    'get_installed_names',
+    'is_shared_installation',
+    'build_index',
+    'refresh_index',
+    'remove_index',
+    'lock_installation',
+    'lock_registry',
+)
+
+UNVERSIONED = 'unversioned'
+CURRENT_POINTER = 'current'
+VERSIONS_DIRECTORY = 'versions'
+INDEX_FILE = 'index.json'
+INDEX_FORMAT = 1
+
+_SPECIFIER_OPERATORS = ('<', '>', '=', '!', '~')
+
+
+def split_spec(value: str) -> tuple[str, str | None]:
+    """Splits ``name@version`` into name and version spec.
+
+    The version spec is ``None`` if not present.
+    """
+    name, sep, spec = value.partition('@')
+    return name, (spec.strip() or None) if sep else None
+
+
+def get_version_key(version: Version | None) -> str:
+    """Returns the name used for installation of the given version."""
+    return UNVERSIONED if version is None else str(version)
+
+
+def _get_boilerplates_dir(root: pathlib.Path | None) -> pathlib.Path:
+    return utils.get_prept_dir('boilerplates') if root is None else root / 'boilerplates'
+
+
+def get_installation_dir(name: str, root: pathlib.Path | None = None) -> pathlib.Path:
+    """Returns the directory containing all installed versions of a boilerplate.
+
+    root is the Prept directory to look in and defaults to :func:`utils.get_prept_dir`.
+    This applies to other functions taking root as well.
+    """
+    return _get_boilerplates_dir(root) / name.lower()
+
+
+def get_legacy_installation(name: str, root: pathlib.Path | None = None) -> pathlib.Path | None:
+    """Returns the path of unversioned installation of a boilerplate, if any."""
+    bp_dir = get_installation_dir(name, root)
+
+    if (bp_dir / 'preptconfig.json').exists():
+        return bp_dir
+
+    for suffix in ARCHIVE_SUFFIXES:
+        archive = bp_dir.with_name(bp_dir.name + suffix)
+        if archive.is_file():
+            return archive
+
+    return None
+
+
+def get_installed_versions(name: str, root: pathlib.Path | None = None) -> dict[str, pathlib.Path]:
+    """Returns the mapping of installed version names to their installation paths."""
+    versions_dir = get_installation_dir(name, root) / VERSIONS_DIRECTORY
+    versions: dict[str, pathlib.Path] = {}
+
+    if not versions_dir.exists():
+        return versions
+
+    for entry in os.scandir(versions_dir):
+        if entry.name.startswith('.'):
+            continue
+
+        suffix = get_archive_suffix(pathlib.Path(entry.name))
+        if suffix is not None and entry.is_file():
+            versions[entry.name[:-len(suffix)]] = pathlib.Path(entry.path)
+        elif entry.is_dir():
+            versions[entry.name] = pathlib.Path(entry.path)
+
+    return versions
+
+
+def get_current_version(name: str, root: pathlib.Path | None = None) -> str | None:
+    """Returns the name of current version of a boilerplate, if any."""
+    try:
+        with open(get_installation_dir(name, root) / CURRENT_POINTER, 'r') as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def set_current_version(name: str, version: str | None) -> None:
+    """Atomically sets the current version of a boilerplate.
+
+    If version is ``None``, the current version pointer is removed.
+    """
+    pointer = get_installation_dir(name) / CURRENT_POINTER
+
+    if version is None:
+        try:
+            os.remove(pointer)
+        except FileNotFoundError:
+            pass
+        return
+
+    os.makedirs(pointer.parent, exist_ok=True)
+    utils.write_atomic(pointer, version)
+
+
+def _sort_key(version: str) -> tuple[int, Version | None]:
+    try:
+        return 1, Version(version)
+    except InvalidVersion:
+        return 0, None
+
+
+def get_latest_version(versions: list[str]) -> str | None:
+    """Returns the highest version from given version names."""
+    if not versions:
+        return None
+
+    return max(versions, key=_sort_key)
+
+
+def resolve_installation(name: str, spec: str | None = None) -> pathlib.Path | None:
+    """Resolves the installation path of a boilerplate.
+
+    If spec is not given, the current version is resolved. The spec can either
+    be a version, which is matched exactly, or a PEP 440 specifier, in which
+    case the highest matching installed version is resolved.
+
+    The Prept directories returned by :func:`utils.get_prept_path` are searched
+    in order and the first directory with a matching installation is used.
+
+    Returns ``None`` if no matching installation exists.
+    """
+    for root in utils.get_prept_path():
+        path = _resolve_in_root(name, spec, root)
+        if path is not None:
+            return path
+
+    return None
+
+
+def _resolve_in_root(name: str, spec: str | None, root: pathlib.Path | None) -> pathlib.Path | None:
+    index = _load_index(root)
+
+    if index is not None:
+        # Indexed directories are not scanned which avoids listing
+        # directories on slow (e.g. network mounted) file systems.
+        entry = index.get(name.lower())
+        if entry is None:
+            return None
+
+        bps_dir = _get_boilerplates_dir(root)
+        versions = {version: bps_dir / path for version, path in entry['versions'].items()}
+        current = entry['current']
+        legacy = None
+    else:
+        versions = get_installed_versions(name, root)
+        current = get_current_version(name, root)
+        legacy = get_legacy_installation(name, root)
+
+    if spec is None:
+        if current is not None and current in versions:
+            return versions[current]
+
+        return legacy
+
+    if legacy is not None:
+        # Legacy installations have no version directories, the version
+        # is read from the configuration instead.
+        version = _get_legacy_version(legacy)
+        if version is not None:
+            versions.setdefault(version, legacy)
+
+    if spec.startswith(_SPECIFIER_OPERATORS):
+        try:
+            specifier = SpecifierSet(spec)
+        except InvalidSpecifier:
+            return None
+
+        matches = [v for v in versions if _sort_key(v)[0] and Version(v) in specifier]
+        latest = get_latest_version(matches)
+        return None if latest is None else versions[latest]
+
+    try:
+        wanted = Version(spec)
+    except InvalidVersion:
+        return versions.get(spec)
+
+    for version, path in versions.items():
+        if _sort_key(version) == (1, wanted):
+            return path
+
+    return None
+
+
+def _get_legacy_version(path: pathlib.Path) -> str | None:
+    from prept.boilerplate import BoilerplateInfo
+
+    try:
+        bp = BoilerplateInfo.from_path(path)
+    except Exception:
+        return None
+
+    bp.source.close()
+    return get_version_key(bp.version)
+
+
+def is_shared_installation(path: pathlib.Path) -> bool:
+    """Checks whether the given installation path is in a shared Prept directory.
+
+    Installations in shared directories are read-only and cannot be modified
+    by Prept commands.
+    """
+    return not path.absolute().is_relative_to(_get_boilerplates_dir(None).absolute())
+
+
+def get_installed_names(root: pathlib.Path | None = None) -> list[str]:
+    """Returns the names of boilerplates installed in a Prept directory.
+
+    The index is used if the directory is indexed.
+    """
+    index = _load_index(root)
+    if index is not None:
+        return list(index)
+
+    return _scan_names(root)
+
+
+def _scan_names(root: pathlib.Path | None) -> list[str]:
+    bps_dir = _get_boilerplates_dir(root)
+    if not bps_dir.is_dir():
+        return []
+
+    names: list[str] = []
+    for entry in os.scandir(bps_dir):
+        if entry.name.startswith('.'):
+            # Installations being removed
+            continue
+
+        suffix = get_archive_suffix(pathlib.Path(entry.name))
+        if suffix is not None and entry.is_file():
+            names.append(entry.name[:-len(suffix)])
+        elif entry.is_dir() and (get_installed_versions(entry.name, root) or get_legacy_installation(entry.name, root)):
+            names.append(entry.name)
+
+    return names
+
+
+def _load_index(root: pathlib.Path | None) -> dict[str, dict[str, Any]] | None:
+    try:
+        with open(_get_boilerplates_dir(root) / INDEX_FILE, 'r') as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+    if not isinstance(data, dict):
+        return None
+
+    index = cast('dict[str, Any]', data)
+    if index.get('format') != INDEX_FORMAT:
+        return None
+
+    boilerplates = index.get('boilerplates')
+    return cast('dict[str, dict[str, Any]]', boilerplates) if isinstance(boilerplates, dict) else None
+
+
+def build_index(root: pathlib.Path | None = None) -> dict[str, dict[str, Any]]:
+    """Indexes the boilerplates installed in a Prept directory.
+
+    The index records installed versions and current version of each boilerplate
+    so that boilerplates can be resolved from the directory without scanning it.
+    This is intended for directories shared through ``PREPT_PATH``, which should
+    be re-indexed after being modified by other means than Prept commands.
+
+    Returns the index that was written.
+    """
+    bps_dir = _get_boilerplates_dir(root)
+    lock_dir = utils.get_prept_dir('locks') if root is None else root / 'locks'
+
+    # Index is built under a lock so the last build always reflects
+    # all modifications made before it.
+    with FileLock(lock_dir / '.index.lock'):
+        index: dict[str, dict[str, Any]] = {}
+
+        for name in _scan_names(root):
+            versions = get_installed_versions(name, root)
+            current = get_current_version(name, root)
+            legacy = get_legacy_installation(name, root)
+
+            if legacy is not None:
+                version = _get_legacy_version(legacy)
+                if version is not None:
+                    versions.setdefault(version, legacy)
+                    current = current or version
+
+            index[name.lower()] = {
+                'current': current,
+                'versions': {version: path.relative_to(bps_dir).as_posix() for version, path in versions.items()},
+            }
+
+        os.makedirs(bps_dir, exist_ok=True)
+        utils.write_atomic(bps_dir / INDEX_FILE, json.dumps({'format': INDEX_FORMAT, 'boilerplates': index}))
+
+    return index
+
+
+def refresh_index(root: pathlib.Path | None = None) -> None:
+    """Rebuilds the index of a Prept directory if the directory is indexed."""
+    if (_get_boilerplates_dir(root) / INDEX_FILE).exists():
+        build_index(root)
+
+
+def remove_index(root: pathlib.Path | None = None) -> bool:
+    """Removes the index of a Prept directory.
+
+    Returns whether the directory was indexed.
+    """
+    try:
+        os.remove(_get_boilerplates_dir(root) / INDEX_FILE)
+    except FileNotFoundError:
+        return False
+
+    return True
+
+
+def migrate_legacy_installation(name: str) -> None:
+    """Moves an unversioned installation of boilerplate to the versioned layout."""
+    legacy = get_legacy_installation(name)
+    if legacy is None:
+        return
+
+    from prept.boilerplate import BoilerplateInfo
+
+    bp = BoilerplateInfo.from_path(legacy)
+    bp.source.close()
+    version = get_version_key(bp.version)
+    bp_dir = get_installation_dir(name)
+
+    if legacy.is_dir():
+        temp = bp_dir.with_name(f'.{bp_dir.name}-migrating')
+        os.replace(bp_dir, temp)
+        os.makedirs(bp_dir / VERSIONS_DIRECTORY)
+        os.replace(temp, bp_dir / VERSIONS_DIRECTORY / version)
+    else:
+        suffix = get_archive_suffix(legacy)
+        assert suffix is not None
+        os.makedirs(bp_dir / VERSIONS_DIRECTORY, exist_ok=True)
+        os.replace(legacy, bp_dir / VERSIONS_DIRECTORY / (version + suffix))
+
+    set_current_version(name, version)
+
+
+def get_installation_target(boilerplate: BoilerplateInfo, suffix: str | None = None) -> pathlib.Path:
+    """Returns the path to install the given boilerplate version at."""
+    key = get_version_key(boilerplate.version)
+    return get_installation_dir(boilerplate.name) / VERSIONS_DIRECTORY / (key + (suffix or ''))
+
+
+def get_staging_path(target: pathlib.Path) -> pathlib.Path:
+    """Returns a unique hidden path next to target for staging its installation.
+
+    Hidden entries in versions directory are not considered installed versions.
+    """
+    return target.with_name(f'.staging-{uuid.uuid4().hex}-{target.name}')
+
+
+def publish_staged(staging: pathlib.Path, target: pathlib.Path, previous: pathlib.Path | None = None) -> pathlib.Path | None:
+    """Moves a staged installation in place of target.
+
+    If previous is given, the previous installation at this path is moved aside
+    first as directories cannot be replaced by rename. This also covers previous
+    installation being of a different kind (directory or archive format) than
+    the staged installation. The path previous installation was moved to is
+    returned and it is up to the caller to remove it.
+
+    If the staged installation cannot be moved, the previous installation is
+    restored and staged installation is removed.
+    """
+    backup = None
+    if previous is not None:
+        backup = previous.with_name(f'.previous-{uuid.uuid4().hex}-{previous.name}')
+        os.replace(previous, backup)
+
+    try:
+        os.replace(staging, target)
+    except BaseException:
+        if backup is not None:
+            assert previous is not None
+            os.replace(backup, previous)
+        if staging.is_dir():
+            shutil.rmtree(staging, ignore_errors=True)
+        else:
+            try:
+                os.remove(staging)
+            except OSError:
+                pass
+        raise
+
+    return backup
+
+
+def lock_installation(name: str, *, shared: bool = False) -> FileLock:
+    """Returns the lock of all installed versions of a boilerplate.
+
+    The returned lock is not acquired.
+    """
+    return FileLock(utils.get_prept_dir('locks', f'{name.lower()}.lock'), shared=shared)
+
+
+def lock_registry(*, shared: bool = False) -> FileLock:
+    """Returns the lock of installations registry and files store.
+
+    Installations hold the shared lock while adding files to store and
+    operations on all installations, such as collecting unreferenced
+    files from store, hold the exclusive lock. The returned lock is
+    not acquired.
+    """
+    return FileLock(utils.get_prept_dir('locks', '.registry.lock'), shared=shared)
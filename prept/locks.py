@@ -0,0 +1,122 @@
+# Copyright (C) Izhar Ahmad 2025-2026
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import os
+import pathlib
+import sys
+
+if sys.platform == 'win32':  # pragma: no cover
+    import msvcrt
+else:
+    import fcntl
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
+__all__ = (
+    'FileLock',
+)
+
+
+class FileLock:
+    """Advisory lock on a file shared between processes.
+
+    Shared locks can be held by multiple processes at the same time while an
+    exclusive lock excludes all other locks. Locks are released when the lock
+    is released or the holding process exits.
+
+    On platforms without support for shared locks (i.e. Windows), shared locks
+    behave as exclusive locks.
+
+    .. versionadded:: 0.2.0
+
+    Parameters
+    ~~~~~~~~~~
+    path: :class:`pathlib.Path`
+        The path of lock file. The file is created if it does not exist.
+    shared: :class:`bool`
+        Whether the lock is shared. Defaults to False.
+    """
+    def __init__(self, path: pathlib.Path, shared: bool = False) -> None:
+        self.path = path
+        self.shared = shared
+        self._fd: int | None = None
+
+    @property
+    def locked(self) -> bool:
+        """Whether the lock is currently held."""
+        return self._fd is not None
+
+    def _lock(self, fd: int, blocking: bool) -> bool:
+        if sys.platform != 'win32':
+            flags = fcntl.LOCK_SH if self.shared else fcntl.LOCK_EX
+            try:
+                fcntl.flock(fd, flags if blocking else flags | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return False
+            return True
+
+        while True:
+            try:
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+            except OSError:
+                if not blocking:
+                    return False
+                # LK_LOCK gives up after ten attempts so it is retried
+                # until the lock is acquired.
+                try:
+                    msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                except OSError:
+                    continue
+            return True
+
+    def acquire(self, blocking: bool = True) -> bool:
+        """Acquires the lock.
+
+        If blocking is false and the lock is held by another process, False is
+        returned without waiting. Otherwise, True is returned once the lock is
+        acquired.
+        """
+        if self._fd is not None:
+            raise RuntimeError('Lock is already acquired')
+
+        os.makedirs(self.path.parent, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o666)
+
+        try:
+            acquired = self._lock(fd, blocking)
+        except BaseException:
+            os.close(fd)
+            raise
+
+        if not acquired:
+            os.close(fd)
+            return False
+
+        self._fd = fd
+        return True
+
+    def release(self) -> None:
+        """Releases the lock. Does nothing if the lock is not held."""
+        if self._fd is None:
+            return
+
+        fd, self._fd = self._fd, None
+        try:
+            if sys.platform != 'win32':
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(fd)
+
+    def __enter__(self) -> Self:
+        self.acquire()
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.release()
@@ -2,33 +2,78 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, ClassVar
+from typing import TYPE_CHECKING, Any, Callable, ClassVar, Iterator
 from prept.errors import TemplateProviderNotFound, InvalidConfig, PreptCLIError
 
+import io
+import json
+import collections
 import string
 import pathlib
+import pathspec
 import importlib
 
 try:
     import jinja2
+    import jinja2.meta
 except ImportError:
     jinja2 = None
 
 _JINJA2_INSTALLED = jinja2 is not None
+_jinja_environment: Environment | None = None
+
+STREAMING_THRESHOLD = 16 * 1024 * 1024  # 16 MiB
 
 if TYPE_CHECKING:
+    from jinja2 import Environment, Template
+    from prept.boilerplate import BoilerplateInfo
     from prept.context import GenerationContext
     from prept.file import BoilerplateFile
 
 __all__ = (
+    'STREAMING_THRESHOLD',
     'resolve_template_provider',
     'get_prept_template_provider',
     'TemplateProvider',
     'StringTemplateProvider',
     'Jinja2TemplateProvider',
+    'TemplateProviderIndex',
 )
 
 
+def _get_jinja_environment() -> Environment:
+    global _jinja_environment
+    assert jinja2 is not None
+
+    if _jinja_environment is None:
+        _jinja_environment = jinja2.Environment()
+
+    return _jinja_environment
+
+
+def _new_jinja_context(temp: Template, context: GenerationContext) -> Any:
+    # Template.render() copies all variables into a new dictionary upfront,
+    # instead variables are looked up from the context when referenced so
+    # computed variables are only evaluated if template uses them.
+    return temp.new_context(collections.ChainMap(context.variables, temp.globals), shared=True)  # type: ignore
+
+
+def _render_jinja(temp: Template, context: GenerationContext) -> str:
+    ctx = _new_jinja_context(temp, context)
+    try:
+        return temp.environment.concat(temp.root_render_func(ctx))  # type: ignore
+    except Exception:
+        return temp.environment.handle_exception()
+
+
+def _generate_jinja(temp: Template, context: GenerationContext) -> Iterator[str]:
+    ctx = _new_jinja_context(temp, context)
+    try:
+        yield from temp.root_render_func(ctx)
+    except Exception:
+        yield temp.environment.handle_exception()
+
+
 def get_prept_template_provider(name: str) -> type[TemplateProvider] | None:
     """Prept's default template provider resolver.
 
@@ -160,8 +205,27 @@ class TemplateProvider:
         Class attribute.
 
         The name used to identify the template provider.
+    cacheable: :class:`bool`
+        Class attribute.
+
+        Whether the output of this provider only depends on the template
+        content and values of referenced template variables. Output of
+        cacheable providers can be stored in the :class:`RenderCache`.
+        Defaults to ``False``.
+
+        .. versionadded:: 0.2.0
+    artifact_version: :class:`str` | None
+        Class attribute.
+
+        The version of artifacts returned by :meth:`.compile_template`, such as
+        the version of underlying templating library. Precompiled artifacts are
+        recompiled when this changes. Defaults to ``None``.
+
+        .. versionadded:: 0.2.0
     """
     name: ClassVar[str]
+    cacheable: ClassVar[bool] = False
+    artifact_version: ClassVar[str | None] = None
 
     # This marker is used to check if given template provider inherits
     # from this base TemplateProvider class. Because resolve_template_provider()
@@ -200,6 +264,138 @@ class TemplateProvider:
         """
         raise NotImplementedError
 
+    def stream_content(self, file: BoilerplateFile, context: GenerationContext) -> Iterator[str | bytes]:
+        """Processes the file content in chunks.
+
+        This is the streaming equivalent of :meth:`.process_content` and is used
+        for template files larger than :data:`STREAMING_THRESHOLD`. Each yielded
+        chunk is written to the output file as soon as it is produced so the
+        rendered content is never held in memory in its entirety.
+
+        All yielded chunks must be of the same type. The default implementation
+        yields the whole result of :meth:`.process_content` as a single chunk.
+
+        .. versionadded:: 0.2.0
+
+        Parameters
+        ~~~~~~~~~~
+        file: :class:`BoilerplateFile`
+            The file to be processed.
+        context: :class:`GenerationContext`
+            The generation context containing generation time information.
+        """
+        yield self.process_content(file, context)
+
+    def find_variables(self, source: str) -> set[str] | None:
+        """Finds the names of template variables referenced by a template.
+
+        This is used by Prept to determine which template variables a template
+        file's content or a template path depends on. The ``source`` is either
+        the content of a template file or a template path.
+
+        Providers that cannot analyse their templates should return ``None``
+        (the default) in which case the template is conservatively regarded
+        as depending on every template variable.
+
+        .. versionadded:: 0.2.0
+
+        Parameters
+        ~~~~~~~~~~
+        source: :class:`str`
+            The template source to analyse.
+
+        Returns
+        ~~~~~~~
+        set[:class:`str`] | None
+            The set of referenced variable names or ``None`` if referenced
+            variables could not be determined.
+        """
+        return None
+
+    def is_static(self, source: str) -> bool:
+        """Checks whether rendering the given template leaves it unchanged.
+
+        Static templates are marked as copy-only when a boilerplate is precompiled
+        and are copied as-is at generation time without being processed by the
+        template provider.
+
+        The default implementation always returns ``False``.
+
+        .. versionadded:: 0.2.0
+
+        Parameters
+        ~~~~~~~~~~
+        source: :class:`str`
+            The content of template file.
+        """
+        return False
+
+    def compile_template(self, source: str) -> bytes | None:
+        """Precompiles the given template source.
+
+        This is called when a boilerplate is precompiled (at installation time
+        or through the ``prept compile`` command). The returned artifact is stored
+        alongside the boilerplate and passed to :meth:`.render_compiled` at
+        generation time.
+
+        Providers that do not support precompilation should return ``None``
+        (the default) in which case :meth:`.process_content` is used.
+
+        .. versionadded:: 0.2.0
+
+        Parameters
+        ~~~~~~~~~~
+        source: :class:`str`
+            The content of template file.
+
+        Returns
+        ~~~~~~~
+        :class:`bytes` | None
+            The precompiled artifact, if supported.
+        """
+        return None
+
+    def render_compiled(self, artifact: bytes, context: GenerationContext) -> str | bytes:
+        """Renders a template precompiled by :meth:`.compile_template`.
+
+        This must be implemented if :meth:`.compile_template` is implemented.
+
+        .. versionadded:: 0.2.0
+
+        Parameters
+        ~~~~~~~~~~
+        artifact: :class:`bytes`
+            The artifact returned by :meth:`.compile_template`.
+        context: :class:`GenerationContext`
+            The generation context containing generation time information.
+        """
+        raise NotImplementedError
+
+    def get_renderer(self, file: BoilerplateFile, artifact: bytes | None = None) -> Callable[[GenerationContext], str | bytes]:
+        """Returns a function that renders the given template file.
+
+        This is used when the same template is rendered many times with different
+        variables, such as for :attr:`~BoilerplateInfo.fanout_files`. The returned
+        function takes the :class:`GenerationContext` and returns the rendered content.
+
+        Providers should override this method to parse or load the template once and
+        reuse it across calls. The default implementation calls :meth:`.render_compiled`
+        if an artifact is given and :meth:`.process_content` otherwise.
+
+        .. versionadded:: 0.2.0
+
+        Parameters
+        ~~~~~~~~~~
+        file: :class:`BoilerplateFile`
+            The template file.
+        artifact: :class:`bytes` | None
+            The artifact returned by :meth:`.compile_template` for this file, if any.
+        """
+        if artifact is not None:
+            return lambda context: self.render_compiled(artifact, context)
+
+        return lambda context: self.process_content(file, context)
+
 
 class StringTemplateProvider(TemplateProvider):
     """$-substitutions based templates by :class:`string.Template`.
@@ -211,6 +407,7 @@ class StringTemplateProvider(TemplateProvider):
     """
 
     name = 'stringsub'
+    cacheable = True
 
     def process_path(self, path: pathlib.Path, context: GenerationContext) -> pathlib.Path:
         updated = string.Template(str(path)).safe_substitute(context.variables)
@@ -220,6 +417,76 @@ class StringTemplateProvider(TemplateProvider):
         content = file.read()
         return string.Template(content).safe_substitute(context.variables)
 
+    def stream_content(self, file: BoilerplateFile, context: GenerationContext) -> Iterator[str | bytes]:
+        # Placeholders cannot span multiple lines so substituting line
+        # by line produces the same result as substituting whole content.
+        variables = context.variables
+        with io.TextIOWrapper(file.open()) as f:
+            for line in f:
+                yield string.Template(line).safe_substitute(variables)
+
+    def find_variables(self, source: str) -> set[str] | None:
+        names: set[str] = set()
+        for match in string.Template.pattern.finditer(source):
+            name = match.group('named') or match.group('braced')
+            if name is not None:
+                names.add(name)
+
+        return names
+
+    def is_static(self, source: str) -> bool:
+        # string.Template.pattern also matches $$ escapes and invalid
+        # placeholders so this is slightly conservative.
+        return string.Template.pattern.search(source) is None
+
+    def compile_template(self, source: str) -> bytes | None:
+        # The template is stored as a list of segments where strings are
+        # literals and [name, raw] pairs are placeholders.
+        segments: list[str | list[str]] = []
+        last = 0
+
+        for match in string.Template.pattern.finditer(source):
+            start, end = match.span()
+            literal = source[last:start]
+            name = match.group('named') or match.group('braced')
+
+            if name is not None:
+                segments.append(literal)
+                segments.append([name, match.group()])
+            elif match.group('escaped') is not None:
+                segments.append(literal + '$')
+            else:
+                segments.append(literal + match.group())
+
+            last = end
+
+        segments.append(source[last:])
+        return json.dumps([s for s in segments if s]).encode()
+
+    def _render_segments(self, segments: list[Any], context: GenerationContext) -> str:
+        variables = context.variables
+        parts: list[str] = []
+
+        for segment in segments:
+            if isinstance(segment, str):
+                parts.append(segment)
+            else:
+                name, raw = segment
+                parts.append(str(variables[name]) if name in variables else raw)
+
+        return ''.join(parts)
+
+    def render_compiled(self, artifact: bytes, context: GenerationContext) -> str | bytes:
+        return self._render_segments(json.loads(artifact), context)
+
+    def get_renderer(self, file: BoilerplateFile, artifact: bytes | None = None) -> Callable[[GenerationContext], str | bytes]:
+        if artifact is None:
+            artifact = self.compile_template(file.read())
+            assert artifact is not None
+
+        segments = json.loads(artifact)
+        return lambda context: self._render_segments(segments, context)
+
 
 class Jinja2TemplateProvider(TemplateProvider):
     """Provider based on Jinja2 templates.
@@ -259,12 +526,17 @@ class Jinja2TemplateProvider(TemplateProvider):
     """
 
     name = 'jinja2'
+    cacheable = True
+
+    # Artifacts are Python code generated by Jinja which may not be
+    # compatible with other versions of Jinja.
+    artifact_version = None if jinja2 is None else jinja2.__version__
 
     def process_path(self, path: pathlib.Path, context: GenerationContext) -> pathlib.Path:
         assert jinja2 is not None  # this never fails
         temp = jinja2.Template(str(path))
 
-        return pathlib.Path(temp.render(context.variables))
+        return pathlib.Path(_render_jinja(temp, context))
 
     def process_content(self, file: BoilerplateFile, context: GenerationContext) -> str | bytes:
         assert jinja2 is not None
@@ -272,4 +544,115 @@ class Jinja2TemplateProvider(TemplateProvider):
         src = file.read()
         temp = jinja2.Template(src)
         
-        return temp.render(context.variables)
+        return _render_jinja(temp, context)
+
+    def stream_content(self, file: BoilerplateFile, context: GenerationContext) -> Iterator[str | bytes]:
+        assert jinja2 is not None
+
+        temp = jinja2.Template(file.read())
+        yield from _generate_jinja(temp, context)
+
+    def find_variables(self, source: str) -> set[str] | None:
+        assert jinja2 is not None
+
+        env = jinja2.Environment()
+        try:
+            ast = env.parse(source)
+        except jinja2.TemplateSyntaxError:
+            # Invalid templates fail at render time anyway, there is no
+            # reliable way to analyse them here.
+            return None
+
+        return set(jinja2.meta.find_undeclared_variables(ast))
+
+    def is_static(self, source: str) -> bool:
+        assert jinja2 is not None
+
+        env = _get_jinja_environment()
+        if any(delim in source for delim in (env.block_start_string, env.variable_start_string, env.comment_start_string)):
+            return False
+
+        # Jinja strips a single trailing newline while rendering.
+        return env.keep_trailing_newline or not source.endswith('\n')
+
+    def compile_template(self, source: str) -> bytes | None:
+        assert jinja2 is not None
+
+        try:
+            code = _get_jinja_environment().compile(source, raw=True)
+        except jinja2.TemplateSyntaxError:
+            return None
+
+        return code.encode()
+
+    def _load_compiled(self, artifact: bytes) -> Template:
+        assert jinja2 is not None
+
+        env = _get_jinja_environment()
+        code = compile(artifact.decode(), '<template>', 'exec')
+        return env.template_class.from_code(env, code, env.make_globals(None))
+
+    def render_compiled(self, artifact: bytes, context: GenerationContext) -> str | bytes:
+        return _render_jinja(self._load_compiled(artifact), context)
+
+    def get_renderer(self, file: BoilerplateFile, artifact: bytes | None = None) -> Callable[[GenerationContext], str | bytes]:
+        assert jinja2 is not None
+
+        temp = jinja2.Template(file.read()) if artifact is None else self._load_compiled(artifact)
+        return lambda context: _render_jinja(temp, context)
+
+
+class TemplateProviderIndex:
+    """Index of template providers used for the files of a boilerplate.
+
+    Files are dispatched to providers given by :attr:`BoilerplateInfo.template_providers`
+    using a single compiled pattern index, falling back to :attr:`BoilerplateInfo.template_provider`
+    for files that match no pattern. Each provider is instantiated once.
+
+    .. versionadded:: 0.2.0
+
+    Parameters
+    ~~~~~~~~~~
+    boilerplate: :class:`BoilerplateInfo`
+        The boilerplate to index providers of.
+
+    Attributes
+    ~~~~~~~~~~
+    default: :class:`TemplateProvider` | None
+        The provider used for files that do not match any pattern.
+    """
+    def __init__(self, boilerplate: BoilerplateInfo) -> None:
+        instances: dict[type[TemplateProvider], TemplateProvider] = {}
+
+        def get_instance(provider: type[TemplateProvider]) -> TemplateProvider:
+            if provider not in instances:
+                instances[provider] = provider()
+            return instances[provider]
+
+        self.default = get_instance(boilerplate.template_provider) if boilerplate.template_provider else None
+        self._patterns = [get_instance(provider) for provider in boilerplate.template_providers.values()]
+        self._spec = pathspec.PathSpec.from_lines('gitwildmatch', boilerplate.template_providers) if self._patterns else None
+        self._instances = list(instances.values())
+
+    def __bool__(self) -> bool:
+        return bool(self._instances)
+
+    @property
+    def providers(self) -> list[TemplateProvider]:
+        """The list of all provider instances in this index."""
+        return self._instances.copy()
+
+    def get(self, file: pathlib.Path | str) -> TemplateProvider | None:
+        """Returns the provider for the given file.
+
+        Parameters
+        ~~~~~~~~~~
+        file: :class:`pathlib.Path` | :class:`str`
+            The path of file, relative to boilerplate directory.
+        """
+        if self._spec is not None:
+            result = self._spec.check_file(file)
+            if result.index is not None and result.include:
+                return self._patterns[result.index]
+
+        return self.default
@@ -0,0 +1,369 @@
+# Copyright (C) Izhar Ahmad 2025-2026
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, BinaryIO, Iterator, Literal
+
+import io
+import os
+import time
+import shutil
+import pathlib
+import tarfile
+import zipfile
+import tempfile
+
+if TYPE_CHECKING:
+    from types import TracebackType
+    from typing_extensions import Self
+
+__all__ = (
+    'OutputSink',
+    'FilesystemSink',
+    'StagedFilesystemSink',
+    'MemorySink',
+    'TarSink',
+    'ZipSink',
+)
+
+# Streamed content larger than this is spooled to disk before being
+# added to tar archives as tar headers require size of content upfront.
+_SPOOL_MAX_SIZE = 16 * 1024 * 1024  # 16 MiB
+
+_TAR_STREAM_MODES: dict[str, Literal['w|', 'w|gz', 'w|bz2', 'w|xz']] = {
+    '': 'w|',
+    'gz': 'w|gz',
+    'bz2': 'w|bz2',
+    'xz': 'w|xz',
+}
+
+
+def _encode(content: str | bytes) -> bytes:
+    return content.encode('utf-8') if isinstance(content, str) else content
+
+
+class OutputSink:
+    """Base class for outputs that generated files are written to.
+
+    All paths passed to sink methods are relative to the root of generated
+    project and use forward slashes as separator.
+
+    Sinks can be used as context managers, in which case :meth:`.close` is
+    called on exit. If an error occurs, :meth:`.discard` is called instead.
+
+    .. versionadded:: 0.2.0
+    """
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc: BaseException | None, tb: TracebackType | None) -> None:
+        if exc is None:
+            self.close()
+        else:
+            self.discard()
+
+    def copy(self, path: str, source: pathlib.Path) -> None:
+        """Copies the given source file to the path in output.
+
+        The default implementation reads the source file and passes
+        its content to :meth:`.write`.
+
+        Parameters
+        ~~~~~~~~~~
+        path: :class:`str`
+            The relative path of file in output.
+        source: :class:`pathlib.Path`
+            The path of file to copy.
+        """
+        self.write(path, source.read_bytes(), source=source)
+
+    def write(self, path: str, content: str | bytes, *, source: pathlib.Path | None = None) -> None:
+        """Writes the content to the path in output.
+
+        Text content is encoded as UTF-8 unless the sink specifies otherwise.
+        Subclasses must implement this method.
+
+        Parameters
+        ~~~~~~~~~~
+        path: :class:`str`
+            The relative path of file in output.
+        content: :class:`str` | :class:`bytes`
+            The content of file.
+        source: :class:`pathlib.Path` | None
+            The boilerplate file that content was rendered from. Sinks may use
+            this to preserve file permissions.
+        """
+        raise NotImplementedError
+
+    def write_stream(self, path: str, chunks: Iterator[str | bytes], *, source: pathlib.Path | None = None) -> None:
+        """Writes the content yielded in chunks to the path in output.
+
+        This is used for content rendered through :meth:`TemplateProvider.stream_content`.
+        The default implementation joins the chunks and passes them to :meth:`.write`.
+
+        Parameters
+        ~~~~~~~~~~
+        path: :class:`str`
+            The relative path of file in output.
+        chunks:
+            The iterator yielding the chunks of content.
+        source: :class:`pathlib.Path` | None
+            The boilerplate file that content was rendered from.
+        """
+        self.write(path, b''.join(_encode(chunk) for chunk in chunks), source=source)
+
+    def close(self) -> None:
+        """Finalizes the output once all files have been written.
+
+        The default implementation does nothing.
+        """
+
+    def discard(self) -> None:
+        """Cleans up the output when generation fails.
+
+        The default implementation calls :meth:`.close`.
+        """
+        self.close()
+
+
+class FilesystemSink(OutputSink):
+    """Output sink that writes files to a directory.
+
+    This is the sink used by :program:`prept new` by default. Text content
+    is written using the platform's default encoding.
+
+    .. versionadded:: 0.2.0
+
+    Parameters
+    ~~~~~~~~~~
+    directory: :class:`pathlib.Path`
+        The directory to write files in.
+    """
+    def __init__(self, directory: pathlib.Path) -> None:
+        self.directory = directory
+
+    def _prepare(self, path: str) -> pathlib.Path:
+        target = self.directory / path
+        os.makedirs(target.parent, exist_ok=True)
+        return target
+
+    def copy(self, path: str, source: pathlib.Path) -> None:
+        shutil.copy2(source, self._prepare(path))
+
+    def write(self, path: str, content: str | bytes, *, source: pathlib.Path | None = None) -> None:
+        target = self._prepare(path)
+        mode = 'wb' if isinstance(content, bytes) else 'w'
+
+        with open(target, mode) as f:
+            f.write(content)
+
+        if source is not None:
+            shutil.copymode(source, target)
+
+    def write_stream(self, path: str, chunks: Iterator[str | bytes], *, source: pathlib.Path | None = None) -> None:
+        target = self._prepare(path)
+
+        # File is opened on first chunk as the mode depends on type of chunks.
+        f = None
+        try:
+            for chunk in chunks:
+                if f is None:
+                    f = open(target, 'wb' if isinstance(chunk, bytes) else 'w')
+                f.write(chunk)  # type: ignore
+        finally:
+            if f is not None:
+                f.close()
+
+        if f is None:
+            # No chunks produced, rendered content is empty.
+            open(target, 'w').close()
+
+        if source is not None:
+            shutil.copymode(source, target)
+
+
+class StagedFilesystemSink(FilesystemSink):
+    """Output sink that writes files to a staging directory and publishes them on close.
+
+    The staging directory is created next to the target directory so that both
+    are on the same file system. If the target directory does not exist, the
+    staging directory is renamed to it which publishes all files at once.
+    Otherwise, staged files are moved into the target directory one by one,
+    overwriting existing files.
+
+    If generation fails, the staging directory is removed and target directory
+    is left untouched.
+
+    .. versionadded:: 0.2.0
+
+    Parameters
+    ~~~~~~~~~~
+    target: :class:`pathlib.Path`
+        The directory to publish files to. The parent of this directory
+        must exist.
+    resumable: :class:`bool`
+        Whether the staging directory is kept when generation fails so that
+        it can be resumed later. Resumable sinks use a fixed staging directory
+        (``.<target>.prept-partial`` next to target directory) which is reused
+        if it already exists. Defaults to False.
+
+    Attributes
+    ~~~~~~~~~~
+    directory: :class:`pathlib.Path`
+        The staging directory that files are written to.
+    target: :class:`pathlib.Path`
+        The directory that files are published to.
+    resumable: :class:`bool`
+        Whether the staging directory is kept when generation fails.
+    """
+    def __init__(self, target: pathlib.Path, *, resumable: bool = False) -> None:
+        self.target = target
+        self.resumable = resumable
+
+        if resumable:
+            staging = self._get_resumable_directory(target)
+            os.makedirs(staging, exist_ok=True)
+            super().__init__(staging)
+            return
+
+        staging = tempfile.mkdtemp(dir=target.absolute().parent, prefix=f'.{target.name}-staging-')
+
+        # mkdtemp() creates the directory accessible only by the owner. As it
+        # becomes the target directory, it is given the usual permissions.
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(staging, 0o777 & ~umask)
+
+        super().__init__(pathlib.Path(staging))
+
+    @staticmethod
+    def _get_resumable_directory(target: pathlib.Path) -> pathlib.Path:
+        return target.absolute().parent / f'.{target.name}.prept-partial'
+
+    def _publish_into(self, source: pathlib.Path, target: pathlib.Path) -> None:
+        for entry in os.scandir(source):
+            destination = target / entry.name
+            if entry.is_dir(follow_symlinks=False) and destination.is_dir() and not destination.is_symlink():
+                self._publish_into(pathlib.Path(entry.path), destination)
+            else:
+                # Directories not present in target are moved as a whole.
+                os.replace(entry.path, destination)
+
+    def close(self) -> None:
+        if not self.directory.exists():
+            return
+
+        try:
+            if self.target.exists():
+                self._publish_into(self.directory, self.target)
+            else:
+                os.replace(self.directory, self.target)
+        finally:
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+    def discard(self) -> None:
+        if not self.resumable:
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+
+class MemorySink(OutputSink):
+    """Output sink that keeps generated files in memory.
+
+    .. versionadded:: 0.2.0
+
+    Attributes
+    ~~~~~~~~~~
+    files: dict[:class:`str`, :class:`bytes`]
+        The mapping of relative paths to content of generated files.
+    """
+    def __init__(self) -> None:
+        self.files: dict[str, bytes] = {}
+
+    def write(self, path: str, content: str | bytes, *, source: pathlib.Path | None = None) -> None:
+        self.files[path] = _encode(content)
+
+
+class TarSink(OutputSink):
+    """Output sink that writes generated files to a tar archive.
+
+    The archive is written in streaming mode so the file object does not
+    need to be seekable and can be, for example, a socket or response stream.
+    The file object is not closed by the sink.
+
+    .. versionadded:: 0.2.0
+
+    Parameters
+    ~~~~~~~~~~
+    fileobj:
+        The binary file object to write archive to.
+    compression: :class:`str`
+        The compression to use. Either ``gz``, ``bz2``, ``xz`` or an empty
+        string for no compression. Defaults to ``gz``.
+    """
+    def __init__(self, fileobj: BinaryIO, compression: str = 'gz') -> None:
+        if compression not in _TAR_STREAM_MODES:
+            raise ValueError(f'unsupported compression {compression!r}')
+
+        self.fileobj = fileobj
+        self._tar = tarfile.open(fileobj=fileobj, mode=_TAR_STREAM_MODES[compression])
+
+    def _add(self, path: str, size: int, content: BinaryIO, source: pathlib.Path | None) -> None:
+        info = tarfile.TarInfo(path)
+        info.size = size
+        info.mtime = int(time.time())
+        info.mode = 0o644 if source is None else (source.stat().st_mode & 0o777)
+        self._tar.addfile(info, content)
+
+    def copy(self, path: str, source: pathlib.Path) -> None:
+        self._tar.add(source, arcname=path, recursive=False)
+
+    def write(self, path: str, content: str | bytes, *, source: pathlib.Path | None = None) -> None:
+        data = _encode(content)
+        self._add(path, len(data), io.BytesIO(data), source)
+
+    def write_stream(self, path: str, chunks: Iterator[str | bytes], *, source: pathlib.Path | None = None) -> None:
+        with tempfile.SpooledTemporaryFile(max_size=_SPOOL_MAX_SIZE) as f:
+            for chunk in chunks:
+                f.write(_encode(chunk))
+
+            size = f.tell()
+            f.seek(0)
+            self._add(path, size, f, source)  # type: ignore
+
+    def close(self) -> None:
+        self._tar.close()
+
+
+class ZipSink(OutputSink):
+    """Output sink that writes generated files to a zip archive.
+
+    The file object does not need to be seekable and is not closed by
+    the sink.
+
+    .. versionadded:: 0.2.0
+
+    Parameters
+    ~~~~~~~~~~
+    fileobj:
+        The binary file object to write archive to.
+    compression: :class:`int`
+        The compression method to use, one of the constants from :mod:`zipfile`.
+        Defaults to :data:`zipfile.ZIP_DEFLATED`.
+    """
+    def __init__(self, fileobj: BinaryIO, compression: int = zipfile.ZIP_DEFLATED) -> None:
+        self.fileobj = fileobj
+        self._zip = zipfile.ZipFile(fileobj, mode='w', compression=compression)
+
+    def copy(self, path: str, source: pathlib.Path) -> None:
+        self._zip.write(source, arcname=path)
+
+    def write(self, path: str, content: str | bytes, *, source: pathlib.Path | None = None) -> None:
+        self._zip.writestr(path, _encode(content))
+
+    def write_stream(self, path: str, chunks: Iterator[str | bytes], *, source: pathlib.Path | None = None) -> None:
+        with self._zip.open(path, mode='w', force_zip64=True) as f:
+            for chunk in chunks:
+                f.write(_encode(chunk))
+
+    def close(self) -> None:
+        self._zip.close()
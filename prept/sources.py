@@ -0,0 +1,371 @@
+# Copyright (C) Izhar Ahmad 2025-2026
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, BinaryIO, Callable, Iterable, Iterator
+
+import io
+import os
+import mmap
+import struct
+import pathlib
+import tarfile
+import zipfile
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
+__all__ = (
+    'BoilerplateSource',
+    'DirectorySource',
+    'ZipSource',
+    'TarSource',
+)
+
+MMAP_THRESHOLD = 1024 * 1024  # 1 MiB
+ZIP_SUFFIXES = ('.zip',)
+TAR_SUFFIXES = ('.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tbz2', '.tar.xz', '.txz')
+ARCHIVE_SUFFIXES = ZIP_SUFFIXES + TAR_SUFFIXES
+
+# Fixed size part of zip local file header, followed by file name and extra field.
+_ZIP_LOCAL_HEADER = struct.Struct('<4s2B4HL2L2H')
+
+
+def _has_suffix(path: pathlib.Path, suffixes: tuple[str, ...]) -> bool:
+    return path.name.lower().endswith(suffixes)
+
+
+def get_archive_suffix(path: pathlib.Path) -> str | None:
+    name = path.name.lower()
+    for suffix in sorted(ARCHIVE_SUFFIXES, key=len, reverse=True):
+        if name.endswith(suffix):
+            return suffix
+
+    return None
+
+
+def _find_prefix(names: set[str]) -> str:
+    # Archives commonly contain a single top level directory that holds
+    # the boilerplate so that is supported as well.
+    if 'preptconfig.json' in names:
+        return ''
+
+    candidates = {name.split('/', 1)[0] for name in names if name.count('/') == 1 and name.endswith('/preptconfig.json')}
+    if len(candidates) == 1:
+        return candidates.pop() + '/'
+
+    return ''
+
+
+def _prune_paths(paths: Iterable[str], prune: Callable[[str], bool] | None) -> Iterator[str]:
+    # Archive indexes are flat so pruning decisions are cached per directory
+    # and each directory is only passed to prune() once.
+    if prune is None:
+        yield from paths
+        return
+
+    pruned: dict[str, bool] = {'': False}
+
+    def is_pruned(directory: str) -> bool:
+        result = pruned.get(directory)
+        if result is None:
+            result = pruned[directory] = is_pruned(directory.rpartition('/')[0]) or prune(directory)
+        return result
+
+    for path in paths:
+        if not is_pruned(path.rpartition('/')[0]):
+            yield path
+
+
+class BoilerplateSource:
+    """Base class for sources that boilerplate files are read from.
+
+    Boilerplate sources abstract away the storage of a boilerplate's files
+    so that boilerplates can be loaded, walked and generated from without
+    necessarily being present as a directory on file system.
+
+    All paths passed to source methods are relative to the root of boilerplate
+    (the location of ``preptconfig.json``) and use forward slashes as separator.
+
+    Custom sources can be passed to :class:`BoilerplateInfo` by subclassing this
+    class and implementing :meth:`.walk`, :meth:`.exists`, :meth:`.get_size` and
+    :meth:`.open`.
+
+    .. versionadded:: 0.2.0
+
+    Attributes
+    ~~~~~~~~~~
+    path: :class:`pathlib.Path`
+        The path of boilerplate directory or archive.
+    """
+    def __init__(self, path: pathlib.Path) -> None:
+        self.path = path
+
+    @classmethod
+    def from_path(cls, path: pathlib.Path) -> BoilerplateSource:
+        """Returns the built-in source suitable for the given path.
+
+        Files with zip or tar extensions are opened as :class:`ZipSource` or
+        :class:`TarSource` respectively. All other paths are treated as
+        directories.
+        """
+        if path.is_file():
+            if _has_suffix(path, ZIP_SUFFIXES):
+                return ZipSource(path)
+            if _has_suffix(path, TAR_SUFFIXES):
+                return TarSource(path)
+
+        return DirectorySource(path)
+
+    def walk(self, prune: Callable[[str], bool] | None = None) -> Iterator[str]:
+        """Iterates over paths of all files in the source.
+
+        Subclasses must implement this method.
+
+        .. versionchanged:: 0.2.0
+            Added the ``prune`` parameter.
+
+        Parameters
+        ~~~~~~~~~~
+        prune:
+            The function called with the path of each directory that returns
+            whether the directory should be skipped. Files in skipped directories
+            are not yielded and subdirectories of skipped directories are not
+            passed to this function.
+        """
+        raise NotImplementedError
+
+    def exists(self, path: str) -> bool:
+        """Checks whether the given file exists in the source.
+
+        Subclasses must implement this method.
+        """
+        raise NotImplementedError
+
+    def get_size(self, path: str) -> int:
+        """Returns the size of given file in bytes.
+
+        Subclasses must implement this method.
+        """
+        raise NotImplementedError
+
+    def open(self, path: str) -> BinaryIO:
+        """Opens the given file for reading in binary mode.
+
+        Raises :class:`FileNotFoundError` if the file does not exist.
+        Subclasses must implement this method.
+        """
+        raise NotImplementedError
+
+    def read_view(self, path: str) -> memoryview:
+        """Reads the content of given file.
+
+        Sources may return views over memory-mapped content to avoid copying
+        it. The default implementation reads the file opened by :meth:`.open`.
+        """
+        with self.open(path) as f:
+            return memoryview(f.read())
+
+    def read_text(self, path: str) -> str:
+        """Reads the content of given file as text.
+
+        The content is decoded the same way as opening the file in text mode.
+        """
+        with io.TextIOWrapper(self.open(path)) as f:
+            return f.read()
+
+    def get_local_path(self, path: str) -> pathlib.Path | None:
+        """Returns the path of given file on file system.
+
+        ``None`` is returned if the file is not present on file system as
+        is, such as files inside archives. This is the default behaviour.
+        """
+        return None
+
+    def get_import_path(self) -> str | None:
+        """Returns the entry to add to :data:`sys.path` for importing modules from the source.
+
+        This is used for resolving engines and template providers defined
+        inside the boilerplate. Defaults to ``None``, meaning that modules
+        cannot be imported from the source.
+        """
+        return None
+
+    def close(self) -> None:
+        """Releases any resources held by the source.
+
+        The default implementation does nothing.
+        """
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+
+class DirectorySource(BoilerplateSource):
+    """Boilerplate source for a directory on file system.
+
+    Files larger than 1 MiB are memory-mapped when read.
+
+    .. versionadded:: 0.2.0
+    """
+    def walk(self, prune: Callable[[str], bool] | None = None) -> Iterator[str]:
+        for root, dirs, files in os.walk(self.path, followlinks=True):
+            rel = pathlib.Path(root).relative_to(self.path)
+            if prune is not None:
+                # Pruned directories are removed in place so os.walk()
+                # does not descend into them.
+                dirs[:] = [d for d in dirs if not prune((rel / d).as_posix())]
+            for name in files:
+                yield (rel / name).as_posix()
+
+    def exists(self, path: str) -> bool:
+        return (self.path / path).is_file()
+
+    def get_size(self, path: str) -> int:
+        return os.path.getsize(self.path / path)
+
+    def open(self, path: str) -> BinaryIO:
+        return open(self.path / path, 'rb')
+
+    def read_view(self, path: str) -> memoryview:
+        with open(self.path / path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < MMAP_THRESHOLD:
+                return memoryview(f.read())
+
+            # The map is unmapped once the view (and views derived from
+            # it) are released.
+            return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def get_local_path(self, path: str) -> pathlib.Path | None:
+        return self.path / path
+
+    def get_import_path(self) -> str | None:
+        return str(self.path.absolute())
+
+
+class ZipSource(BoilerplateSource):
+    """Boilerplate source for a zip archive.
+
+    The archive is memory-mapped and files are looked up through the index
+    built from the archive's central directory. Files stored without
+    compression are read directly from the mapped archive without copying.
+
+    The boilerplate may be at the root of archive or inside a single top
+    level directory. Modules inside zip archives can be imported by engines
+    and template providers.
+
+    .. versionadded:: 0.2.0
+    """
+    def __init__(self, path: pathlib.Path) -> None:
+        super().__init__(path)
+
+        self._file = open(path, 'rb')
+        try:
+            self._zip = zipfile.ZipFile(self._file)
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except BaseException:
+            self._file.close()
+            raise
+
+        names = {info.filename for info in self._zip.infolist() if not info.is_dir()}
+        self._prefix = _find_prefix(names)
+        self._index = {
+            info.filename[len(self._prefix):]: info
+            for info in self._zip.infolist()
+            if not info.is_dir() and info.filename.startswith(self._prefix)
+        }
+
+    def _get_info(self, path: str) -> zipfile.ZipInfo:
+        try:
+            return self._index[path]
+        except KeyError:
+            raise FileNotFoundError(f'{path!r} does not exist in {self.path}') from None
+
+    def walk(self, prune: Callable[[str], bool] | None = None) -> Iterator[str]:
+        yield from _prune_paths(self._index, prune)
+
+    def exists(self, path: str) -> bool:
+        return path in self._index
+
+    def get_size(self, path: str) -> int:
+        return self._get_info(path).file_size
+
+    def open(self, path: str) -> BinaryIO:
+        return self._zip.open(self._get_info(path))  # type: ignore
+
+    def read_view(self, path: str) -> memoryview:
+        info = self._get_info(path)
+        if info.compress_type != zipfile.ZIP_STORED or info.flag_bits & 0x1:
+            return memoryview(self._zip.read(info))
+
+        # The name and extra field lengths in local header can differ
+        # from the ones in central directory.
+        header = _ZIP_LOCAL_HEADER.unpack_from(self._mmap, info.header_offset)
+        start = info.header_offset + _ZIP_LOCAL_HEADER.size + header[-2] + header[-1]
+        return memoryview(self._mmap)[start:start + info.file_size]
+
+    def get_import_path(self) -> str | None:
+        return str(self.path.absolute() / self._prefix) if self._prefix else str(self.path.absolute())
+
+    def close(self) -> None:
+        self._zip.close()
+        try:
+            self._mmap.close()
+        except BufferError:
+            # Views over the map are still alive, it is unmapped once
+            # they are garbage collected.
+            pass
+        self._file.close()
+
+
+class TarSource(BoilerplateSource):
+    """Boilerplate source for a tar archive.
+
+    Uncompressed and gzip, bzip2 or xz compressed archives are supported. Note
+    that reading files from compressed tar archives requires decompressing the
+    archive up to the file so zip archives should be preferred for large
+    boilerplates.
+
+    The boilerplate may be at the root of archive or inside a single top
+    level directory.
+
+    .. versionadded:: 0.2.0
+    """
+    def __init__(self, path: pathlib.Path) -> None:
+        super().__init__(path)
+
+        self._tar = tarfile.open(path, 'r')
+        members = {member.name: member for member in self._tar.getmembers() if member.isfile()}
+        self._prefix = _find_prefix(set(members))
+        self._index = {
+            name[len(self._prefix):]: member
+            for name, member in members.items()
+            if name.startswith(self._prefix)
+        }
+
+    def _get_member(self, path: str) -> tarfile.TarInfo:
+        try:
+            return self._index[path]
+        except KeyError:
+            raise FileNotFoundError(f'{path!r} does not exist in {self.path}') from None
+
+    def walk(self, prune: Callable[[str], bool] | None = None) -> Iterator[str]:
+        yield from _prune_paths(self._index, prune)
+
+    def exists(self, path: str) -> bool:
+        return path in self._index
+
+    def get_size(self, path: str) -> int:
+        return self._get_member(path).size
+
+    def open(self, path: str) -> BinaryIO:
+        f = self._tar.extractfile(self._get_member(path))
+        assert f is not None
+        return f  # type: ignore
+
+    def close(self) -> None:
+        self._tar.close()
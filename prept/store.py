@@ -0,0 +1,268 @@
+# Copyright (C) Izhar Ahmad 2025-2026
+
+from __future__ import annotations
+
+from typing import IO, TYPE_CHECKING, Any, Iterable, cast
+from prept import utils
+
+import os
+import json
+import stat
+import shutil
+import hashlib
+import pathlib
+import tempfile
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
+__all__ = (
+    'BlobStore',
+    'InstallationManifest',
+)
+
+MANIFEST_PATH = pathlib.Path('.prept', 'manifest.json')
+MANIFEST_FORMAT = 1
+
+_HASH_CHUNK_SIZE = 1024 * 1024  # 1 MiB
+
+
+def _hash_file(path: pathlib.Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while chunk := f.read(_HASH_CHUNK_SIZE):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+class InstallationManifest:
+    """Manifest of files of an installed boilerplate.
+
+    The manifest maps the path of each installed file to the hash of its
+    content and its permission bits, which together identify the blob in
+    :class:`BlobStore` that the file is linked to.
+
+    The manifest is stored at ``.prept/manifest.json`` in the installation
+    directory.
+
+    .. versionadded:: 0.2.0
+
+    Attributes
+    ~~~~~~~~~~
+    files: dict[:class:`str`, tuple[:class:`str`, :class:`int`]]
+        The mapping of relative file paths to their content hash and permission bits.
+    origin: dict[:class:`str`, Any] | None
+        The origin of boilerplates installed from git repositories. This contains
+        the ``url`` of repository, the installed ``ref`` (``None`` for default branch)
+        and the resolved ``commit`` SHA.
+    """
+    def __init__(self, files: dict[str, tuple[str, int]] | None = None, origin: dict[str, Any] | None = None) -> None:
+        self.files = files or {}
+        self.origin = origin
+
+    @classmethod
+    def load(cls, directory: pathlib.Path) -> Self | None:
+        """Loads the manifest of given installation directory.
+
+        Returns ``None`` if the manifest does not exist or is invalid.
+        """
+        try:
+            with open(directory / MANIFEST_PATH, 'r') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+        if not isinstance(data, dict):
+            return None
+
+        manifest = cast('dict[str, Any]', data)
+        if manifest.get('format') != MANIFEST_FORMAT:
+            return None
+
+        try:
+            entries = cast('dict[str, Any]', manifest['files'])
+            files = {path: (digest, int(mode)) for path, (digest, mode) in entries.items()}
+        except (KeyError, TypeError, ValueError, AttributeError):
+            return None
+
+        origin = manifest.get('origin')
+        return cls(files, cast('dict[str, Any]', origin) if isinstance(origin, dict) else None)
+
+    def save(self, directory: pathlib.Path) -> None:
+        """Stores the manifest in the given installation directory."""
+        path = directory / MANIFEST_PATH
+        os.makedirs(path.parent, exist_ok=True)
+
+        data = {
+            'format': MANIFEST_FORMAT,
+            'files': {path: [digest, mode] for path, (digest, mode) in self.files.items()},
+            'origin': self.origin,
+        }
+
+        with open(path, 'w') as f:
+            json.dump(data, f)
+
+    def get_blobs(self) -> set[str]:
+        """Returns the names of blobs referenced by this manifest."""
+        return {BlobStore.get_blob_name(digest, mode) for digest, mode in self.files.values()}
+
+
+class BlobStore:
+    """Content-addressed store of installed boilerplate files.
+
+    Files are stored once per unique content (and permission bits) and
+    installations link to the stored blobs. Boilerplates sharing the same
+    files therefore do not keep separate copies of them.
+
+    Files are hard linked from the store where possible and copied otherwise,
+    for example when the store and installation are on different file systems.
+    As hard links share content, installed files must not be modified in place.
+
+    .. versionadded:: 0.2.0
+
+    Parameters
+    ~~~~~~~~~~
+    directory: :class:`pathlib.Path` | None
+        The directory to store blobs in. Defaults to the ``store`` directory
+        in Prept's directory.
+    """
+    def __init__(self, directory: pathlib.Path | None = None) -> None:
+        if directory is None:
+            directory = utils.get_prept_dir('store')
+
+        self.directory = directory
+
+    @staticmethod
+    def get_blob_name(digest: str, mode: int) -> str:
+        """Returns the name of blob for the given content hash and permission bits."""
+        return f'{digest}-{mode:o}'
+
+    def get_blob_path(self, digest: str, mode: int) -> pathlib.Path:
+        """Returns the path of blob for the given content hash and permission bits."""
+        return self.directory / digest[:2] / self.get_blob_name(digest, mode)
+
+    def add(self, path: pathlib.Path) -> tuple[str, int]:
+        """Adds the given file to store.
+
+        If a blob with same content and permission bits already exists, the
+        file is only hashed and not copied.
+
+        Returns the tuple of content hash and permission bits identifying
+        the blob.
+        """
+        digest = _hash_file(path)
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+        blob = self.get_blob_path(digest, mode)
+
+        if blob.exists():
+            return digest, mode
+
+        os.makedirs(blob.parent, exist_ok=True)
+
+        # Blob is written to a temporary file first so concurrent installations
+        # sharing the store never link a partially written blob.
+        fd, temp = tempfile.mkstemp(dir=blob.parent, prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as dst, open(path, 'rb') as src:
+                shutil.copyfileobj(src, dst)
+            os.chmod(temp, mode)
+            os.replace(temp, blob)
+        except BaseException:
+            try:
+                os.remove(temp)
+            except OSError:
+                pass
+            raise
+
+        return digest, mode
+
+    def add_stream(self, f: IO[bytes], digest: str, mode: int) -> None:
+        """Adds the content read from given file object to store.
+
+        The content must have the given hash, otherwise :class:`ValueError` is
+        raised and nothing is added. If the blob already exists, nothing is
+        read from the file object.
+        """
+        blob = self.get_blob_path(digest, mode)
+        if blob.exists():
+            return
+
+        os.makedirs(blob.parent, exist_ok=True)
+        hasher = hashlib.sha256()
+
+        fd, temp = tempfile.mkstemp(dir=blob.parent, prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as dst:
+                while chunk := f.read(_HASH_CHUNK_SIZE):
+                    hasher.update(chunk)
+                    dst.write(chunk)
+
+            if hasher.hexdigest() != digest:
+                raise ValueError(f'content of blob {self.get_blob_name(digest, mode)} does not match its hash')
+
+            os.chmod(temp, mode)
+            os.replace(temp, blob)
+        except BaseException:
+            try:
+                os.remove(temp)
+            except OSError:
+                pass
+            raise
+
+    def is_linked(self, digest: str, mode: int, target: pathlib.Path) -> bool:
+        """Checks whether the given file is linked to the blob."""
+        try:
+            return os.path.samefile(self.get_blob_path(digest, mode), target)
+        except OSError:
+            return False
+
+    def link(self, digest: str, mode: int, target: pathlib.Path) -> None:
+        """Links the blob to the given target path.
+
+        Any existing file at target is replaced.
+        """
+        blob = self.get_blob_path(digest, mode)
+        os.makedirs(target.parent, exist_ok=True)
+
+        if target.exists() or target.is_symlink():
+            os.remove(target)
+
+        try:
+            os.link(blob, target)
+        except OSError:
+            shutil.copy2(blob, target)
+
+    def collect(self, referenced: Iterable[str]) -> tuple[int, int]:
+        """Removes the blobs that are not referenced.
+
+        Returns the tuple of number and total size in bytes of removed blobs.
+
+        Parameters
+        ~~~~~~~~~~
+        referenced:
+            The names of referenced blobs as returned by :meth:`.get_blob_name`.
+        """
+        referenced = set(referenced)
+        removed = 0
+        freed = 0
+
+        if not self.directory.exists():
+            return 0, 0
+
+        for bucket in os.scandir(self.directory):
+            if not bucket.is_dir():
+                continue
+            for entry in os.scandir(bucket.path):
+                if entry.name in referenced or entry.name.startswith('.tmp-'):
+                    continue
+                try:
+                    size = entry.stat().st_size
+                    os.remove(entry.path)
+                except OSError:
+                    continue
+
+                removed += 1
+                freed += size
+
+        return removed, freed
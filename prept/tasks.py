@@ -0,0 +1,225 @@
+# Copyright (C) Izhar Ahmad 2025-2026
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Callable, Sequence, cast
+from prept.errors import PreptCLIError
+from prept.cli import outputs
+
+import asyncio
+import click
+import inspect
+import queue
+import subprocess
+import threading
+import time
+
+if TYPE_CHECKING:
+    from prept.context import GenerationContext
+
+    TaskActionT = Callable[[GenerationContext], Any] | str | Sequence[str]
+
+__all__ = (
+    'PostGenerationTask',
+)
+
+
+class PostGenerationTask:
+    """A named task that is ran after all files have been generated.
+
+    Tasks are registered through :meth:`GenerationEngine.post_generation_task` or
+    :meth:`GenerationEngine.add_post_generation_task`. Tasks that do not depend on
+    each other are ran concurrently.
+
+    .. versionadded:: 0.2.0
+
+    Parameters
+    ~~~~~~~~~~
+    name: :class:`str`
+        The name of task.
+    action:
+        The action performed by the task. This can be one of:
+
+        - A function that takes :class:`GenerationContext` as parameter.
+        - A coroutine function that takes :class:`GenerationContext` as parameter.
+          The coroutine is ran in its own event loop.
+        - A command to run in output directory. Commands given as string are
+          ran through the shell while sequence of strings are ran directly.
+
+        Commands exiting with a non-zero exit code fail the task.
+    after: Sequence[:class:`str`]
+        The names of tasks that must complete successfully before this task
+        is started.
+    timeout: :class:`float` | None
+        The number of seconds after which the task is failed.
+
+        Commands are killed and coroutines are cancelled when timed out. Functions
+        cannot be interrupted so they are left running in background while generation
+        fails.
+    """
+    def __init__(
+        self,
+        name: str,
+        action: TaskActionT,
+        *,
+        after: Sequence[str] = (),
+        timeout: float | None = None,
+    ) -> None:
+        if not name:
+            raise ValueError('task name must be a non-empty string')
+        if not callable(action) and not isinstance(action, (str, list, tuple)):
+            raise TypeError('task action must be callable, a string or a sequence of strings')
+        if isinstance(after, str):
+            after = (after,)
+        if timeout is not None and timeout <= 0:
+            raise ValueError('timeout must be greater than 0')
+
+        self.name = name
+        self.action = action
+        self.after = tuple(after)
+        self.timeout = timeout
+
+    def __repr__(self) -> str:
+        return f'PostGenerationTask(name={self.name!r}, after={self.after!r}, timeout={self.timeout!r})'
+
+    @property
+    def _interruptible(self) -> bool:
+        # Commands and coroutines enforce timeout themselves.
+        return not callable(self.action) or inspect.iscoroutinefunction(self.action)
+
+    def _run(self, ctx: GenerationContext) -> None:
+        if not callable(self.action):
+            return self._run_command(ctx)
+
+        try:
+            if inspect.iscoroutinefunction(self.action):
+                asyncio.run(asyncio.wait_for(self.action(ctx), self.timeout))
+            else:
+                self.action(ctx)
+        except TimeoutError:
+            if not inspect.iscoroutinefunction(self.action):
+                raise
+            raise self._timeout_error() from None
+
+    def _run_command(self, ctx: GenerationContext) -> None:
+        command = cast('str | Sequence[str]', self.action)
+        try:
+            proc = subprocess.run(
+                command,
+                shell=isinstance(command, str),
+                cwd=ctx.output_dir,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                timeout=self.timeout,
+            )
+        except subprocess.TimeoutExpired:
+            raise self._timeout_error() from None
+
+        if proc.returncode:
+            output = proc.stdout.decode(errors='replace').strip()
+            raise PreptCLIError(
+                f'Command of post-generation task {self.name!r} returned non-zero exit code {proc.returncode}'
+                + (f', the following output was captured:\n{output}' if output else '')
+            )
+
+    def _timeout_error(self) -> PreptCLIError:
+        return PreptCLIError(f'Post-generation task {self.name!r} timed out after {self.timeout} seconds')
+
+
+def _check_task_graph(tasks: Sequence[PostGenerationTask]) -> None:
+    names = {task.name for task in tasks}
+    for task in tasks:
+        for dependency in task.after:
+            if dependency not in names:
+                raise PreptCLIError(f'Post-generation task {task.name!r} depends on unknown task {dependency!r}')
+
+    dependencies = {task.name: set(task.after) for task in tasks}
+    while dependencies:
+        ready = [name for name, after in dependencies.items() if not after]
+        if not ready:
+            raise PreptCLIError(f'Post-generation tasks {", ".join(map(repr, sorted(dependencies)))} have circular dependencies')
+        for name in ready:
+            del dependencies[name]
+        for after in dependencies.values():
+            after.difference_update(ready)
+
+
+def run_tasks(tasks: Sequence[PostGenerationTask], ctx: GenerationContext) -> None:
+    _check_task_graph(tasks)
+
+    results: queue.Queue[tuple[PostGenerationTask, float, Exception | None]] = queue.Queue()
+    tasks_by_name = {task.name: task for task in tasks}
+    waiting = {task.name: set(task.after) for task in tasks}
+    running: dict[str, float | None] = {}
+    failures: list[tuple[PostGenerationTask, Exception]] = []
+    timings: list[float] = []
+
+    def worker(task: PostGenerationTask) -> None:
+        started = time.perf_counter()
+        try:
+            task._run(ctx)
+        except Exception as e:
+            results.put((task, time.perf_counter() - started, e))
+        else:
+            results.put((task, time.perf_counter() - started, None))
+
+    def start_ready() -> None:
+        for name in [name for name, after in waiting.items() if not after]:
+            del waiting[name]
+            task = tasks_by_name[name]
+
+            # Threads are daemonic so that functions that are timed out do
+            # not prevent the process from exiting.
+            threading.Thread(target=worker, args=(task,), name=f'prept-task-{name}', daemon=True).start()
+            running[name] = None if task.timeout is None or task._interruptible else time.monotonic() + task.timeout
+
+    started = time.perf_counter()
+    start_ready()
+
+    while running:
+        deadlines = [deadline for deadline in running.values() if deadline is not None]
+        try:
+            task, elapsed, exc = results.get(timeout=max(0, min(deadlines) - time.monotonic()) if deadlines else None)
+        except queue.Empty:
+            now = time.monotonic()
+            for name, deadline in list(running.items()):
+                if deadline is not None and deadline <= now:
+                    task = tasks_by_name[name]
+                    del running[name]
+                    failures.append((task, task._timeout_error()))
+                    click.echo(outputs.cli_msg(f'├── Task {name!r} timed out after {task.timeout}s'))
+            continue
+
+        if task.name not in running:
+            # The task has already been failed due to timeout.
+            continue
+
+        del running[task.name]
+        timings.append(elapsed)
+
+        if exc is not None:
+            failures.append((task, exc))
+            click.echo(outputs.cli_msg(f'├── Task {task.name!r} failed after {elapsed:.2f}s'))
+            continue
+
+        click.echo(outputs.cli_msg(f'├── Task {task.name!r} completed in {elapsed:.2f}s'))
+        for after in waiting.values():
+            after.discard(task.name)
+
+        if not failures:
+            # No new tasks are started once a task fails.
+            start_ready()
+
+    if failures:
+        if waiting:
+            click.echo(outputs.cli_msg(f'├── Skipped {len(waiting)} tasks: {", ".join(map(repr, waiting))}'))
+
+        task, exc = failures[0]
+        if isinstance(exc, PreptCLIError):
+            raise exc
+        raise outputs.wrap_exception(exc, f'In post-generation task {task.name!r}, the following error occured:') from None
+
+    click.echo(outputs.cli_msg(
+        f'└── Completed {len(tasks)} tasks in {time.perf_counter() - started:.2f}s '
+        f'({sum(timings):.2f}s of task time)'
+    ))
@@ -4,13 +4,19 @@ from __future__ import annotations
 
 import click
 import pathlib
+import tempfile
 import os
 
 __all__ = (
     'UNDEFINED',
     'get_prept_dir',
+    'get_prept_path',
+    'write_atomic',
 )
 
+PREPT_HOME_ENV = 'PREPT_HOME'
+PREPT_PATH_ENV = 'PREPT_PATH'
+
 
 class _Undefined:
     ...
@@ -23,11 +29,54 @@ def get_prept_dir(*subdirs: str, mk: bool = False) -> pathlib.Path:
     
     subdirs can be passed to get path to a subdirectory such as
     .prept/boilerplates/.
+
+    The directory can be overridden using PREPT_HOME environment variable.
     """
-    path = pathlib.Path(click.get_app_dir('prept'))
+    path = pathlib.Path(os.environ.get(PREPT_HOME_ENV) or click.get_app_dir('prept'))
     path = path / pathlib.Path(*subdirs)
 
     if not path.exists() and mk:
         os.makedirs(path)
 
     return path
+
+
+def get_prept_path() -> list[pathlib.Path]:
+    """Gets the Prept directories searched for installed boilerplates.
+
+    The first directory is the one returned by get_prept_dir() followed by
+    the shared directories listed in PREPT_PATH environment variable, in
+    order of precedence.
+    """
+    path = [get_prept_dir()]
+    for entry in os.environ.get(PREPT_PATH_ENV, '').split(os.pathsep):
+        if entry and pathlib.Path(entry) not in path:
+            path.append(pathlib.Path(entry))
+
+    return path
+
+
+def write_atomic(path: pathlib.Path, content: str | bytes) -> None:
+    """Writes the content to a file atomically.
+
+    Content is written to a temporary file and moved in place so concurrent
+    readers see either the previous or the new content.
+    """
+    fd, temp = tempfile.mkstemp(dir=path.parent, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(content.encode('utf-8') if isinstance(content, str) else content)
+
+        # mkstemp() creates the file readable only by the owner. The file is
+        # given the usual permissions so that other users sharing the Prept
+        # directory can read it.
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(temp, 0o666 & ~umask)
+        os.replace(temp, path)
+    except BaseException:
+        try:
+            os.remove(temp)
+        except OSError:
+            pass
+        raise
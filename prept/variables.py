@@ -2,17 +2,20 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Generator, Mapping
 from typing_extensions import Self
 from prept.errors import InvalidConfig
 
 if TYPE_CHECKING:
     from prept.boilerplate import BoilerplateInfo
+    from prept.context import GenerationContext
 
 import re
+import contextlib
 
 __all__ = (
     'TemplateVariable',
+    'FanoutFile',
 )
 
 PATTERN_VARIABLE_NAME = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
@@ -130,3 +133,85 @@ class TemplateVariable:
             data['default'] = self._default
 
         return data
+
+
+class FanoutFile:
+    """Wrapper class around the fan-out file structure.
+
+    These are the objects in values of ``fanout_files`` key in preptconfig.json,
+    see :attr:`BoilerplateInfo.fanout_files` for details.
+
+    .. versionadded:: 0.2.0
+
+    Attributes
+    ~~~~~~~~~~
+    pattern: :class:`str`
+        The path or gitignore-like pattern of fanned out template files.
+    variable: :class:`str`
+        The name of template variable holding the items to render file for.
+    item: :class:`str`
+        The name of template variable that each item is bound to while rendering.
+    """
+    def __init__(self, pattern: str, variable: str, item: str) -> None:
+        self.pattern = pattern
+        self.variable = variable
+        self.item = item
+
+    @classmethod
+    def _from_data(cls, pattern: str, data: dict[str, Any]) -> Self:
+        if not isinstance(data, dict):
+            raise InvalidConfig(f'fanout_files.{pattern}', 'Fan-out file must be a mapping with variable and item keys')
+
+        variable = data.get('variable')
+        item = data.get('item')
+
+        for key, value in (('variable', variable), ('item', item)):
+            if not isinstance(value, str) or not PATTERN_VARIABLE_NAME.match(value):
+                raise InvalidConfig(f'fanout_files.{pattern}.{key}', f'{key} must be a valid variable name')
+
+        return cls(pattern, variable, item)  # type: ignore
+
+    def _dump(self) -> dict[str, Any]:
+        return {
+            'variable': self.variable,
+            'item': self.item,
+        }
+
+    def get_items(self, variables: Mapping[str, Any]) -> list[Any]:
+        """Returns the items to render the file for.
+
+        Values of variables given as strings, such as from command line, are
+        split by commas. Other iterables are used as is and the file is not
+        generated if the variable is not set.
+
+        Parameters
+        ~~~~~~~~~~
+        variables: Mapping[:class:`str`, Any]
+            The values of template variables.
+        """
+        value = variables.get(self.variable)
+        if value is None:
+            return []
+        if isinstance(value, str):
+            return [item.strip() for item in value.split(',') if item.strip()]
+
+        try:
+            return list(value)
+        except TypeError:
+            return [value]
+
+    @contextlib.contextmanager
+    def _bind(self, ctx: GenerationContext, item: Any) -> Generator[None, None, None]:
+        # Binds the item variable for rendering and restores the previous value.
+        variables = ctx._variables
+        missing = object()
+        previous = variables.get(self.item, missing)
+        variables[self.item] = item
+
+        try:
+            yield
+        finally:
+            if previous is missing:
+                del variables[self.item]
+            else:
+                variables[self.item] = previous